@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""Benchmark the stages of processing with synthetic data.
+
+No database is used. Results can be saved as JSON and compared with the
+results of an earlier version.
+
+"""
+
+# Standard imports
+import json
+import argparse
+
+# Crawsiz imports
+from crawsiz.benchmark import suite
+from crawsiz.benchmark import synthetic
+
+
+def main():
+    """Run the benchmarks.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Process the CLI
+    parser = argparse.ArgumentParser(
+        description='Benchmark the stages of processing.')
+    parser.add_argument(
+        '--pairs', type=int, default=2,
+        help='Number of pairs to create (maximum {}).'.format(
+            len(synthetic.PAIRS)))
+    parser.add_argument(
+        '--years', type=int, default=2,
+        help='Years of daily history to create for each pair.')
+    parser.add_argument(
+        '--seed', type=int, default=0,
+        help='Seed of the random number generator.')
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='Number of times to run each benchmark.')
+    parser.add_argument(
+        '--benchmarks', nargs='+', default=list(suite.BENCHMARKS),
+        choices=suite.BENCHMARKS, help='Benchmarks to run.')
+    parser.add_argument(
+        '--output', type=str, default=None,
+        help='File in which to save the results as JSON.')
+    parser.add_argument(
+        '--baseline', type=str, default=None,
+        help='JSON results of an earlier run to compare with.')
+    args = parser.parse_args()
+
+    # Run
+    result = suite.run(
+        names=synthetic.PAIRS[:args.pairs], years=args.years,
+        seed=args.seed, repeat=args.repeat, benchmarks=args.benchmarks)
+
+    # Get the baseline
+    baseline = {}
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as f_handle:
+            baseline = json.load(f_handle)['results']
+
+    # Report
+    for name, values in result['results'].items():
+        line = '{:<10} {:>10.4f} s {:>12.1f} {}/s'.format(
+            name, values['seconds'], values['per_second'], values['unit'])
+        if name in baseline:
+            line = '{}  {:>6.2f}x baseline'.format(
+                line, baseline[name]['seconds'] / values['seconds'])
+        print(line)
+
+    # Save
+    if args.output is not None:
+        with open(args.output, 'w') as f_handle:
+            json.dump(result, f_handle, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
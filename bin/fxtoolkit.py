@@ -8,14 +8,21 @@ Test
 # Standard imports
 import os
 import time
+import functools
 from multiprocessing import Pool
 import multiprocessing
 
-# Import crawsiz libraries
+# Import crawsiz libraries. Modules that are slow to import, or that
+# only some modes use, are imported by the functions that need them.
 from crawsiz.main import ingest
-from crawsiz.main import feature
+from crawsiz.main import export
+from crawsiz.main import publish
+from crawsiz.main import render
 from crawsiz.utils import configuration
 from crawsiz.utils import cli
+from crawsiz.utils import log
+from crawsiz.utils import profiler
+from crawsiz.utils import timing
 from crawsiz.db import db_pair
 
 
@@ -39,22 +46,54 @@ This processes XML data from FXCM http:// feeds.
     cli_object = cli.ProcessCli(additional_help=additional_help)
     cli_args = cli_object.get_cli()
 
+    # Write the log file from this process only if configured. Pool
+    # workers then send it their messages.
+    config = configuration.Config()
+    if config.log_queue() is True:
+        log.start_queue()
+
     # Autoingest stuff
     if cli_args.mode == 'autoingest':
-        idx_ingested_list = _autoingest()
+        profile = profiler.directory(cli_args.profile)
+        archive = ingest.Archive()
+        idx_ingested_list = _autoingest(archive, profile=profile)
         if bool(idx_ingested_list) is True:
-            _process(idx_ingested_list)
+            _process(idx_ingested_list, profile=profile)
+
+        # Wait for the ingested files to be archived
+        archive.close()
+        _profile_report(profile)
 
     # Process data
     if cli_args.mode == 'process':
-        _process()
+        profile = profiler.directory(cli_args.profile)
+        _process(profile=profile)
+        _profile_report(profile)
+
+    # Watch the ingest directory
+    if cli_args.mode == 'watch':
+        _watch()
+
+    # Export price history
+    if cli_args.mode == 'export':
+        export.export(cli_args.directory)
+
+    # Import price history
+    if cli_args.mode == 'import':
+        export.restore(cli_args.directory)
 
 
-def _autoingest():
+def _autoingest(archive, pool=None, profile=None, watcher=None):
     """Autoingest data.
 
     Args:
-        None
+        archive: ingest.Archive object used to archive ingested files
+        pool: multiprocessing.Pool to use. A new one is created if None.
+        profile: Directory in which to save profiles of each file
+            ingested. No profiling is done if None.
+        watcher: watch.Watch object. Files that are too new to ingest
+            are passed to it, so that it reports them once they are old
+            enough. They are ignored if None.
 
     Returns:
         idx_ingested: List of indexes that were updated
@@ -65,9 +104,6 @@ def _autoingest():
 
     # Initialize filenames
     filepaths = []
-    pairs = []
-    idx_ingested = []
-    available_cores = max(1, multiprocessing.cpu_count() - 1)
 
     # Get list of files in ingest directory
     for filename in os.listdir(config.ingest_directory()):
@@ -78,33 +114,64 @@ def _autoingest():
         age = int(time.time() - os.path.getmtime(filepath))
 
         # Only proceed if file is old enough
-        if age < 15:
+        if age < config.watch_debounce():
+            if watcher is not None:
+                watcher.add(filepath)
             continue
 
-        # Don't process invalid files
+        # Append filepath to list
+        filepaths.append(filepath)
+
+    # Ingest the files
+    idx_ingested = _ingest(filepaths, archive, pool=pool, profile=profile)
+    return idx_ingested
+
+
+def _ingest(filepaths, archive, pool=None, profile=None):
+    """Ingest a list of files.
+
+    Args:
+        filepaths: List of files to ingest
+        archive: ingest.Archive object used to archive ingested files
+        pool: multiprocessing.Pool to use. A new one is created if None.
+        profile: Directory in which to save profiles of each file
+            ingested. No profiling is done if None.
+
+    Returns:
+        idx_ingested: List of indexes that were updated
+
+    """
+    # Initialize key variables
+    valid_filepaths = []
+    pairs = []
+    idx_ingested = []
+    available_cores = max(1, multiprocessing.cpu_count() - 1)
+
+    # Don't process invalid files
+    for filepath in filepaths:
         filecheck = ingest.Valid(filepath)
         if filecheck.valid() is False:
             continue
 
         # Append filepath to list
-        filepaths.append(filepath)
+        valid_filepaths.append(filepath)
         pairs.append(filecheck.pair())
 
     # Create a pool of sub process resources
-    with Pool(processes=available_cores) as pool:
-        # Create sub processes from the pool
-        pool.map(ingest.ingest, filepaths)
+    if pool is None:
+        with Pool(processes=available_cores) as pool:
+            # Create sub processes from the pool
+            _ingest_archive(valid_filepaths, archive, pool, profile=profile)
 
-    # Wait for all the processes to end
-    pool.join()
+        # Wait for all the processes to end
+        pool.join()
+    else:
+        _ingest_archive(valid_filepaths, archive, pool, profile=profile)
 
-    # Get a list of all pair indices in the database
-    idx_all = db_pair.idx_all()
-    for idx in idx_all:
-        db_object = db_pair.GetIDX(idx)
-        next_pair = db_object.pair()
-        if next_pair in pairs:
-            idx_ingested.append(idx)
+    # Get pair indices of the ingested pairs
+    for pair in sorted(set(pairs)):
+        if db_pair.pair_exists(pair) is True:
+            idx_ingested.append(db_pair.GetPair(pair).idx())
 
     # Return
     if bool(idx_ingested) is False:
@@ -112,16 +179,113 @@ def _autoingest():
     return idx_ingested
 
 
-def _process(idx_ingested_list=None):
+def _ingest_archive(filepaths, archive, pool, profile=None):
+    """Ingest files in sub processes and archive them in the background.
+
+    Args:
+        filepaths: List of valid files to ingest
+        archive: ingest.Archive object used to archive ingested files
+        pool: multiprocessing.Pool to use
+        profile: Directory in which to save profiles of each file
+            ingested. No profiling is done if None.
+
+    Returns:
+        None
+
+    """
+    # Archive each file as soon as its worker is done with it
+    results = pool.imap(
+        functools.partial(_ingest_wrapper, profile=profile), filepaths)
+    for (filepath, ingested) in zip(filepaths, results):
+        if ingested is True:
+            archive.add(filepath)
+
+
+def _ingest_wrapper(filepath, profile=None):
+    """Ingest a file in a pool worker.
+
+    Args:
+        filepath: File to ingest
+        profile: Directory in which to save a profile of the ingest. No
+            profiling is done if None.
+
+    Returns:
+        ingested: True if new data was added to the database
+
+    """
+    # Ingest
+    name = 'ingest_{}'.format(
+        os.path.splitext(os.path.basename(filepath))[0].lower())
+    ingested = profiler.run(profile, name, ingest.ingest, filepath)
+    return ingested
+
+
+def _watch():
+    """Ingest and process files as soon as they arrive.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Import the watcher, and the feature engine so that the pool workers
+    # inherit it instead of importing it when they first process data.
+    from crawsiz.utils import watch
+    from crawsiz.main import feature  # noqa: F401 pylint: disable=W0611
+
+    # Initialize key variables
+    config = configuration.Config()
+    directory = config.ingest_directory()
+    available_cores = max(1, multiprocessing.cpu_count() - 1)
+
+    # Start watching before the initial sweep so no files are missed
+    watcher = watch.Watch(directory, debounce=config.watch_debounce())
+    archive = ingest.Archive()
+    log_message = 'Watching directory {}.'.format(directory)
+    log.log2quiet(1113, log_message)
+
+    # The pool outlives each cycle so that workers keep their database
+    # connections and imported libraries between files.
+    try:
+        with Pool(processes=available_cores) as pool:
+            # Ingest files that arrived while we were not running
+            idx_ingested_list = _autoingest(
+                archive, pool=pool, watcher=watcher)
+            if bool(idx_ingested_list) is True:
+                _process(idx_ingested_list, pool=pool)
+
+            # Ingest and process files as they arrive
+            while True:
+                filepaths = watcher.files()
+                if bool(filepaths) is False:
+                    continue
+                idx_ingested_list = _ingest(filepaths, archive, pool=pool)
+                if bool(idx_ingested_list) is True:
+                    _process(idx_ingested_list, pool=pool)
+    finally:
+        watcher.close()
+        archive.close()
+
+
+def _process(idx_ingested_list=None, pool=None, profile=None):
     """Process crosses in database.
 
     Args:
         idx_ingested_list: List of pair indices that were ingested.
+        pool: multiprocessing.Pool to use. A new one is created if None.
+        profile: Directory in which to save profiles of each pair
+            processed. No profiling is done if None.
 
     Returns:
         None
 
     """
+    # Import the feature engine. This takes a while, so it is only done
+    # when there is data to process.
+    from crawsiz.main import feature
+
     # Initialize key variables
     config = configuration.Config()
     lookahead = config.lookahead()
@@ -130,83 +294,161 @@ def _process(idx_ingested_list=None):
     argument_list = []
     available_cores = max(1, multiprocessing.cpu_count() - 1)
 
+    # Get the names of all pairs with a single query. They are used by the
+    # workers and the index, so neither needs to query them again.
+    pairs = db_pair.pairs()
+
     # Process data
     if idx_ingested_list is None:
-        indices = db_pair.idx_all()
+        indices = sorted(pairs)
     else:
         indices = idx_ingested_list
+
+    # Get data for all pairs with a single query
+    with timing.Span('db_load', pairs=len(indices)):
+        fxdata = feature.getdata_list(indices, years=years)
     for idx in indices:
         argument_list.append(
-            (idx, years, lookahead, components)
+            (idx, years, lookahead, components, fxdata[idx], pairs[idx])
         )
 
-    # Create a pool of sub process resources
-    with Pool(processes=available_cores) as pool:
-        # Create sub processes from the pool
-        pool.map(_pool_wrapper, argument_list)
+    # Collect timing records before forking, so that sub processes don't
+    # inherit and report them too
+    records = timing.records()
+
+    # Create a pool of sub process resources. Results are rendered in the
+    # order the workers finish, while the other pairs are processed.
+    wrapper = functools.partial(_pool_wrapper, profile=profile)
+    if pool is None:
+        with Pool(processes=available_cores) as pool:
+            # Create sub processes from the pool
+            records.extend(_render(
+                pool.imap_unordered(wrapper, argument_list),
+                list(pairs.values())))
+
+        # Wait for all the processes to end
+        pool.join()
+    else:
+        records.extend(_render(
+            pool.imap_unordered(wrapper, argument_list),
+            list(pairs.values())))
+
+    # Summarize the time taken by each stage in this process and the pool
+    records.extend(timing.records())
+    timing.log_summary(records)
 
-    # Wait for all the processes to end
-    pool.join()
 
-    # Create index page when all done
-    _index()
+def _render(results, pairs):
+    """Write reports as the results of the workers arrive.
 
+    Args:
+        results: Iterable of (result, records) tuples returned by
+            _pool_wrapper
+        pairs: List of the names of all pairs
+
+    Returns:
+        records: List of timing records of the workers
 
-def _pool_wrapper(argument_list):
+    """
+    # Import the report library, which imports the feature engine
+    from crawsiz.main import report
+
+    # Initialize key variables
+    config = configuration.Config()
+    directory = config.web_directory()
+    records = []
+
+    # Write the pages of each pair
+    for result, worker_records in results:
+        records.extend(worker_records)
+        with timing.Span('render', pair=result['pair']):
+            report.pages(directory, result)
+
+    # Create index page and consolidated reports when all done
+    with timing.Span('index'):
+        _index(directory, pairs)
+    with timing.Span('consolidate'):
+        publish.consolidate(directory, pairs)
+
+    # Return
+    return records
+
+
+def _pool_wrapper(argument_list, profile=None):
     """Wrapper function to unpack arguments before calling the real function.
 
     Args:
         argument_list: A list of tuples of arguments to be
             provided to "feature.process" function
+        profile: Directory in which to save a profile of the processing.
+            No profiling is done if None.
 
     Returns:
-        Nothing
+        (result, records): Result of feature.process and the list of
+            timing records of the processing
 
     """
-    return feature.process(*argument_list)
+    # Pool workers may have been started before the parent process
+    # imported the feature engine
+    from crawsiz.main import feature
+
+    # Process
+    if profile is None:
+        result = feature.process(*argument_list)
+    else:
+        name = 'process_{}'.format(argument_list[-1].lower())
+        result = profiler.run(
+            profile, name, feature.process, *argument_list)
+
+    # Return timing records so the parent process can summarize them
+    records = timing.records()
+    return (result, records)
+
 
+def _profile_report(profile):
+    """Merge the profiles of a run into a report.
 
-def _index():
+    Args:
+        profile: Directory containing the profiles. Nothing is done if None.
+
+    Returns:
+        None
+
+    """
+    # Create the report
+    if profile is not None:
+        filepath = profiler.report(profile)
+        if filepath is not None:
+            print('Profile report: {}'.format(filepath))
+
+
+def _index(directory, pairs):
     """Create index.html page.
 
     Args:
-        config: Configuration object
+        directory: Web directory
+        pairs: List of the names of all pairs
 
     Returns:
         None.
 
     """
     # Initialize key variables
-    config = configuration.Config()
-    directory = config.web_directory()
-    filename = ('%s/index.html') % (directory)
-    crosses = []
-    links = ''
+    filename = os.path.join(directory, 'index.html')
 
-    # Get list of pair indexes
-    indices = db_pair.idx_all()
-    for idx in indices:
-        crosses.append(db_pair.GetIDX(idx).pair())
+    # Don't create the page again if the pairs haven't changed
+    digest = render.digest({'pairs': sorted(pairs)})
+    if render.current(filename, digest) is True:
+        return
 
     # Create links on index page
-    for cross in sorted(crosses):
-        links = (
-            '%s<p><a href="%s.html">%s</a></p>\n'
-            '') % (links, cross.lower(), cross.upper())
-
-    # Create HTML
-    html = ("""\
-<html>
-<head><title>Crawsiz</title></head>
-<body>
-<h1>Crawsiz</h1>
-%s
-</html></body>
-""") % (links)
+    links = [
+        '<p><a href="{}.html">{}</a></p>\n'.format(
+            pair.lower(), pair.upper()) for pair in sorted(pairs)]
 
     # Write HTML to file
-    with open(filename, 'w') as f_handle:
-        f_handle.write(html)
+    render.write(
+        filename, render.page('Crawsiz', [links]), value=digest)
 
 
 if __name__ == '__main__':
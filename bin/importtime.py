@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""Regression benchmark for the import time of fxtoolkit.py.
+
+Each check imports the modules used by an fxtoolkit mode in a fresh
+interpreter started with "-X importtime". The script fails if a check
+imports a module that it should not, or takes longer than allowed.
+
+"""
+
+# Standard imports
+import os
+import sys
+import argparse
+import subprocess
+
+# Directory containing the crawsiz package
+ROOT_DIRECTORY = os.path.dirname(
+    os.path.dirname(os.path.abspath(__file__)))
+
+# Statements run for each check, and modules they must not import.
+CHECKS = {
+    'startup': (
+        'import runpy, sys; sys.argv = ["fxtoolkit.py", "--help"]; '
+        'runpy.run_path("%s/bin/fxtoolkit.py", run_name="__main__")'
+        '') % (ROOT_DIRECTORY),
+    'autoingest': 'import crawsiz.main.ingest',
+    'process': 'import crawsiz.main.feature'
+}
+FORBIDDEN = {
+    'startup': (
+        'crawsiz.main.feature', 'sklearn', 'matplotlib', 'scipy'),
+    'autoingest': (
+        'crawsiz.main.feature', 'sklearn', 'matplotlib', 'scipy'),
+    'process': ('sklearn', 'matplotlib', 'scipy')
+}
+
+
+def main():
+    """Run the import time checks.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    failed = False
+
+    # Process the CLI
+    parser = argparse.ArgumentParser(
+        description='Check the import time of fxtoolkit.py modes.')
+    parser.add_argument(
+        '--max_ms', type=int, default=1000,
+        help='Maximum import time of each check in milliseconds.')
+    parser.add_argument(
+        '--top', type=int, default=5,
+        help='Number of slowest top level imports to report.')
+    args = parser.parse_args()
+
+    # Run each check
+    for name, statement in sorted(CHECKS.items()):
+        imports = importtime(statement)
+        total = sum([self_us for (self_us, _, _) in imports]) / 1000
+        modules = [module for (_, _, module) in imports]
+
+        # Report
+        print('{}: {:.1f} ms for {} modules'.format(
+            name, total, len(modules)))
+        toplevel = [item for item in imports if item[2][0] != ' ']
+        toplevel.sort(key=lambda item: item[1], reverse=True)
+        for (_, cumulative, module) in toplevel[:args.top]:
+            print('    {:>10.1f} ms  {}'.format(
+                cumulative / 1000, module.strip()))
+
+        # Check for modules that should not have been imported
+        for module in modules:
+            module = module.strip()
+            for forbidden in FORBIDDEN[name]:
+                if module == forbidden or module.startswith(
+                        '{}.'.format(forbidden)):
+                    print('    ERROR: {} imported'.format(module))
+                    failed = True
+                    break
+
+        # Check time
+        if total > args.max_ms:
+            print('    ERROR: Exceeded {} ms'.format(args.max_ms))
+            failed = True
+
+    # Return
+    if failed is True:
+        sys.exit(1)
+
+
+def importtime(statement):
+    """Get the imports made by a python statement.
+
+    Args:
+        statement: Python statement to run
+
+    Returns:
+        imports: List of tuples (self, cumulative, module) where self and
+            cumulative are microseconds. Nested modules are indented.
+
+    """
+    # Initialize key variables
+    imports = []
+    environment = os.environ.copy()
+    environment['PYTHONPATH'] = ROOT_DIRECTORY
+
+    # Run the statement in a fresh interpreter
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        env=environment, universal_newlines=True)
+
+    # Parse lines like "import time:  self [us] | cumulative | module"
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') is False:
+            continue
+        (self_us, cumulative, module) = line[
+            len('import time:'):].split('|', 2)
+        if self_us.strip().isdigit() is False:
+            continue
+        imports.append((int(self_us), int(cumulative), module[1:]))
+
+    # Return
+    return imports
+
+
+if __name__ == '__main__':
+    main()
@@ -19,7 +19,7 @@ except:
     sys.exit(2)
 from crawsiz.utils import configuration
 from crawsiz.db.db_orm import BASE
-from crawsiz.db import DBURL
+from crawsiz.db import url
 
 
 def server_setup():
@@ -33,7 +33,6 @@ def server_setup():
 
     """
     # Initialize key variables
-    use_mysql = True
     pool_size = 25
     max_overflow = 25
 
@@ -41,10 +40,10 @@ def server_setup():
     config = configuration.Config()
 
     # Create DB connection pool
-    if use_mysql is True:
+    if config.db_backend() == 'mysql':
         # Add MySQL to the pool
         engine = create_engine(
-            DBURL, echo=True,
+            url(), echo=True,
             encoding='utf8',
             max_overflow=max_overflow,
             pool_size=pool_size, pool_recycle=3600)
@@ -65,9 +64,13 @@ def server_setup():
                 'is correct.') % (config.db_name())
             log.log2die(1036, log_message)
 
-        # Apply schemas
-        print('Applying Schemas')
-        BASE.metadata.create_all(engine)
+    else:
+        # The database file is created on first connection
+        engine = create_engine(url(), echo=True, encoding='utf8')
+
+    # Apply schemas
+    print('Applying Schemas')
+    BASE.metadata.create_all(engine)
 
 
 def main():
@@ -0,0 +1,7 @@
+"""Infoset benchmark package.
+
+This package's modules create synthetic price history and time the
+stages of processing with it, so that performance can be compared across
+versions without a database.
+
+"""
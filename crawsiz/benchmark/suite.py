@@ -0,0 +1,305 @@
+"""Library to time the stages of processing with synthetic data.
+
+Each benchmark is run several times and the fastest run is reported, as
+it is the least affected by other activity on the system. Results are
+JSON serializable so that they can be saved and compared across versions.
+
+"""
+
+import os
+import time
+import platform
+import tempfile
+
+import numpy as np
+
+# Import custom libraries
+from crawsiz.benchmark import synthetic
+from crawsiz.main import feature
+from crawsiz.main import ingest
+from crawsiz.main import report
+from crawsiz.machine import classifier
+from crawsiz.machine import pca
+from crawsiz.utils import timing
+
+# Version of the format of results
+VERSION = 1
+
+# Benchmarks in the order they are run
+BENCHMARKS = ('extract', 'pca', 'bayesian', 'linear', 'report', 'ingest')
+
+
+def run(
+        names=synthetic.PAIRS[:2], years=2, seed=0, repeat=3, lookahead=1,
+        components=10, benchmarks=BENCHMARKS):
+    """Run benchmarks.
+
+    Args:
+        names: Names of the pairs to create
+        years: Years of daily history to create for each pair
+        seed: Seed of the random number generator of the first pair
+        repeat: Number of times to run each benchmark
+        lookahead: Lookahead used to classify feature vectors
+        components: Number of principal components to use
+        benchmarks: Names of the benchmarks to run
+
+    Returns:
+        result: Dict of results
+
+    """
+    # Initialize key variables
+    results = {}
+    fxdata = synthetic.pairs(names=names, years=years, seed=seed)
+    context = {
+        'fxdata': fxdata,
+        'years': years,
+        'seed': seed,
+        'lookahead': lookahead,
+        'components': components
+    }
+    functions = {
+        'extract': _extract,
+        'pca': _pca,
+        'bayesian': _bayesian,
+        'linear': _linear,
+        'report': _report,
+        'ingest': _ingest
+    }
+
+    # Create the feature vectors used by the later benchmarks
+    context['extracts'] = _extracts(context)
+
+    # Run
+    for name in benchmarks:
+        function = functions[name]
+        runs = []
+        for _ in range(repeat):
+            (seconds, items, unit) = function(context)
+            runs.append(seconds)
+        results[name] = {
+            'seconds': round(min(runs), 6),
+            'mean': round(sum(runs) / len(runs), 6),
+            'runs': [round(seconds, 6) for seconds in runs],
+            'items': items,
+            'unit': unit,
+            'per_second': round(items / max(min(runs), 1e-9), 3)
+        }
+
+        # The spans of processing are not needed
+        timing.records()
+
+    # Return
+    result = {
+        'version': VERSION,
+        'created': int(time.time()),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'parameters': {
+            'pairs': list(names),
+            'years': years,
+            'seed': seed,
+            'repeat': repeat,
+            'lookahead': lookahead,
+            'components': components
+        },
+        'results': results
+    }
+    return result
+
+
+def _extracts(context):
+    """Create an Extract object for each pair.
+
+    Args:
+        context: Dict of benchmark data
+
+    Returns:
+        extracts: List of feature.Extract objects
+
+    """
+    # Return
+    extracts = [
+        feature.Extract(
+            idx_pair, lookahead=context['lookahead'], fxdata=fxdata)
+        for idx_pair, fxdata in enumerate(context['fxdata'].values(), 1)]
+    return extracts
+
+
+def _extract(context):
+    """Time the creation of feature vectors.
+
+    Args:
+        context: Dict of benchmark data
+
+    Returns:
+        result: Tuple of (seconds, feature vectors, unit)
+
+    """
+    # Time
+    start = time.perf_counter()
+    extracts = _extracts(context)
+    seconds = time.perf_counter() - start
+
+    # Return
+    items = sum([len(extract.vectors()) for extract in extracts])
+    return (seconds, items, 'vectors')
+
+
+def _pca(context):
+    """Time principal component analysis of the feature vectors.
+
+    Args:
+        context: Dict of benchmark data
+
+    Returns:
+        result: Tuple of (seconds, feature vectors, unit)
+
+    """
+    # Initialize key variables
+    items = 0
+    seconds = 0
+
+    # Time
+    for extract in context['extracts']:
+        vectors = extract.vectors()
+        classes = extract.classes_high(kessler=True)
+        start = time.perf_counter()
+        pca.PCA(vectors, classes).principal_components(
+            components=context['components'])
+        seconds += time.perf_counter() - start
+        items += len(vectors)
+
+    # Return
+    return (seconds, items, 'vectors')
+
+
+def _bayesian(context):
+    """Time calculating the accuracy of the Bayesian classifier.
+
+    Args:
+        context: Dict of benchmark data
+
+    Returns:
+        result: Tuple of (seconds, feature vectors, unit)
+
+    """
+    # Initialize key variables
+    items = 0
+    seconds = 0
+
+    # Time
+    for extract in context['extracts']:
+        vectors = extract.vectors()
+        pca_object = pca.PCA(vectors, extract.classes_high(kessler=True))
+        start = time.perf_counter()
+        classifier.Bayesian(
+            pca_object, components=context['components']).accuracy()
+        seconds += time.perf_counter() - start
+        items += len(vectors)
+
+    # Return
+    return (seconds, items, 'vectors')
+
+
+def _linear(context):
+    """Time classifying every feature vector with the linear classifier.
+
+    Args:
+        context: Dict of benchmark data
+
+    Returns:
+        result: Tuple of (seconds, feature vectors, unit)
+
+    """
+    # Initialize key variables
+    items = 0
+    seconds = 0
+
+    # Time
+    for extract in context['extracts']:
+        vectors = extract.vectors()
+        classes = extract.classes_high(kessler=True)
+        start = time.perf_counter()
+        linear = classifier.Linear(vectors)
+        for vector in vectors:
+            linear.classifier(vector, classes)
+        seconds += time.perf_counter() - start
+        items += len(vectors)
+
+    # Return
+    return (seconds, items, 'vectors')
+
+
+def _report(context):
+    """Time rendering the HTML report of each pair.
+
+    Args:
+        context: Dict of benchmark data
+
+    Returns:
+        result: Tuple of (seconds, reports, unit)
+
+    """
+    # Initialize key variables
+    seconds = 0
+
+    # Create the predictions once, as they aren't part of rendering
+    if 'summaries' not in context:
+        context['summaries'] = [
+            report.Data(extract, components=context['components']).summary()
+            for extract in context['extracts']]
+
+    # Time
+    for (name, fxdata), extract, summary in zip(
+            context['fxdata'].items(), context['extracts'],
+            context['summaries']):
+        data = {
+            'years': context['years'],
+            'idx_pair': extract.idx_pair(),
+            'lookahead': context['lookahead'],
+            'last_timestamp': extract.last_timestamp(),
+            'predictions': {context['lookahead']: summary}
+        }
+        start = time.perf_counter()
+        report.Report(data, fxdata=fxdata, pair=name).html()
+        seconds += time.perf_counter() - start
+
+    # Return
+    return (seconds, len(context['extracts']), 'reports')
+
+
+def _ingest(context, timeframe=5):
+    """Time parsing an ingest file and aggregating its bars.
+
+    The bars are aggregated into hourly and daily bars. Nothing is written
+    to the database.
+
+    Args:
+        context: Dict of benchmark data
+        timeframe: Timeframe of the bars in the file in minutes
+
+    Returns:
+        result: Tuple of (seconds, bars, unit)
+
+    """
+    # Initialize key variables
+    data = synthetic.history(
+        years=1, timeframe=timeframe, seed=context['seed'])
+    aggregates = [
+        ingest.Aggregate(1, target, timeframe)
+        for target in (timeframe, 60, 1440)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        filepath = os.path.join(directory, 'EURUSD{}.csv'.format(timeframe))
+        synthetic.write_csv(filepath, data)
+
+        # Time
+        start = time.perf_counter()
+        for bar in ingest.bars(filepath):
+            for aggregate in aggregates:
+                aggregate.add(*bar)
+        seconds = time.perf_counter() - start
+
+    # Return
+    return (seconds, len(data['timestamp']), 'bars')
@@ -0,0 +1,141 @@
+"""Library to create synthetic price history.
+
+Prices follow a random walk whose volatility switches between regimes,
+as markets alternate between quiet and busy periods. Bars are only
+created for weekdays. The same seed always creates the same history.
+
+"""
+
+import time
+
+import numpy as np
+
+# Import custom libraries
+from crawsiz.db import db_data
+
+# Pairs to create by default
+PAIRS = ('EURUSD', 'GBPUSD', 'USDJPY', 'AUDUSD')
+
+# End of the history by default (2017-01-01 00:00 UTC)
+TS_STOP = 1483228800
+
+# Daily volatility of each regime, and the chance of staying in a regime
+# from one day to the next
+VOLATILITY = (0.003, 0.006, 0.012)
+PERSISTENCE = 0.98
+
+
+def history(
+        years=6, timeframe=1440, seed=0, ts_stop=TS_STOP, price=1.0,
+        volatility=VOLATILITY, persistence=PERSISTENCE):
+    """Create the price history of a pair.
+
+    Args:
+        years: Years of history to create
+        timeframe: Timeframe of the bars in minutes. Must divide a day.
+        seed: Seed of the random number generator
+        ts_stop: Timestamp after which there are no bars
+        price: Opening price of the first bar
+        volatility: Tuple of the daily volatility of each regime
+        persistence: Chance of staying in a regime from one day to the next
+
+    Returns:
+        data: Dict of numpy arrays keyed by db_data.OHLCV column
+
+    """
+    # Initialize key variables. RandomState streams don't change between
+    # numpy versions, so results can be compared across versions.
+    rng = np.random.RandomState(seed)
+    seconds_in_day = 86400
+    per_day = 1440 // timeframe
+
+    # Get the start of each weekday. 1970-01-01 was a Thursday.
+    ts_stop = ts_stop - (ts_stop % seconds_in_day)
+    days = np.arange(
+        ts_stop - (years * 365 * seconds_in_day), ts_stop, seconds_in_day)
+    days = days[(days // seconds_in_day + 3) % 7 < 5]
+
+    # Get the regime of each day
+    regimes = np.zeros(len(days), dtype=int)
+    switches = rng.random_sample(len(days)) > persistence
+    choices = rng.randint(0, len(volatility), len(days))
+    for index in range(1, len(days)):
+        if bool(switches[index]) is True:
+            regimes[index] = choices[index]
+        else:
+            regimes[index] = regimes[index - 1]
+
+    # Get the timestamp and volatility of each bar
+    timestamps = (
+        days.reshape(-1, 1) + np.arange(per_day) * timeframe * 60).ravel()
+    sigma = np.repeat(
+        np.asarray(volatility)[regimes], per_day) / np.sqrt(per_day)
+    bars = len(timestamps)
+
+    # Walk
+    fxclose = price * np.exp(np.cumsum(rng.standard_normal(bars) * sigma))
+    fxopen = np.concatenate(([price], fxclose[:-1]))
+    fxhigh = np.maximum(fxopen, fxclose) * np.exp(
+        np.abs(rng.standard_normal(bars)) * sigma / 2)
+    fxlow = np.minimum(fxopen, fxclose) * np.exp(
+        -np.abs(rng.standard_normal(bars)) * sigma / 2)
+    fxvolume = rng.poisson(
+        (1000 / per_day) * (1 + np.repeat(regimes, per_day))) + 1
+
+    # Return prices quoted to five decimal places
+    data = dict(zip(db_data.OHLCV, (
+        timestamps,
+        np.round(fxopen, 5),
+        np.round(fxhigh, 5),
+        np.round(fxlow, 5),
+        np.round(fxclose, 5),
+        fxvolume)))
+    return data
+
+
+def pairs(names=PAIRS, years=6, timeframe=1440, seed=0):
+    """Create the price history of several pairs.
+
+    Args:
+        names: Names of the pairs
+        years: Years of history to create
+        timeframe: Timeframe of the bars in minutes
+        seed: Seed of the random number generator of the first pair. The
+            seed of each following pair is one more than the last.
+
+    Returns:
+        result: Dict of db_data.Arrays objects keyed by pair name
+
+    """
+    # Initialize key variables
+    result = {}
+
+    # Create
+    for index, name in enumerate(names):
+        data = history(years=years, timeframe=timeframe, seed=seed + index)
+        result[name] = db_data.Arrays(data)
+
+    # Return
+    return result
+
+
+def write_csv(filepath, data):
+    """Write price history in the format of ingest files.
+
+    Args:
+        filepath: Path of the file. The name of ingest files is the pair
+            followed by the timeframe in minutes, such as EURUSD1440.csv
+        data: Dict of numpy arrays created by history()
+
+    Returns:
+        None
+
+    """
+    # Write
+    with open(filepath, 'w') as f_handle:
+        for values in zip(*[data[column].tolist() for column in
+                            db_data.OHLCV]):
+            (timestamp, fxopen, fxhigh, fxlow, fxclose, fxvolume) = values
+            f_handle.write('{},{:.5f},{:.5f},{:.5f},{:.5f},{}\n'.format(
+                time.strftime('%Y.%m.%d,%H:%M', time.gmtime(timestamp)),
+                fxopen, fxhigh, fxlow, fxclose, fxvolume))
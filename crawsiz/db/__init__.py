@@ -1,21 +1,24 @@
 #!/usr/bin/env python3
 """Infoset ORM classes.
 
-Manages connection pooling among other things.
+Manages connection pooling among other things. Nothing is read or
+connected when the package is imported. The configuration is read when
+pool() or url() are first called, and each process creates its engine
+when it first needs a connection.
 
 """
 
 # Main python libraries
 import os
+import threading
+import multiprocessing
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session
 from sqlalchemy.orm import scoped_session
 from sqlalchemy import event
-from sqlalchemy import exc
 
 # Infoset libraries
 from crawsiz.utils import configuration
-from crawsiz.db import db_orm
 from crawsiz.utils import log
 
 #############################################################################
@@ -23,6 +26,7 @@ from crawsiz.utils import log
 #############################################################################
 POOL = None
 DBURL = None
+ENGINE = {}
 
 
 def main():
@@ -36,112 +40,213 @@ def main():
 
     """
     # Initialize key variables
-    use_mysql = True
-    pool_size = 50
-    max_overflow = 50
     global POOL
     global DBURL
 
     # Get configuration
     config = configuration.Config()
+    backend = config.db_backend()
 
-    # Create DB connection pool
-    if use_mysql is True:
+    # Get the database URL
+    if backend == 'mysql':
         DBURL = ('mysql+pymysql://%s:%s@%s/%s?charset=utf8mb4') % (
             config.db_username(), config.db_password(),
             config.db_hostname(), config.db_name())
+    else:
+        DBURL = ('sqlite:///%s') % (config.db_file())
+
+    # Sessions are scoped by process as well as by thread, and are bound
+    # to an engine created by the process that uses them. Processes
+    # forked by multiprocessing therefore never share connections.
+    POOL = scoped_session(_session, scopefunc=_scope)
+
+
+def pool():
+    """Get the scoped session factory used to access the database.
+
+    Args:
+        None
+
+    Returns:
+        POOL: SQLalchemy scoped_session
+
+    """
+    # Initialize on first use
+    if POOL is None:
+        main()
+    return POOL
+
+
+def url():
+    """Get the database URL.
+
+    Args:
+        None
+
+    Returns:
+        DBURL: Database URL
+
+    """
+    # Initialize on first use
+    if DBURL is None:
+        main()
+    return DBURL
+
+
+def engine():
+    """Get the database engine for the current process.
+
+    The engine is created on first use in each process.
+
+    Args:
+        None
+
+    Returns:
+        db_engine: SQLalchemy engine instance
+
+    """
+    # Initialize key variables
+    pid = os.getpid()
+
+    # Create the engine if required. Engines inherited from a parent
+    # process are deliberately left untouched, as cleaning them up would
+    # act on connections that the parent is still using.
+    if pid not in ENGINE:
+        ENGINE[pid] = _create_engine()
+
+    # Return
+    db_engine = ENGINE[pid]
+    return db_engine
+
+
+def _create_engine():
+    """Create a database engine.
+
+    Args:
+        None
 
+    Returns:
+        db_engine: SQLalchemy engine instance
+
+    """
+    # Get configuration
+    config = configuration.Config()
+
+    if config.db_backend() == 'mysql':
         # Add MySQL to the pool
         db_engine = create_engine(
-            DBURL, echo=False,
+            url(), echo=False,
             encoding='utf8',
-            max_overflow=max_overflow,
-            pool_size=pool_size, pool_recycle=3600)
-
-        # Fix for multiprocessing
-        _add_engine_pidguard(db_engine)
-
-        POOL = scoped_session(
-            sessionmaker(
-                autoflush=True,
-                autocommit=False,
-                bind=db_engine
-            ))
+            **_pool_arguments(config))
 
     else:
-        POOL = None
+        # Use an embedded database file. Wait for locks held by
+        # other processes instead of failing immediately.
+        db_engine = create_engine(
+            url(), echo=False,
+            encoding='utf8',
+            connect_args={'timeout': 60})
+        _add_engine_sqlite_pragmas(db_engine)
 
+    # Return
+    return db_engine
 
-def _add_engine_pidguard(engine):
-    """Add multiprocessing guards.
 
-    Forces a connection to be reconnected if it is detected
-    as having been shared to a sub-process.
+def _pool_arguments(config):
+    """Get connection pool arguments for the engine.
 
-    source
-    ------
+    Args:
+        config: Configuration object
+
+    Returns:
+        arguments: Dict of keyword arguments for create_engine
 
-    http://docs.sqlalchemy.org/en/latest/faq/connections.html
-    "How do I use engines / connections / sessions with
-    Python multiprocessing, or os.fork()?"
+    """
+    # Initialize key variables
+    pool_size = config.db_pool_size()
+    max_overflow = config.db_max_overflow()
+
+    # Share the configured number of connections between the pool
+    # workers and the parent process that started them.
+    if pool_size == 'auto':
+        processes = max(1, multiprocessing.cpu_count() - 1) + 1
+        pool_size = max(1, config.db_max_connections() // processes)
+        max_overflow = 0
+
+    # Return
+    arguments = {
+        'pool_size': int(pool_size),
+        'max_overflow': int(max_overflow),
+        'pool_recycle': int(config.db_pool_recycle()),
+        'pool_timeout': int(config.db_pool_timeout())
+    }
+    log_message = ('Database pool settings for process %s: %s') % (
+        os.getpid(), arguments)
+    log.log2quiet(1118, log_message)
+    return arguments
+
+
+def _session():
+    """Create a session bound to the engine of the current process.
 
     Args:
-        engine: SQLalchemy engine instance
+        None
 
     Returns:
+        session: SQLalchemy session
+
+    """
+    # Create session
+    session = Session(
+        autoflush=True,
+        autocommit=False,
+        bind=engine()
+    )
+    return session
+
+
+def _scope():
+    """Get the scope of scoped sessions.
+
+    Args:
         None
 
+    Returns:
+        scope: Tuple of process ID and thread ID
+
     """
-    @event.listens_for(engine, 'connect')
-    def connect(dbapi_connection, connection_record):
-        """Get the PID of the sub-process for connections.
+    # Return
+    scope = (os.getpid(), threading.get_ident())
+    return scope
 
-        Args:
-            dbapi_connection: Connection object
-            connection_record: Connection record object
 
-        Returns:
-            None
+def _add_engine_sqlite_pragmas(db_engine):
+    """Configure SQLite connections for concurrent use by processes.
 
-        """
-        connection_record.info['pid'] = os.getpid()
+    Write ahead logging allows readers to continue while another process
+    writes to the database.
 
-    @event.listens_for(engine, 'checkout')
-    def checkout(dbapi_connection, connection_record, connection_proxy):
-        """Checkout sub-processes connection for sub-processing if needed.
+    Args:
+        db_engine: SQLalchemy engine instance
 
-            Checkout is called when a connection is retrieved from the Pool.
+    Returns:
+        None
+
+    """
+    @event.listens_for(db_engine, 'connect')
+    def connect(dbapi_connection, connection_record):
+        """Set pragmas for new connections.
 
         Args:
             dbapi_connection: Connection object
             connection_record: Connection record object
-            connection_proxy: Connection proxy object
 
         Returns:
             None
 
         """
-        # Get PID of main process
-        pid = os.getpid()
-
-        # Detect if this is a sub-process
-        if connection_record.info['pid'] != pid:
-            # substitute log.debug() or similar here as desired
-            log_message = (
-                'Parent process %s forked (%s) with an open '
-                'database connection, '
-                'which is being discarded and recreated.'
-                '') % (
-                    connection_record.info['pid'], pid)
-            log.log2quiet(1079, log_message)
-
-            connection_record.connection = connection_proxy.connection = None
-            raise exc.DisconnectionError(
-                "Connection record belongs to pid %s, "
-                "attempting to check out in pid %s" %
-                (connection_record.info['pid'], pid)
-            )
-
-
-if __name__ == 'crawsiz.db':
-    main()
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
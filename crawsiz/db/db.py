@@ -2,11 +2,12 @@
 
 """Class to process connection."""
 
-from sqlalchemy import and_
+from sqlalchemy import and_, bindparam, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 
 # Infoset libraries
 from crawsiz.utils import log
-from crawsiz.db import POOL
+from crawsiz.db import pool
 from crawsiz.db.db_orm import Pair
 
 
@@ -34,7 +35,7 @@ class Database(object):
 
         """
         # Intialize key variables
-        self.pool = POOL
+        self.pool = pool()
 
     def query(self, sql_statement, error_code):
         """Do a database query.
@@ -183,6 +184,174 @@ class Database(object):
         # Return
         return success
 
+    def insert_all(self, table, data_list, error_code, die=True):
+        """Insert many rows into a table in a single executemany call.
+
+        This avoids the cost of creating and flushing ORM objects when
+        loading large volumes of data.
+
+        Args:
+            table: SQLalchemy table object (eg. Data.__table__)
+            data_list: List of dicts keyed by column name
+            error_code: Error number to use if one occurs
+            die: Don't die if False, just return success
+
+        Returns:
+            success: True is successful
+
+        """
+        # Return
+        success = self._execute_many(
+            table.insert(), data_list, error_code, die=die)
+        return success
+
+    def upsert_all(
+            self, table, data_list, keys, error_code, die=True, update=True):
+        """Insert many rows into a table, updating rows that already exist.
+
+        Rows already exist if they have the same values for the columns
+        of a unique constraint or primary key of the table.
+
+        Args:
+            table: SQLalchemy table object (eg. Prediction.__table__)
+            data_list: List of dicts keyed by column name. Every dict must
+                have the same keys.
+            keys: Tuple of column names of the unique constraint
+            error_code: Error number to use if one occurs
+            die: Don't die if False, just return success
+            update: Leave rows that already exist unchanged if False
+
+        Returns:
+            success: True is successful
+
+        """
+        # Nothing to do
+        if bool(data_list) is False:
+            return True
+
+        # Columns to update when a row already exists
+        columns = list(data_list[0].keys())
+        updates = [column for column in columns if column not in keys]
+
+        # Each backend has its own syntax. Setting a key column to its own
+        # value leaves MySQL rows unchanged.
+        dialect = self.session().get_bind().dialect.name
+        if dialect == 'mysql':
+            statement = mysql_insert(table)
+            if update is True:
+                statement = statement.on_duplicate_key_update(
+                    {column: statement.inserted[column]
+                     for column in updates})
+            else:
+                statement = statement.on_duplicate_key_update(
+                    {keys[0]: table.c[keys[0]]})
+        else:
+            if update is True:
+                action = 'UPDATE SET {}'.format(', '.join(
+                    ['{0} = excluded.{0}'.format(column)
+                     for column in updates]))
+            else:
+                action = 'NOTHING'
+            statement = text(
+                'INSERT INTO {0} ({1}) VALUES ({2}) '
+                'ON CONFLICT ({3}) DO {4}'.format(
+                    table.name,
+                    ', '.join(columns),
+                    ', '.join([':{}'.format(column) for column in columns]),
+                    ', '.join(keys),
+                    action))
+
+        # Return
+        success = self._execute_many(
+            statement, data_list, error_code, die=die)
+        return success
+
+    def update_all(self, table, data_list, error_code, die=True):
+        """Update many rows of a table in a single executemany call.
+
+        Args:
+            table: SQLalchemy table object (eg. Prediction.__table__)
+            data_list: List of dicts keyed by column name. Each dict has
+                the "idx" of the row to update and the new values of its
+                columns. Every dict must have the same keys.
+            error_code: Error number to use if one occurs
+            die: Don't die if False, just return success
+
+        Returns:
+            success: True is successful
+
+        """
+        # Nothing to do
+        if bool(data_list) is False:
+            return True
+
+        # The parameter for "idx" must not share its name with the column,
+        # otherwise SQLalchemy would also try to update it.
+        statement = table.update().where(table.c.idx == bindparam('_idx'))
+        data_list = [
+            {('_idx' if key == 'idx' else key): value
+             for key, value in row.items()} for row in data_list]
+
+        # Return
+        success = self._execute_many(
+            statement, data_list, error_code, die=die)
+        return success
+
+    def _execute_many(self, statement, data_list, error_code, die=True):
+        """Execute a statement once for each row in a single call.
+
+        Args:
+            statement: SQLalchemy statement
+            data_list: List of dicts keyed by column name
+            error_code: Error number to use if one occurs
+            die: Don't die if False, just return success
+
+        Returns:
+            success: True is successful
+
+        """
+        # Initialize key variables
+        success = False
+
+        # Open database connection. Prepare cursor
+        session = self.session()
+
+        try:
+            # Process the rows
+            session.execute(statement, data_list)
+
+            # Commit  change
+            session.commit()
+
+            # Update success
+            success = True
+
+        except Exception as exception_error:
+            success = False
+            session.rollback()
+            log_message = (
+                'Unable to modify database connection. '
+                'Error: \"%s\"') % (exception_error)
+            if die is True:
+                log.log2die(error_code, log_message)
+            else:
+                log.log2warn(error_code, log_message)
+
+        except:
+            success = False
+            session.rollback()
+            log_message = ('Unexpected database exception')
+            if die is True:
+                log.log2die(error_code, log_message)
+            else:
+                log.log2warn(error_code, log_message)
+
+        # disconnect from server
+        self.close()
+
+        # Return
+        return success
+
     def session(self):
         """Get a session from the database pool.
 
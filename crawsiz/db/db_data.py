@@ -4,17 +4,28 @@ Classes for agent data
 
 """
 # Python standard libraries
-from sqlalchemy import and_
+from itertools import islice
+
+# Non standard imports
+import numpy as np
+from sqlalchemy import and_, func
 
 # Infoset libraries
 from crawsiz.utils import log
+from crawsiz.utils import rolling
 from crawsiz.db import db
 from crawsiz.db.db_orm import Data
 from crawsiz.db import db_pair
 
+# Columns returned by GetIDX, in query order
+COLUMNS = ('timestamp', 'fxhigh', 'fxlow', 'fxclose', 'fxvolume')
+
+# All the price columns of the Data table
+OHLCV = ('timestamp', 'fxopen', 'fxhigh', 'fxlow', 'fxclose', 'fxvolume')
 
-class GetIDX(object):
-    """Class to return agent data.
+
+class Arrays(object):
+    """Class to return price history held in numpy arrays.
 
     Args:
         None
@@ -26,52 +37,34 @@ class GetIDX(object):
 
     """
 
-    def __init__(self, idx, ts_start, ts_stop):
+    def __init__(self, data):
         """Function for intializing the class.
 
         Args:
-            idx: idx of datapoint
-            ts_start: Starting timestamp
-            ts_stop: Ending timestamp
+            data: Dict of numpy arrays keyed by column name
 
         Returns:
             None
 
         """
         # Initialize important variables
-        self.data_fxhigh = []
-        self.data_fxlow = []
-        self.data_fxclose = []
-        self.data_fxvolume = []
-        self.data_timestamp = []
-
-        # Fix edge cases
-        if ts_start > ts_stop:
-            ts_start = ts_stop
+        self.data_arrays = data
+        self.data_lists = {}
+        self.data_extrema = {}
 
-        # Make sure pair idx exists
-        if db_pair.idx_exists(idx) is False:
-            log_message = ('idx %s not found.') % (idx)
-            log.log2die(1049, log_message)
+    def arrays(self):
+        """Get all data as numpy arrays.
 
-        # Establish a database session
-        database = db.Database()
-        session = database.session()
-        result = session.query(Data).filter(and_(
-            Data.timestamp >= ts_start,
-            Data.timestamp <= ts_stop,
-            Data.idx_pair == idx)).order_by(Data.timestamp)
+        Args:
+            None
 
-        # Return the session to the database pool after processing
-        database.close()
+        Returns:
+            value: Dict of numpy arrays keyed by column name
 
-        # Massage data
-        for instance in result:
-            self.data_fxhigh.append(instance.fxhigh)
-            self.data_fxlow.append(instance.fxlow)
-            self.data_timestamp.append(instance.timestamp)
-            self.data_fxclose.append(instance.fxclose)
-            self.data_fxvolume.append(instance.fxvolume)
+        """
+        # Return data
+        value = self.data_arrays
+        return value
 
     def timestamp(self):
         """Get timestamp data.
@@ -84,7 +77,7 @@ class GetIDX(object):
 
         """
         # Return data
-        value = self.data_timestamp
+        value = self._list('timestamp')
         return value
 
     def fxhigh(self):
@@ -98,7 +91,7 @@ class GetIDX(object):
 
         """
         # Return data
-        value = self.data_fxhigh
+        value = self._list('fxhigh')
         return value
 
     def fxlow(self):
@@ -112,7 +105,7 @@ class GetIDX(object):
 
         """
         # Return data
-        value = self.data_fxlow
+        value = self._list('fxlow')
         return value
 
     def fxclose(self):
@@ -126,7 +119,7 @@ class GetIDX(object):
 
         """
         # Return data
-        value = self.data_fxclose
+        value = self._list('fxclose')
         return value
 
     def fxvolume(self):
@@ -140,5 +133,336 @@ class GetIDX(object):
 
         """
         # Return data
-        value = self.data_fxvolume
+        value = self._list('fxvolume')
         return value
+
+    def extrema(self, column, windows, maximum=True):
+        """Get the indices of the extreme values of windows ending at each bar.
+
+        The indices of each window are only calculated once as these
+        methods are called for every feature of every feature vector.
+
+        Args:
+            column: Column name
+            windows: Iterable of window lengths in bars
+            maximum: Get the maximum values if True, the minimum values if
+                False
+
+        Returns:
+            value: Dict of numpy arrays keyed by window. See
+                rolling.extrema().
+
+        """
+        # Initialize key variables
+        cache = self.data_extrema.setdefault((column, maximum), {})
+        missing = [window for window in windows if window not in cache]
+
+        # Calculate windows not yet in the cache in a single pass
+        if bool(missing) is True:
+            cache.update(rolling.extrema(
+                self.data_arrays[column], missing, maximum=maximum))
+
+        # Return data
+        value = {window: cache[window] for window in windows}
+        return value
+
+    def _list(self, column):
+        """Get data for a column as a list.
+
+        The list is only created once as these methods are called
+        for every feature of every feature vector.
+
+        Args:
+            column: Column name
+
+        Returns:
+            value: List of data
+
+        """
+        # Convert
+        if column not in self.data_lists:
+            self.data_lists[column] = self.data_arrays[column].tolist()
+
+        # Return data
+        value = self.data_lists[column]
+        return value
+
+
+class GetIDX(Arrays):
+    """Class to return agent data.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    Methods:
+
+    """
+
+    def __init__(
+            self, idx, ts_start, ts_stop, timeframe=1440,
+            stream=False, chunksize=10000, columns=COLUMNS):
+        """Function for intializing the class.
+
+        Args:
+            idx: idx of datapoint
+            ts_start: Starting timestamp
+            ts_stop: Ending timestamp
+            timeframe: Timeframe of the bars in minutes
+            stream: Read rows through a server side cursor if True. Use
+                this for large histories so that rows are not buffered
+                by the client.
+            chunksize: Number of rows to process at a time
+            columns: Tuple of Data columns to get, starting with
+                "timestamp"
+
+        Returns:
+            None
+
+        """
+        # Fix edge cases
+        if ts_start > ts_stop:
+            ts_start = ts_stop
+
+        # Make sure pair idx exists
+        if db_pair.idx_exists(idx) is False:
+            log_message = ('idx %s not found.') % (idx)
+            log.log2die(1049, log_message)
+
+        # Establish a database session
+        database = db.Database()
+        session = database.session()
+        conditions = and_(
+            Data.timestamp >= ts_start,
+            Data.timestamp <= ts_stop,
+            Data.timeframe == timeframe,
+            Data.idx_pair == idx)
+
+        # Preallocate arrays. The count and the rows are read in the same
+        # transaction so they come from the same snapshot of the table.
+        rows = session.query(
+            func.count(Data.timestamp)).filter(conditions).scalar()
+        data = _arrays(rows, columns=columns)
+
+        # Only select the columns required, not ORM objects
+        result = session.query(*[
+            getattr(Data, column) for column in columns]).filter(
+                conditions).order_by(Data.timestamp)
+        if stream is True:
+            result = result.execution_options(
+                stream_results=True).yield_per(chunksize)
+
+        # Massage data a chunk at a time
+        _fill(data, iter(result), chunksize, columns=columns)
+
+        # Return the session to the database pool after processing
+        database.close()
+
+        # Make data available to the accessor methods
+        super().__init__(data)
+
+
+def get_idx_list(
+        indices, ts_start, ts_stop, timeframe=1440,
+        stream=False, chunksize=10000):
+    """Get price history for many pairs with a single query.
+
+    Args:
+        indices: List of pair idx values
+        ts_start: Starting timestamp
+        ts_stop: Ending timestamp
+        timeframe: Timeframe of the bars in minutes
+        stream: Read rows through a server side cursor if True
+        chunksize: Number of rows to process at a time
+
+    Returns:
+        data: Dict of Arrays objects keyed by pair idx. Pairs without
+            data have empty arrays.
+
+    """
+    # Initialize key variables
+    data = {}
+    columns = ('idx_pair',) + COLUMNS
+
+    # Fix edge cases
+    if ts_start > ts_stop:
+        ts_start = ts_stop
+
+    # Establish a database session
+    database = db.Database()
+    session = database.session()
+    conditions = and_(
+        Data.timestamp >= ts_start,
+        Data.timestamp <= ts_stop,
+        Data.timeframe == timeframe,
+        Data.idx_pair.in_(indices))
+
+    # Get the pair of each row with the row, so that rows can't be
+    # assigned to the wrong pair
+    result = session.query(*[
+        getattr(Data, column) for column in columns]).filter(
+            conditions).order_by(Data.idx_pair, Data.timestamp)
+    if stream is True:
+        result = result.execution_options(
+            stream_results=True).yield_per(chunksize)
+    arrays = _read(iter(result), chunksize, columns=columns)
+
+    # Return the session to the database pool after processing
+    database.close()
+
+    # Rows are sorted by pair, so each pair is a contiguous block
+    (pairs, starts) = np.unique(arrays['idx_pair'], return_index=True)
+    stops = np.append(starts[1:], len(arrays['idx_pair']))
+    for idx_pair, start, stop in zip(
+            pairs.tolist(), starts.tolist(), stops.tolist()):
+        data[idx_pair] = Arrays(
+            {column: arrays[column][start:stop] for column in COLUMNS})
+
+    # Pairs without data
+    for idx_pair in indices:
+        if idx_pair not in data:
+            data[idx_pair] = Arrays(_arrays(0))
+
+    # Return
+    return data
+
+
+def last_timestamps(idx_pair):
+    """Get the timestamp of the most recent bar of each timeframe for a pair.
+
+    Args:
+        idx_pair: Pair idx
+
+    Returns:
+        data: Dict of timestamps keyed by timeframe
+
+    """
+    # Initialize key variables
+    data = {}
+
+    # Establish a database session
+    database = db.Database()
+    session = database.session()
+    result = session.query(
+        Data.timeframe, func.max(Data.timestamp)).filter(
+            Data.idx_pair == idx_pair).group_by(Data.timeframe)
+
+    # Massage data
+    for (timeframe, timestamp) in result:
+        data[timeframe] = timestamp
+
+    # Return the session to the database pool after processing
+    database.close()
+
+    # Return
+    return data
+
+
+def _arrays(rows, columns=COLUMNS):
+    """Create empty numpy arrays for GetIDX columns.
+
+    Args:
+        rows: Number of rows
+        columns: Tuple of column names
+
+    Returns:
+        data: Dict of numpy arrays keyed by column name
+
+    """
+    # Initialize key variables
+    data = {}
+
+    # Timestamps, pairs and volumes are integers, everything else is a
+    # float
+    for column in columns:
+        if column in ('timestamp', 'idx_pair', 'fxvolume'):
+            data[column] = np.zeros(rows, dtype=np.int64)
+        else:
+            data[column] = np.zeros(rows, dtype=np.float64)
+
+    # Return
+    return data
+
+
+def _fill(data, rows, chunksize, columns=COLUMNS):
+    """Fill numpy arrays from database rows a chunk at a time.
+
+    Args:
+        data: Dict of preallocated numpy arrays keyed by column name. The
+            arrays are truncated if there are fewer rows.
+        rows: Iterator of row tuples in "columns" order
+        chunksize: Number of rows to process at a time
+        columns: Tuple of column names
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    size = len(data['timestamp'])
+    pointer = 0
+
+    # Copy each chunk into the arrays
+    while pointer < size:
+        chunk = list(islice(rows, min(chunksize, size - pointer)))
+        if bool(chunk) is False:
+            break
+        stop = pointer + len(chunk)
+        for index, values in enumerate(zip(*chunk)):
+            data[columns[index]][pointer:stop] = values
+        pointer = stop
+
+    # Drop the rows that weren't read, such as when rows were deleted
+    # after they were counted
+    if pointer < size:
+        log_message = (
+            'Only {} of {} expected rows were read from the database.'
+            ''.format(pointer, size))
+        log.log2warn(1136, log_message)
+        for column in columns:
+            data[column] = data[column][:pointer]
+
+    # Drop unused rows if there were fewer rows than expected
+    if pointer < size:
+        for column in columns:
+            data[column] = data[column][:pointer]
+
+
+def _read(rows, chunksize, columns=COLUMNS):
+    """Read database rows into numpy arrays a chunk at a time.
+
+    Use this instead of _fill() when the number of rows isn't known.
+
+    Args:
+        rows: Iterator of row tuples in "columns" order
+        chunksize: Number of rows to process at a time
+        columns: Tuple of column names
+
+    Returns:
+        data: Dict of numpy arrays keyed by column name
+
+    """
+    # Initialize key variables
+    chunks = []
+
+    # Copy each chunk into its own arrays
+    while True:
+        chunk = list(islice(rows, chunksize))
+        if bool(chunk) is False:
+            break
+        arrays = _arrays(len(chunk), columns=columns)
+        _fill(arrays, iter(chunk), chunksize, columns=columns)
+        chunks.append(arrays)
+
+    # Join the chunks
+    if bool(chunks) is False:
+        data = _arrays(0, columns=columns)
+    else:
+        data = {
+            column: np.concatenate([arrays[column] for arrays in chunks])
+            for column in columns}
+
+    # Return
+    return data
@@ -8,13 +8,38 @@ Manages connection pooling among other things.
 # SQLobject stuff
 from sqlalchemy import UniqueConstraint, PrimaryKeyConstraint, text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.dialects.mysql import BIGINT, DATETIME, INTEGER
 from sqlalchemy.dialects.mysql import FLOAT, VARBINARY
+from sqlalchemy.schema import CreateColumn
 from sqlalchemy import Column
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
+from sqlalchemy import Integer
 
 BASE = declarative_base()
 
+# SQLite only auto increments primary keys of type "INTEGER"
+UNSIGNED_BIGINT = BIGINT(unsigned=True).with_variant(Integer(), 'sqlite')
+
+
+@compiles(CreateColumn, 'sqlite')
+def _sqlite_create_column(element, compiler, **kwargs):
+    """Remove MySQL only clauses from SQLite column definitions.
+
+    Args:
+        element: CreateColumn object
+        compiler: SQLite DDL compiler
+
+    Returns:
+        result: Column definition
+
+    """
+    # Create definition
+    result = compiler.visit_create_column(element, **kwargs)
+    result = result.replace(' ON UPDATE CURRENT_TIMESTAMP', '')
+    return result
+
 
 class Data(BASE):
     """Class defining the xs_data table of the database."""
@@ -22,16 +47,19 @@ class Data(BASE):
     __tablename__ = 'xs_data'
     __table_args__ = (
         PrimaryKeyConstraint(
-            'idx_pair', 'timestamp'),
+            'idx_pair', 'timeframe', 'timestamp'),
         {
             'mysql_engine': 'InnoDB'
         }
         )
 
     idx_pair = Column(
-        BIGINT(unsigned=True), ForeignKey('xs_pair.idx'),
+        UNSIGNED_BIGINT, ForeignKey('xs_pair.idx'),
         nullable=False, server_default='1')
 
+    timeframe = Column(
+        INTEGER(unsigned=True), nullable=False, server_default='1440')
+
     fxopen = Column(FLOAT, default=None)
 
     fxhigh = Column(FLOAT, default=None)
@@ -42,7 +70,7 @@ class Data(BASE):
 
     fxvolume = Column(FLOAT, default=None)
 
-    timestamp = Column(BIGINT(unsigned=True), nullable=False, default='1')
+    timestamp = Column(UNSIGNED_BIGINT, nullable=False, default='1')
 
     ts_modified = Column(
         DATETIME, server_default=text(
@@ -65,13 +93,13 @@ class Pair(BASE):
         )
 
     idx = Column(
-        BIGINT(unsigned=True), primary_key=True,
+        UNSIGNED_BIGINT, primary_key=True,
         autoincrement=True, nullable=False)
 
     pair = Column(VARBINARY(512), nullable=True, default=None)
 
     last_timestamp = Column(
-        BIGINT(unsigned=True), nullable=False, server_default='0')
+        UNSIGNED_BIGINT, nullable=False, server_default='0')
 
     ts_modified = Column(
         DATETIME, server_default=text(
@@ -88,17 +116,25 @@ class Prediction(BASE):
     __table_args__ = (
         UniqueConstraint(
             'idx_pair', 'timestamp', 'lookahead'),
+
+        # Covers queries of all the predictions and outcomes of a pair
+        # over a range of dates without reading the table rows
+        Index(
+            'xs_prediction_history',
+            'idx_pair', 'timestamp', 'lookahead',
+            'fxhigh_linear', 'fxhigh_bayesian', 'fxhigh_actual',
+            'fxlow_linear', 'fxlow_bayesian', 'fxlow_actual'),
         {
             'mysql_engine': 'InnoDB'
         }
         )
 
     idx = Column(
-        BIGINT(unsigned=True), primary_key=True,
+        UNSIGNED_BIGINT, primary_key=True,
         autoincrement=True, nullable=False)
 
     idx_pair = Column(
-        BIGINT(unsigned=True), ForeignKey('xs_pair.idx'),
+        UNSIGNED_BIGINT, ForeignKey('xs_pair.idx'),
         nullable=False, server_default='1')
 
     fxhigh_linear = Column(INTEGER, default=None)
@@ -109,11 +145,17 @@ class Prediction(BASE):
 
     fxlow_bayesian = Column(INTEGER, default=None)
 
+    # Classes that actually occurred. NULL until "lookahead" bars after
+    # the prediction have been ingested.
+    fxhigh_actual = Column(INTEGER, default=None)
+
+    fxlow_actual = Column(INTEGER, default=None)
+
     lookahead = Column(
-        BIGINT(unsigned=True), nullable=False, server_default='0')
+        UNSIGNED_BIGINT, nullable=False, server_default='0')
 
     timestamp = Column(
-        BIGINT(unsigned=True), nullable=False, server_default='0')
+        UNSIGNED_BIGINT, nullable=False, server_default='0')
 
     ts_modified = Column(
         DATETIME, server_default=text(
@@ -254,3 +254,32 @@ def idx_all():
 
     # Return
     return data
+
+
+def pairs():
+    """Return the names of all pairs with a single query.
+
+    Args:
+        None
+
+    Returns:
+        data: Dict of pair names keyed by pair idx
+
+    """
+    # Initialize key variables
+    data = {}
+
+    # Establish a database session
+    database = db.Database()
+    session = database.session()
+    result = session.query(Pair.idx, Pair.pair)
+
+    # Return the session to the database pool after processing
+    database.close()
+
+    # Massage data
+    for instance in result:
+        data[instance.idx] = general.decode(instance.pair)
+
+    # Return
+    return data
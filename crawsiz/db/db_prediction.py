@@ -7,13 +7,31 @@ Classes for agent data
 from collections import defaultdict
 
 # Python libraries
-from sqlalchemy import and_
+import numpy as np
+from sqlalchemy import and_, case, func
 
 # Crawsiz libraries
 from crawsiz.db import db
+from crawsiz.db import db_data
 from crawsiz.db.db_orm import Prediction
 from crawsiz.utils import log
 
+# Columns returned by GetPredictions
+COLUMNS = (
+    'timestamp', 'lookahead', 'fxhigh_linear', 'fxhigh_bayesian',
+    'fxhigh_actual', 'fxlow_linear', 'fxlow_bayesian', 'fxlow_actual')
+
+# Prediction columns and the columns of their actual outcomes
+OUTCOMES = {
+    'fxhigh_linear': 'fxhigh_actual',
+    'fxhigh_bayesian': 'fxhigh_actual',
+    'fxlow_linear': 'fxlow_actual',
+    'fxlow_bayesian': 'fxlow_actual'
+}
+
+# Columns of the unique key of the Prediction table
+KEYS = ('idx_pair', 'timestamp', 'lookahead')
+
 
 class GetPrediction(object):
     """Class to return Prediction data by host and agent idx.
@@ -52,15 +70,16 @@ class GetPrediction(object):
         # Return the session to the database pool after processing
         database.close()
 
-        # Massage data
-        if result.count() == 1:
-            for instance in result:
-                self.data_dict['timestamp'] = instance.timestamp
-                self.data_dict['fxhigh_bayesian'] = instance.fxhigh_bayesian
-                self.data_dict['fxhigh_linear'] = instance.fxhigh_linear
-                self.data_dict['fxlow_linear'] = instance.fxlow_linear
-                self.data_dict['fxlow_bayesian'] = instance.fxlow_bayesian
-                break
+        # Massage data. Fetch two rows at most to detect duplicates without
+        # an extra count query.
+        rows = result.limit(2).all()
+        if len(rows) == 1:
+            instance = rows[0]
+            self.data_dict['timestamp'] = instance.timestamp
+            self.data_dict['fxhigh_bayesian'] = instance.fxhigh_bayesian
+            self.data_dict['fxhigh_linear'] = instance.fxhigh_linear
+            self.data_dict['fxlow_linear'] = instance.fxlow_linear
+            self.data_dict['fxlow_bayesian'] = instance.fxlow_bayesian
         else:
             log_message = (
                 'Pair IDX %s timestamp %s not found in xs_prediction table.'
@@ -138,6 +157,352 @@ class GetPrediction(object):
         return value
 
 
+class GetPredictions(object):
+    """Class to return all the Prediction data of a pair as numpy arrays.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    Methods:
+
+    """
+
+    def __init__(self, idx_pair, lookahead=None, ts_start=None, ts_stop=None):
+        """Method initializing the class.
+
+        Args:
+            idx_pair: Pair idx
+            lookahead: Only get predictions for this lookahead if not None
+            ts_start: Only get predictions from this timestamp if not None
+            ts_stop: Only get predictions up to this timestamp if not None
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        columns = [getattr(Prediction, column) for column in COLUMNS]
+        filters = [Prediction.idx_pair == idx_pair]
+        if lookahead is not None:
+            filters.append(Prediction.lookahead == lookahead)
+        if ts_start is not None:
+            filters.append(Prediction.timestamp >= ts_start)
+        if ts_stop is not None:
+            filters.append(Prediction.timestamp <= ts_stop)
+
+        # Get the data in a single query
+        database = db.Database()
+        session = database.session()
+        rows = session.query(*columns).filter(and_(*filters)).order_by(
+            Prediction.lookahead, Prediction.timestamp).all()
+        database.close()
+
+        # Convert to arrays. Undecided predictions are stored as NULL and
+        # become zero.
+        self.data = {}
+        values = np.array(rows, dtype=object).reshape(-1, len(COLUMNS))
+        values[np.equal(values, None)] = 0
+        for index, column in enumerate(COLUMNS):
+            self.data[column] = values[:, index].astype(np.int64)
+
+    def arrays(self):
+        """Get all the arrays.
+
+        Args:
+            None
+
+        Returns:
+            value: Dict of numpy arrays keyed by column name. Rows are
+                sorted by lookahead, then timestamp. Predictions are -1 or
+                1, or 0 if undecided. Actual classes are 0 until known.
+
+        """
+        # Return
+        value = self.data
+        return value
+
+    def timestamp(self):
+        """Get timestamp values.
+
+        Args:
+            None
+
+        Returns:
+            value: Value to return
+
+        """
+        # Initialize key variables
+        value = self.data['timestamp']
+        return value
+
+    def lookahead(self):
+        """Get lookahead values.
+
+        Args:
+            None
+
+        Returns:
+            value: Value to return
+
+        """
+        # Initialize key variables
+        value = self.data['lookahead']
+        return value
+
+    def fxhigh_linear(self):
+        """Get fxhigh_linear values.
+
+        Args:
+            None
+
+        Returns:
+            value: Value to return
+
+        """
+        # Initialize key variables
+        value = self.data['fxhigh_linear']
+        return value
+
+    def fxhigh_bayesian(self):
+        """Get fxhigh_bayesian values.
+
+        Args:
+            None
+
+        Returns:
+            value: Value to return
+
+        """
+        # Initialize key variables
+        value = self.data['fxhigh_bayesian']
+        return value
+
+    def fxlow_linear(self):
+        """Get fxlow_linear values.
+
+        Args:
+            None
+
+        Returns:
+            value: Value to return
+
+        """
+        # Initialize key variables
+        value = self.data['fxlow_linear']
+        return value
+
+    def fxlow_bayesian(self):
+        """Get fxlow_bayesian values.
+
+        Args:
+            None
+
+        Returns:
+            value: Value to return
+
+        """
+        # Initialize key variables
+        value = self.data['fxlow_bayesian']
+        return value
+
+    def fxhigh_actual(self):
+        """Get fxhigh_actual values.
+
+        Args:
+            None
+
+        Returns:
+            value: Value to return
+
+        """
+        # Initialize key variables
+        value = self.data['fxhigh_actual']
+        return value
+
+    def fxlow_actual(self):
+        """Get fxlow_actual values.
+
+        Args:
+            None
+
+        Returns:
+            value: Value to return
+
+        """
+        # Initialize key variables
+        value = self.data['fxlow_actual']
+        return value
+
+    def rolling_accuracy(self, column, lookahead, window=20):
+        """Get the rolling accuracy of predictions whose outcome is known.
+
+        Args:
+            column: Prediction column (eg. "fxhigh_bayesian")
+            lookahead: Lookahead of the predictions
+            window: Number of predictions over which to calculate accuracy
+
+        Returns:
+            (timestamps, accuracy): Tuple of numpy arrays. Each accuracy is
+                the fraction of correct predictions among the "window"
+                decided predictions up to and including the timestamp.
+
+        """
+        # Only use decided predictions with known outcomes
+        predicted = self.data[column]
+        actual = self.data[OUTCOMES[column]]
+        rows = np.logical_and.reduce((
+            self.data['lookahead'] == lookahead, predicted != 0, actual != 0))
+        correct = (predicted[rows] == actual[rows]).astype(np.int64)
+
+        # Count correct predictions in each window
+        totals = np.concatenate(([0], np.cumsum(correct)))
+        ends = np.arange(1, len(correct) + 1)
+        starts = np.maximum(0, ends - window)
+        accuracy = (totals[ends] - totals[starts]) / (ends - starts)
+
+        # Return
+        return (self.data['timestamp'][rows], accuracy)
+
+
+def add_predictions(predictions):
+    """Add predictions, leaving those with the same key unchanged.
+
+    Predictions are keyed by pair, timestamp and lookahead. Stored
+    predictions are never replaced, so that they remain out of sample
+    when their outcomes are recorded by update_outcomes().
+
+    Args:
+        predictions: List of dicts keyed by Prediction column name
+
+    Returns:
+        None
+
+    """
+    # Update database
+    database = db.Database()
+    database.upsert_all(
+        Prediction.__table__, predictions, KEYS, 1119, update=False)
+
+
+def update_outcomes(idx_pair, timeframe=1440):
+    """Record the actual outcomes of predictions that are now known.
+
+    An outcome is known when the bar "lookahead" bars after the one the
+    prediction was made for has been ingested. Outcomes are classified in
+    the same way as feature.Extract classifies its training data.
+
+    Args:
+        idx_pair: Pair idx
+        timeframe: Timeframe of the bars the predictions were made with
+
+    Returns:
+        count: Number of predictions updated
+
+    """
+    # Get predictions without outcomes
+    database = db.Database()
+    session = database.session()
+    rows = session.query(
+        Prediction.idx, Prediction.timestamp, Prediction.lookahead).filter(
+            and_(
+                Prediction.idx_pair == idx_pair,
+                Prediction.fxhigh_actual.is_(None))).all()
+    database.close()
+    ts_stop = db_data.last_timestamps(idx_pair).get(timeframe)
+    if bool(rows) is False or ts_stop is None:
+        return 0
+    (indices, timestamps, lookaheads) = np.array(
+        rows, dtype=np.int64).T
+
+    # Get the bars from the oldest prediction onwards
+    fxdata = db_data.GetIDX(
+        idx_pair, int(timestamps.min()), ts_stop,
+        timeframe=timeframe).arrays()
+    bars = len(fxdata['timestamp'])
+
+    # Find the bars of each prediction and of its outcome
+    starts = np.searchsorted(fxdata['timestamp'], timestamps)
+    stops = starts + lookaheads
+    known = stops < bars
+    known[known] = fxdata['timestamp'][starts[known]] == timestamps[known]
+    (indices, starts, stops) = (indices[known], starts[known], stops[known])
+
+    # Classify outcomes
+    fxhigh = np.where(
+        fxdata['fxhigh'][stops] > fxdata['fxhigh'][starts], 1, -1)
+    fxlow = np.where(
+        fxdata['fxlow'][stops] > fxdata['fxlow'][starts], 1, -1)
+
+    # Update database
+    outcomes = [
+        {'idx': idx, 'fxhigh_actual': high, 'fxlow_actual': low}
+        for (idx, high, low) in zip(
+            indices.tolist(), fxhigh.tolist(), fxlow.tolist())]
+    database = db.Database()
+    database.update_all(Prediction.__table__, outcomes, 1120)
+
+    # Return
+    count = len(outcomes)
+    return count
+
+
+def live_accuracy(idx_pair, ts_start=0):
+    """Get the accuracy of predictions whose outcome is known.
+
+    The accuracy is aggregated by the database, so only one row per
+    lookahead is returned.
+
+    Args:
+        idx_pair: Pair idx
+        ts_start: Only use predictions from this timestamp onwards
+
+    Returns:
+        data: Dict keyed by lookahead. Each value is a dict of the
+            fraction of correct decided predictions keyed by prediction
+            column (eg. "fxhigh_bayesian"), or None if there were none.
+
+    """
+    # Initialize key variables
+    data = {}
+    columns = sorted(OUTCOMES.keys())
+    aggregates = []
+
+    # Count correct and decided predictions for each column
+    for column in columns:
+        predicted = getattr(Prediction, column)
+        actual = getattr(Prediction, OUTCOMES[column])
+        aggregates.append(func.sum(case(
+            [(predicted == actual, 1)], else_=0)))
+        aggregates.append(func.count(predicted))
+
+    # Get the data in a single query
+    database = db.Database()
+    session = database.session()
+    result = session.query(Prediction.lookahead, *aggregates).filter(and_(
+        Prediction.idx_pair == idx_pair,
+        Prediction.timestamp >= ts_start,
+        Prediction.fxhigh_actual.isnot(None))).group_by(
+            Prediction.lookahead).all()
+    database.close()
+
+    # Massage data
+    for row in result:
+        lookahead = row[0]
+        data[lookahead] = {}
+        for index, column in enumerate(columns):
+            (correct, decided) = row[1 + index * 2: 3 + index * 2]
+            if decided == 0:
+                data[lookahead][column] = None
+            else:
+                data[lookahead][column] = int(correct) / decided
+
+    # Return
+    return data
+
+
 def prediction_exists(idx_pair, timestamp):
     """Determine whether an entry exists in the Prediction table.
 
@@ -149,9 +514,6 @@ def prediction_exists(idx_pair, timestamp):
         found: True if found
 
     """
-    # Initialize key variables
-    found = False
-
     # Establish a database session
     database = db.Database()
     session = database.session()
@@ -160,11 +522,7 @@ def prediction_exists(idx_pair, timestamp):
         Prediction.timestamp == timestamp))
 
     # Massage data
-    if result.count() == 1:
-        for instance in result:
-            _ = instance.idx
-            break
-        found = True
+    found = result.first() is not None
 
     # Return the session to the database pool after processing
     database.close()
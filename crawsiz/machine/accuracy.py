@@ -1,16 +1,16 @@
 """Library to process the ingest of data files."""
 
-from pprint import pprint
-from sklearn.metrics import confusion_matrix
 import numpy as np
 
 # Import custom libraries
 from crawsiz.machine import classifier
+from crawsiz.machine import metrics
 from crawsiz.machine import pca
+from crawsiz.utils import timing
 
 
-class Linear(object):
-    """Class to determine Linear prediction accuracy.
+class _Accuracy(object):
+    """Class to determine prediction accuracy from confusion matrices.
 
     Args:
         None
@@ -22,41 +22,28 @@ class Linear(object):
 
     """
 
-    def __init__(self, extract):
+    def __init__(self, matrix_high, matrix_low, metric):
         """Method for intializing the class.
 
         Args:
-            extract: Extract object from feature module.
+            matrix_high: Confusion matrix of high predictions
+            matrix_low: Confusion matrix of low predictions
+            metric: metrics module function that calculates the accuracy
+                of each class from a confusion matrix
 
         Returns:
             None
 
         """
-        # Apply classifer to all feature vectors
-        feature_vectors = extract.vectors()
-        linear = classifier.Linear(feature_vectors)
-
-        # Assign values
-        klasses_high = extract.classes_high(kessler=True)
-        klasses_low = extract.classes_low(kessler=True)
-
-        # Start predictions (high)
-        predictions = []
-        for feature_vector in feature_vectors:
-            next_class = linear.classifier(feature_vector, klasses_high)
-            predictions.append(next_class)
-        predicted_high = np.asarray(predictions)
-
-        # Start predictions (low)
-        predictions = []
-        for feature_vector in feature_vectors:
-            next_class = linear.classifier(feature_vector, klasses_low)
-            predictions.append(next_class)
-        predicted_low = np.asarray(predictions)
+        # Initialize key variables
+        self.matrix_high = matrix_high
+        self.matrix_low = matrix_low
 
-        # Create confusion matrices
-        self.matrix_high = confusion_matrix(klasses_high, predicted_high)
-        self.matrix_low = confusion_matrix(klasses_low, predicted_low)
+        # Get the accuracy of each class
+        self._highs = dict(
+            zip(metrics.KESSLER_CLASSES, metric(matrix_high).tolist()))
+        self._lows = dict(
+            zip(metrics.KESSLER_CLASSES, metric(matrix_low).tolist()))
 
     def lowerhighs(self):
         """Accuracy of predicting a lower high.
@@ -68,7 +55,7 @@ class Linear(object):
             accuracy: Accuracy as a decimal value
 
         """
-        accuracy = self.matrix_high[1, 1] / sum(self.matrix_high[:, -1])
+        accuracy = self._highs[-1]
         return accuracy
 
     def higherhighs(self):
@@ -81,7 +68,7 @@ class Linear(object):
             accuracy: Accuracy as a decimal value
 
         """
-        accuracy = self.matrix_high[0, 0] / sum(self.matrix_high[:, 0])
+        accuracy = self._highs[1]
         return accuracy
 
     def highs(self):
@@ -94,12 +81,11 @@ class Linear(object):
             accuracy: Accuracy as a decimal value
 
         """
-        accuracy = (self.matrix_high[0, 0] + self.matrix_high[1, 1]) / sum(
-            sum(self.matrix_high))
+        accuracy = float(metrics.accuracy(self.matrix_high))
         return accuracy
 
     def lowerlows(self):
-        """Accuracy of predicting a lower high.
+        """Accuracy of predicting a lower low.
 
         Args:
             None
@@ -108,11 +94,11 @@ class Linear(object):
             accuracy: Accuracy as a decimal value
 
         """
-        accuracy = self.matrix_low[1, 1] / sum(self.matrix_low[:, -1])
+        accuracy = self._lows[-1]
         return accuracy
 
     def higherlows(self):
-        """Accuracy of predicting a higher high.
+        """Accuracy of predicting a higher low.
 
         Args:
             None
@@ -121,7 +107,7 @@ class Linear(object):
             accuracy: Accuracy as a decimal value
 
         """
-        accuracy = self.matrix_low[0, 0] / sum(self.matrix_low[:, 0])
+        accuracy = self._lows[1]
         return accuracy
 
     def lows(self):
@@ -134,13 +120,15 @@ class Linear(object):
             accuracy: Accuracy as a decimal value
 
         """
-        accuracy = (self.matrix_low[0, 0] + self.matrix_low[1, 1]) / sum(
-            sum(self.matrix_low))
+        accuracy = float(metrics.accuracy(self.matrix_low))
         return accuracy
 
 
-class Bayesian(object):
-    """Class to determine Bayesian prediction accuracy.
+class Linear(_Accuracy):
+    """Class to determine Linear prediction accuracy.
+
+    The accuracy of each class is the fraction of its predictions that
+    were correct.
 
     Args:
         None
@@ -152,7 +140,7 @@ class Bayesian(object):
 
     """
 
-    def __init__(self, extract, components=2):
+    def __init__(self, extract):
         """Method for intializing the class.
 
         Args:
@@ -162,99 +150,137 @@ class Bayesian(object):
             None
 
         """
-        # Initialize key variables
+        # Apply classifer to all feature vectors
         feature_vectors = extract.vectors()
+        linear = classifier.Linear(feature_vectors)
 
         # Assign values
         klasses_high = extract.classes_high(kessler=True)
         klasses_low = extract.classes_low(kessler=True)
 
-        # Apply classifer to all high feature vectors
-        pca_highs = pca.PCA(feature_vectors, klasses_high)
-        bayes_classifier = classifier.Bayesian(
-            pca_highs, components=components)
-        self.highs_accuracy = bayes_classifier.accuracy()
+        # Start predictions (high)
+        with timing.Span('linear', target='high'):
+            predictions = []
+            for feature_vector in feature_vectors:
+                next_class = linear.classifier(feature_vector, klasses_high)
+                predictions.append(next_class)
+            predicted_high = np.asarray(predictions)
 
-        # Apply classifer to all low feature vectors
-        pca_lows = pca.PCA(feature_vectors, klasses_low)
-        bayes_classifier = classifier.Bayesian(
-            pca_lows, components=components)
-        self.lows_accuracy = bayes_classifier.accuracy()
+        # Start predictions (low)
+        with timing.Span('linear', target='low'):
+            predictions = []
+            for feature_vector in feature_vectors:
+                next_class = linear.classifier(feature_vector, klasses_low)
+                predictions.append(next_class)
+            predicted_low = np.asarray(predictions)
 
-    def lowerhighs(self):
-        """Accuracy of predicting a lower high.
+        # Create confusion matrices
+        super().__init__(
+            metrics.confusion_matrix(klasses_high, predicted_high),
+            metrics.confusion_matrix(klasses_low, predicted_low),
+            metrics.precision)
 
-        Args:
-            None
 
-        Returns:
-            accuracy: Accuracy as a decimal value
+class Bayesian(_Accuracy):
+    """Class to determine Bayesian prediction accuracy.
 
-        """
-        accuracy = self.highs_accuracy[-1]
-        return accuracy
+    The accuracy of each class is the fraction of its members that were
+    predicted correctly. Undecided predictions are ignored.
 
-    def higherhighs(self):
-        """Accuracy of predicting a higher high.
+    Args:
+        None
 
-        Args:
-            None
+    Returns:
+        None
 
-        Returns:
-            accuracy: Accuracy as a decimal value
+    Methods:
 
-        """
-        accuracy = self.highs_accuracy[1]
-        return accuracy
+    """
 
-    def highs(self):
-        """Accuracy of predicting movement of highs.
+    def __init__(self, extract, components=2):
+        """Method for intializing the class.
 
         Args:
-            None
+            extract: Extract object from feature module.
 
         Returns:
-            accuracy: Accuracy as a decimal value
+            None
 
         """
-        accuracy = self.highs_accuracy[None]
-        return accuracy
+        # Initialize key variables
+        feature_vectors = extract.vectors()
 
-    def lowerlows(self):
-        """Accuracy of predicting a lower low.
+        # Assign values
+        klasses_high = extract.classes_high(kessler=True)
+        klasses_low = extract.classes_low(kessler=True)
 
-        Args:
-            None
+        # Apply classifer to all high feature vectors
+        with timing.Span('pca', target='high'):
+            pca_highs = pca.PCA(feature_vectors, klasses_high)
+            bayes_classifier = classifier.Bayesian(
+                pca_highs, components=components)
+        with timing.Span('bayesian', target='high'):
+            matrix_high = metrics.confusion_matrix(
+                *bayes_classifier.predictions())
 
-        Returns:
-            accuracy: Accuracy as a decimal value
+        # Apply classifer to all low feature vectors
+        with timing.Span('pca', target='low'):
+            pca_lows = pca.PCA(feature_vectors, klasses_low)
+            bayes_classifier = classifier.Bayesian(
+                pca_lows, components=components)
+        with timing.Span('bayesian', target='low'):
+            matrix_low = metrics.confusion_matrix(
+                *bayes_classifier.predictions())
 
-        """
-        accuracy = self.lows_accuracy[-1]
-        return accuracy
+        # Create confusion matrices
+        super().__init__(matrix_high, matrix_low, metrics.recall)
 
-    def higherlows(self):
-        """Accuracy of predicting a higher low.
 
-        Args:
-            None
+class Histogram(_Accuracy):
+    """Class to determine histogram prediction accuracy.
 
-        Returns:
-            accuracy: Accuracy as a decimal value
+    The accuracy of each class is the fraction of its members that were
+    predicted correctly. Undecided predictions are ignored.
 
-        """
-        accuracy = self.lows_accuracy[1]
-        return accuracy
+    Args:
+        None
 
-    def lows(self):
-        """Accuracy of predicting movement of lows.
+    Returns:
+        None
+
+    Methods:
+
+    """
+
+    def __init__(
+            self, extract, components=classifier.HISTOGRAM_COMPONENTS,
+            bins=classifier.HISTOGRAM_BINS):
+        """Method for intializing the class.
 
         Args:
-            None
+            extract: Extract object from feature module.
+            components: Number of principal components to use
+            bins: Number of bins for each principal component
 
         Returns:
-            accuracy: Accuracy as a decimal value
+            None
 
         """
-        accuracy = self.lows_accuracy[None]
-        return accuracy
+        # Initialize key variables
+        feature_vectors = extract.vectors()
+        matrices = []
+
+        # Apply classifer to all high, then all low feature vectors
+        for (target, klasses) in (
+                ('high', extract.classes_high(kessler=True)),
+                ('low', extract.classes_low(kessler=True))):
+            with timing.Span('pca', target=target):
+                pca_object = pca.PCA(feature_vectors, klasses)
+            with timing.Span('histogram', target=target):
+                histogram = classifier.Histogram(
+                    pca_object, components=components, bins=bins)
+                matrices.append(metrics.confusion_matrix(
+                    *histogram.predictions()))
+
+        # Create confusion matrices
+        super().__init__(matrices[0], matrices[1], metrics.recall)
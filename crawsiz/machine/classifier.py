@@ -8,8 +8,16 @@ import math
 import numpy as np
 
 # Our library imports
+from crawsiz.machine import metrics
 from crawsiz.machine import pca
 
+# Principal components and bins per component of the histogram classifier.
+# It has bins ** components cells to fill with training vectors, so it
+# uses fewer components than the other classifiers to keep the cells from
+# being mostly empty.
+HISTOGRAM_COMPONENTS = 3
+HISTOGRAM_BINS = 4
+
 
 class Bayesian(object):
     """Class for principal component analysis probabilities.
@@ -49,6 +57,21 @@ class Bayesian(object):
              components=components)
         self.pca_new = pca.PCA(principal_components, principal_classes)
 
+        # Stack the gaussian parameters of the classes, so that all classes
+        # are evaluated at once. The constant is the log of the sample
+        # count divided by the normalizing constant of the gaussian.
+        self._means = np.asarray(
+            [np.atleast_1d(self.meanvector(cls)) for cls in self.class_list])
+        covariances = np.asarray(
+            [np.atleast_2d(self.covariance(cls)) for cls in self.class_list])
+        (_, dimensions) = self._means.shape
+        counts = np.asarray(
+            [len(self.pca_object.xvalues(cls)) for cls in self.class_list])
+        self._inverses = np.linalg.inv(covariances)
+        (_, log_determinants) = np.linalg.slogdet(covariances)
+        self._constants = np.log(counts) - 0.5 * (
+            dimensions * math.log(2 * math.pi) + log_determinants)
+
     def classes(self):
         """Get the classes.
 
@@ -98,56 +121,38 @@ class Bayesian(object):
             None
 
         Returns:
-            accuracy: Prediction accuracy
+            accuracy: Dict of prediction accuracy keyed by class. The
+                accuracy of all classes is keyed by None.
+
+        """
+        # Return
+        (actual, predicted) = self.predictions()
+        accuracy = _accuracy(self.classes(), actual, predicted)
+        return accuracy
+
+    def predictions(self):
+        """Classify the training data using gaussian models.
+
+        Args:
+            None
+
+        Returns:
+            (actual, predicted): Tuple of lists of actual and predicted
+                classes. Predictions are None if undecided.
 
         """
         # Initialize key variables
-        correct = {}
-        prediction = 0
-        cls_count = {}
-        accuracy = {}
+        actual = []
+        predicted = []
 
-        # Analyze all the data
+        # Analyze all the data of each class at once
         for cls in self.pca_object.classes():
-            # Get list of x values to test
             vectors = self.pca_object.xvalues(cls)
-
-            # Process each vector
-            for vector in vectors:
-                # Get the prediction
-                prediction = self.classifier(vector)
-
-                # Only count definitive predictions
-                if prediction is not None:
-                    # Count the number of correct predictions
-                    if prediction == cls:
-                        if cls in correct:
-                            correct[cls] += 1
-                        else:
-                            correct[cls] = 1
-
-                    # Increment the count
-                    if cls in cls_count:
-                        cls_count[cls] += 1
-                    else:
-                        cls_count[cls] = 1
-
-        # Calculate per class accuracy
-        correct[None] = 0
-        cls_count[None] = 0
-        for cls in cls_count.keys():
-            if cls_count[cls] != 0:
-                accuracy[cls] = correct[cls] / cls_count[cls]
-
-            # Keep a tally for all successes
-            correct[None] = correct[None] + correct[cls]
-            cls_count[None] = cls_count[None] + cls_count[cls]
-
-        # Calulate overall accuracy
-        accuracy[None] = correct[None] / cls_count[None]
+            actual.extend([cls] * len(vectors))
+            predicted.extend(self.classifiers(vectors))
 
         # Return
-        return accuracy
+        return (actual, predicted)
 
     def classifier(self, xvalue):
         """Bayesian classifer for any value of X.
@@ -156,33 +161,40 @@ class Bayesian(object):
             xvalue: Specific feature vector of X
 
         Returns:
-            selection: Class classifier chooses
+            selection: Class classifier chooses, None if undecided
 
         """
-        # Initialize key variables
-        probability = {}
-        classes = self.classes()
+        # Return
+        selection = self.classifiers([xvalue])[0]
+        return selection
 
-        # Get probability of each class
-        probability = self.probability(xvalue)
+    def classifiers(self, xvalues):
+        """Bayesian classifer for many values of X.
 
-        # Reassign variables for readability
-        prob_c0 = probability[classes[0]]
-        prob_c1 = probability[classes[1]]
+        Args:
+            xvalues: Array of feature vectors of X
 
-        # Evaluate probabilities
-        if prob_c0 + prob_c1 == 0:
-            selection = None
-        else:
-            if prob_c0 > prob_c1:
-                selection = classes[0]
-            elif prob_c0 < prob_c1:
-                selection = classes[1]
+        Returns:
+            selections: List of classes chosen, None where more than one
+                class is the most likely
+
+        """
+        # Initialize key variables
+        selections = []
+        likelihoods = self._log_likelihoods(xvalues)
+
+        # Pick the most likely class, if there is only one
+        maximums = np.max(likelihoods, axis=1, keepdims=True)
+        counts = np.count_nonzero(likelihoods == maximums, axis=1)
+        for index, count in zip(
+                np.argmax(likelihoods, axis=1).tolist(), counts.tolist()):
+            if count == 1:
+                selections.append(self.class_list[index])
             else:
-                selection = None
+                selections.append(None)
 
         # Return
-        return selection
+        return selections
 
     def probability(self, xvalue):
         """Bayesian probability for any value of X.
@@ -191,48 +203,249 @@ class Bayesian(object):
             xvalue: Specific feature vector of X
 
         Returns:
-            selection: Class classifier chooses
+            probability: Dict of probabilities keyed by class
+
+        """
+        # Normalize the likelihoods. The largest is subtracted first, so
+        # that likelihoods too small to represent don't become zero.
+        likelihoods = self._log_likelihoods([xvalue])[0]
+        values = np.exp(likelihoods - np.max(likelihoods))
+
+        # Return
+        probability = dict(zip(
+            self.class_list, (values / np.sum(values)).tolist()))
+        return probability
+
+    def _log_likelihoods(self, xvalues):
+        """Get the log of the bayesian likelihood of each class.
+
+        Args:
+            xvalues: Array of feature vectors of X
+
+        Returns:
+            likelihoods: (vectors, classes) array of the log of the sample
+                count of each class multiplied by its gaussian density
+
+        """
+        # Calculate the principal components of the xvalues
+        principal_components = self.pca_object.pc_of_x(
+            np.asarray(xvalues), self.components)
+        principal_components = principal_components.reshape(
+            len(principal_components), -1)
+
+        # Work on the exponent part of the bayesian classifer for all
+        # vectors and classes at once
+        x_mu = principal_components[:, np.newaxis, :] - self._means
+        power = -0.5 * np.einsum(
+            'vci,cij,vcj->vc', x_mu, self._inverses, x_mu)
+
+        # Return
+        likelihoods = power + self._constants
+        return likelihoods
+
+
+class Histogram(object):
+    """Class for histogram probabilities of principal components.
+
+    Each of the first "components" principal components is divided into
+    "bins" bins holding equal numbers of training vectors. The bin numbers
+    of a vector are combined into a single key, and the number of training
+    vectors of each class is stored for each key that occurs. Unlike the
+    Bayesian classifier, no assumption is made about the shape of the
+    distribution of each class. Classifying a vector after training is a
+    single dict lookup.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    Functions:
+        __init__:
+    """
+
+    def __init__(
+            self, pca_object, components=HISTOGRAM_COMPONENTS,
+            bins=HISTOGRAM_BINS):
+        """Method for intializing the class.
+
+        Args:
+            pca_object: PCA class object
+            components: Number of principal components to use
+            bins: Number of bins for each principal component
+
+        Returns:
+            None
 
         """
         # Initialize key variables
-        probability = {}
-        bayesian = {}
-        classes = self.classes()
+        self.components = components
+        self.bins = bins
+        self.pca_object = pca_object
+        self.class_list = self.pca_object.classes()
+
+        # Get principal components of the training data
+        (principal_classes,
+         principal_components) = pca_object.principal_components(
+             components=components)
+        self._actual = principal_classes.ravel()
+
+        # Place bin edges so that each bin has the same number of vectors
+        quantiles = np.linspace(0, 1, bins + 1)[1:-1]
+        self._edges = [
+            np.quantile(principal_components[:, column], quantiles)
+            for column in range(principal_components.shape[1])]
+
+        # Count the vectors of each class for each key
+        self._training = self._keys(principal_components)
+        (keys, positions) = np.unique(self._training, return_inverse=True)
+        labels = np.searchsorted(self.class_list, self._actual)
+        counts = np.zeros((len(keys), len(self.class_list)), dtype=int)
+        np.add.at(counts, (positions.ravel(), labels), 1)
+        self._counts = dict(zip(keys.tolist(), counts))
+
+    def classes(self):
+        """Get the classes.
+
+        Args:
+            None
+
+        Returns:
+            value: classes
 
-        # Calculate the principal components of the individual xvalue
-        p1p2 = self.pca_object.pc_of_x(xvalue, self.components)
+        """
+        # Return
+        value = self.class_list
+        return value
+
+    def accuracy(self):
+        """Calulate the accuracy of the training data.
+
+        Args:
+            None
+
+        Returns:
+            accuracy: Dict of prediction accuracy keyed by class. The
+                accuracy of all classes is keyed by None.
+
+        """
+        # Return
+        (actual, predicted) = self.predictions()
+        accuracy = _accuracy(self.classes(), actual, predicted)
+        return accuracy
+
+    def predictions(self):
+        """Classify the training data.
+
+        Args:
+            None
 
-        # Get probability of each class
-        for cls in classes:
-            # Initialize values for the loop
-            sample_count = len(self.pca_object.xvalues(cls))
+        Returns:
+            (actual, predicted): Tuple of lists of actual and predicted
+                classes. Predictions are None if undecided.
 
-            # Get values for calculating gaussian parameters
-            dimensions = len(p1p2)
-            x_mu = p1p2 - self.meanvector(cls)
-            covariance = self.covariance(cls)
-            inverse_cov = np.linalg.inv(covariance)
-            determinant_cov = np.linalg.det(covariance)
+        """
+        # Return
+        actual = self._actual.tolist()
+        predicted = [self._select(key) for key in self._training.tolist()]
+        return (actual, predicted)
 
-            # Work on the exponent part of the bayesian classifer
-            power = -0.5 * np.dot(np.dot(x_mu, inverse_cov), x_mu.T)
-            exponent = math.pow(math.e, power)
+    def classifier(self, xvalue):
+        """Histogram classifer for any value of X.
 
-            # Determine the constant value
-            pipart = math.pow(2 * math.pi, dimensions / 2)
-            constant = pipart * math.sqrt(determinant_cov)
+        Args:
+            xvalue: Specific feature vector of X
 
-            # Determine final bayesian
-            bayesian[cls] = (sample_count * exponent) / constant
+        Returns:
+            selection: Class classifier chooses, None if undecided
 
-        # Calculate bayesian probability
-        denominator = bayesian[classes[0]] + bayesian[classes[1]]
-        for cls in classes:
-            probability[cls] = bayesian[cls] / denominator
+        """
+        # Return
+        selection = self.classifiers([xvalue])[0]
+        return selection
 
+    def classifiers(self, xvalues):
+        """Histogram classifer for many values of X.
+
+        Args:
+            xvalues: Array of feature vectors of X
+
+        Returns:
+            selections: List of classes chosen, None where undecided
+
+        """
         # Return
+        principal_components = self.pca_object.pc_of_x(
+            np.asarray(xvalues), self.components)
+        selections = [
+            self._select(key)
+            for key in self._keys(principal_components).tolist()]
+        return selections
+
+    def probability(self, xvalue):
+        """Histogram probability for any value of X.
+
+        Args:
+            xvalue: Specific feature vector of X
+
+        Returns:
+            probability: Dict of probabilities keyed by class. The
+                probabilities are zero if no training vectors share the
+                bins of X.
+
+        """
+        # Initialize key variables
+        principal_components = self.pca_object.pc_of_x(
+            np.asarray([xvalue]), self.components)
+        key = self._keys(principal_components).tolist()[0]
+        counts = self._counts.get(key, np.zeros(len(self.class_list)))
+
+        # Return
+        total = max(np.sum(counts), 1)
+        probability = dict(zip(self.class_list, (counts / total).tolist()))
         return probability
 
+    def _keys(self, principal_components):
+        """Get the keys of the bins of principal components.
+
+        Args:
+            principal_components: (vectors, components) array
+
+        Returns:
+            keys: Array of keys, one per vector
+
+        """
+        # Combine the bin numbers of each component into a single number
+        keys = np.zeros(len(principal_components), dtype=np.int64)
+        for column, edges in enumerate(self._edges):
+            keys = keys * self.bins + np.searchsorted(
+                edges, principal_components[:, column], side='right')
+        return keys
+
+    def _select(self, key):
+        """Choose the most common class of a key.
+
+        Args:
+            key: Key of the bins of a vector
+
+        Returns:
+            selection: Class, None if no class is more common than the rest
+
+        """
+        # Initialize key variables
+        selection = None
+        counts = self._counts.get(key)
+
+        # Pick the most common class, if there is only one
+        if counts is not None:
+            maximum = np.max(counts)
+            if np.count_nonzero(counts == maximum) == 1:
+                selection = self.class_list[int(np.argmax(counts))]
+
+        # Return
+        return selection
+
 
 class Linear(object):
     """Class for principal component analysis.
@@ -330,3 +543,37 @@ def kessler_to_number(classification):
         result = values.index(maximum)
 
     return result
+
+
+def _accuracy(classes, actual, predicted):
+    """Calulate the accuracy of predictions.
+
+    Args:
+        classes: List of classes
+        actual: List of actual classes
+        predicted: List of predicted classes. Undecided predictions are
+            None and are ignored.
+
+    Returns:
+        accuracy: Dict of prediction accuracy keyed by class. The
+            accuracy of all classes is keyed by None.
+
+    """
+    # Initialize key variables
+    classes = tuple(classes)
+    matrix = metrics.confusion_matrix(actual, predicted, classes=classes)
+
+    # Calculate per class accuracy, skipping classes with no definitive
+    # predictions
+    accuracy = {}
+    counts = np.sum(matrix, axis=1)
+    for cls, value, count in zip(
+            classes, metrics.recall(matrix).tolist(), counts.tolist()):
+        if count != 0:
+            accuracy[cls] = value
+
+    # Calulate overall accuracy
+    accuracy[None] = float(metrics.accuracy(matrix))
+
+    # Return
+    return accuracy
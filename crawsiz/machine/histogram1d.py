@@ -1,16 +1,18 @@
 #!/usr/bin/env python3
-"""Program creates histograms."""
+"""Program creates histograms.
 
+Data is held in numpy arrays. The bucket counts and the moments of each
+class are calculated once when the histogram is created, so that queries
+don't need to revisit the data.
+
+"""
+
+import os
 import math
+from operator import itemgetter
 from collections import defaultdict
-from statistics import stdev, mean
 
 import numpy as np
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from matplotlib import style
-style.use("ggplot")
 
 
 class Histogram1D(object):
@@ -38,27 +40,36 @@ class Histogram1D(object):
         self.data = data
         self.meta = defaultdict(lambda: defaultdict(dict))
         self.classes = []
+        self.entries = len(data)
 
-        # Calculate counts
-        self.data_lists = self._lists()
-
-        # Get min / max and bins
-        for cls, features in sorted(self.data_lists.items()):
-            self.meta[cls]['min'] = min(features)
-            self.meta[cls]['max'] = max(features)
-
-        # Get list of categories
-        self.classes = sorted(self.meta.keys())
+        # Convert data to arrays. Classes are identified by their position
+        # in self.classes
+        labels = list(map(itemgetter(0), data))
+        self.classes = sorted(set(labels))
+        positions = {cls: index for index, cls in enumerate(self.classes)}
+        self._labels = np.fromiter(
+            map(positions.__getitem__, labels), dtype=int, count=len(data))
+        self._values = np.fromiter(
+            map(itemgetter(1), data), dtype=float, count=len(data))
+
+        # Get the statistics of each class
+        for index, cls in enumerate(self.classes):
+            features = self._values[self._labels == index]
+            self.meta[cls]['min'] = features.min()
+            self.meta[cls]['max'] = features.max()
+            self.meta[cls]['count'] = features.size
+            self.meta[cls]['mean'] = features.mean()
+            self.meta[cls]['stdev'] = features.std(ddof=1)
 
         # Calculate counts
-        self.data_counts = self._counts()
+        self._offset = self.bucket_range()[0]
+        self._counts_array = self._counts()
+        self.data_counts = _nested(
+            self._counts_array, self.classes, self._offset)
 
         # Calculate probabilities
         self.data_probability = self._probability()
 
-        # Get the number of entries
-        self.entries = len(data)
-
     def keys(self):
         """Get keys in data.
 
@@ -66,20 +77,11 @@ class Histogram1D(object):
             None
 
         Returns:
-            data: List of keys
+            data: List of keys in the order they first appear
 
         """
-        # Initialize key variables
-        data = []
-
-        # Get keys
-        for pair in self.data:
-            key = pair[1]
-            if key in data:
-                continue
-            data.append(key)
-
         # Return
+        data = list(dict.fromkeys([pair[1] for pair in self.data]))
         return data
 
     def bucket_range(self):
@@ -92,15 +94,9 @@ class Histogram1D(object):
             (min, max): Tuple
 
         """
-        # Initialize key variables
-        for cls in self.meta.keys():
-            minimum = self.meta[cls]['min']
-            maximum = self.meta[cls]['max']
-
         # Get range
-        for cls in self.meta.keys():
-            minimum = min(self.meta[cls]['min'], minimum)
-            maximum = max(self.meta[cls]['max'], maximum)
+        minimum = min([self.meta[cls]['min'] for cls in self.classes])
+        maximum = max([self.meta[cls]['max'] for cls in self.classes])
 
         # Return
         return (int(minimum), int(maximum))
@@ -180,7 +176,11 @@ class Histogram1D(object):
 
         """
         # Initialize key variables
-        data = self.data_lists
+        data = {}
+
+        # Get lists
+        for index, cls in enumerate(self.classes):
+            data[cls] = self._values[self._labels == index].tolist()
 
         # Return
         return data
@@ -227,24 +227,20 @@ class Histogram1D(object):
             cls_1.capitalize(), cls_0.capitalize())
         print(output)
 
-        # Evaluate features
-        for feature in range(minimum, maximum + 1):
-            # Get probabilities
-            b_probability = self.bayesian_classifier(feature)
-            h_probability = self.histogram_classifier(feature)
+        # Evaluate all features at once
+        features = np.arange(minimum, maximum + 1)
+        b_probabilities = self.bayesian_classifiers(features)
+        h_probabilities = self.histogram_classifiers(features)
+        counts = self._bucket_counts(features)
 
+        for (feature, h_probability, b_probability, fcount, mcount) in zip(
+                features.tolist(), h_probabilities.tolist(),
+                b_probabilities.tolist(), counts[0].tolist(),
+                counts[1].tolist()):
             # Get genders
             b_class = _get_class(b_probability)
             h_class = _get_class(h_probability)
 
-            # Get counts
-            mcount = self.data_counts[cls_1][feature]
-            if bool(mcount) is False:
-                mcount = 0
-            fcount = self.data_counts[cls_0][feature]
-            if bool(fcount) is False:
-                fcount = 0
-
             # Account for zero males / females for feature
             if mcount + fcount == 0:
                 b_class = 'N/A'
@@ -268,23 +264,31 @@ class Histogram1D(object):
             male_probability: Probability of being male
 
         """
-        # Initialize key variables
-        [cls_0, cls_1] = self.classes
+        # Return
+        male_probability = self.bayesian_classifiers([feature])[0].item()
+        return male_probability
 
-        # Get class 1 counts (male)
-        mcount = self._bayesian(cls_1, feature)
+    def bayesian_classifiers(self, features):
+        """Get the probability of class 1 for many features.
 
-        # Get class 0 counts (female)
-        fcount = self._bayesian(cls_0, feature)
+        Args:
+            features: Array of features
 
-        # Get male probability
-        if mcount == 0:
-            male_probability = 0
-        else:
-            male_probability = mcount / (mcount + fcount)
+        Returns:
+            probabilities: Array of probabilities
+
+        """
+        # Initialize key variables
+        [cls_0, cls_1] = self.classes
+        features = np.asarray(features, dtype=float)
+
+        # Get estimated counts of each class
+        mcount = self._bayesian(cls_1, features)
+        fcount = self._bayesian(cls_0, features)
 
         # Return
-        return male_probability
+        probabilities = _probabilities(mcount, fcount)
+        return probabilities
 
     def histogram_classifier(self, feature):
         """Create histogram classifier chart.
@@ -296,42 +300,49 @@ class Histogram1D(object):
             None
 
         """
-        # Initialize key variables
-        [cls_0, cls_1] = self.classes
+        # Return
+        male_probability = self.histogram_classifiers([feature])[0].item()
+        return male_probability
 
-        # Get male counts
-        if feature not in self.data_counts[cls_1]:
-            mcount = 0
-        else:
-            mcount = self.data_counts[cls_1][feature]
+    def histogram_classifiers(self, features):
+        """Get the probability of class 1 for many features.
 
-        # Get female counts
-        if feature not in self.data_counts[cls_0]:
-            fcount = 0
-        else:
-            fcount = self.data_counts[cls_0][feature]
+        Args:
+            features: Array of features
 
-        # Get male probability
-        if mcount == 0:
-            male_probability = 0
-        else:
-            male_probability = mcount / (mcount + fcount)
+        Returns:
+            probabilities: Array of probabilities
+
+        """
+        # Get counts of each class
+        (fcount, mcount) = self._bucket_counts(features)
 
         # Return
-        return male_probability
+        probabilities = _probabilities(mcount, fcount)
+        return probabilities
 
-    def graph(self, feature_label):
+    def graph(self, feature_label, directory=None):
         """Graph histogram.
 
         Args:
             feature_label: Feature label
+            directory: Directory in which to save the graph. The current
+                directory is used if None.
 
         Returns:
-            None
+            graph_filename: Path of the graph
 
         """
+        # matplotlib is slow to import and only used for graphs
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        from matplotlib import style
+        style.use("ggplot")
+
         # Initialize key variables
-        directory = '/home/peter/Downloads'
+        if directory is None:
+            directory = os.getcwd()
         data = self.counts()
         categories = []
         features = {}
@@ -413,14 +424,16 @@ class Histogram1D(object):
         fig.subplots_adjust(left=0.2, bottom=0.2)
 
         # Create image
-        graph_filename = ('%s/homework-%s-%s-rows.png') % (
-            directory, feature_label, self.entries)
+        graph_filename = os.path.join(
+            directory, ('homework-%s-%s-rows.png') % (
+                feature_label, self.entries))
 
         # Save chart
         fig.savefig(graph_filename)
 
         # Close the plot
         plt.close(fig)
+        return graph_filename
 
     def parameters(self):
         """Print gausian parameters for probability distribution function.
@@ -437,9 +450,9 @@ class Histogram1D(object):
         print(output)
 
         # Calculate values for each class in data
-        for cls in self.data_lists:
-            sample_stdev = stdev(self.data_lists[cls])
-            sample_mean = mean(self.data_lists[cls])
+        for cls in self.classes:
+            sample_stdev = self.meta[cls]['stdev']
+            sample_mean = self.meta[cls]['mean']
 
             # Print information about the class:
             output = ('%-25s [%s]: %-2.6f') % (
@@ -449,25 +462,25 @@ class Histogram1D(object):
                 'Mean Deviation for ', cls, sample_mean)
             print(output)
 
-    def _bayesian(self, cls, feature):
+    def _bayesian(self, cls, features):
         """Create bayesian multiplier.
 
         Args:
             cls: Category of data
-            feature: Height to process
+            features: Array of heights to process
 
         Returns:
-            value: Multiplier value
+            value: Array of multiplier values
 
         """
         # Initialize key variables
-        sample_stdev = stdev(self.data_lists[cls])
-        sample_mean = mean(self.data_lists[cls])
+        sample_stdev = self.meta[cls]['stdev']
+        sample_mean = self.meta[cls]['mean']
 
-        total = len(self.data_lists[cls])
+        total = self.meta[cls]['count']
         multiplier = 1 / (math.sqrt(2 * math.pi) * sample_stdev)
-        power = math.pow((feature - sample_mean) / sample_stdev, 2)
-        exponent = math.exp(-0.5 * power)
+        power = np.square((features - sample_mean) / sample_stdev)
+        exponent = np.exp(-0.5 * power)
 
         # Return
         value = total * multiplier * exponent
@@ -496,123 +509,149 @@ class Histogram1D(object):
         # Return
         return (bins, minimum, maximum)
 
-    def _counts(self):
-        """Convert file data to probabilty counts.
+    def _bucket_counts(self, features):
+        """Get the count of each class in the buckets of features.
 
         Args:
-            None
+            features: Array of features
 
         Returns:
-            counts: Dict of counts of feature keyed by class and feature
+            counts: (classes, features) array of counts. Features that are
+                not whole numbers, or are outside the buckets, have a count
+                of zero.
 
         """
         # Initialize key variables
-        counts = defaultdict(lambda: defaultdict(dict))
-
-        # Create counts dict for probabilities
-        for pair in self.data:
-            feature = pair[1]
-            cls = pair[0]
-
-            # Calculate bin
-            nbins = self.buckets(cls)
-            minx = self.minimum(cls)
-            maxx = self.maximum(cls)
-            bucket = int(1 + (nbins - 1) * (
-                feature - minx) / (maxx - minx)) + minx
-
-            # Assign values to bins
-            if cls in counts:
-                if bucket in counts[cls]:
-                    counts[cls][bucket] = counts[
-                        cls][bucket] + 1
-                else:
-                    counts[cls][bucket] = 1
-            else:
-                counts[cls][bucket] = 1
+        features = np.asarray(features, dtype=float)
+        (_, width) = self._counts_array.shape
+        counts = np.zeros((len(self.classes), features.size), dtype=int)
+
+        # Look up the buckets that exist
+        index = features - self._offset
+        valid = np.logical_and(
+            np.logical_and(index >= 0, index < width),
+            np.equal(np.mod(index, 1), 0))
+        counts[:, valid] = self._counts_array[:, index[valid].astype(int)]
 
         # Return
         return counts
 
-    def _lists(self):
-        """Convert count data lists.
+    def _counts(self):
+        """Convert file data to probabilty counts.
 
         Args:
             None
 
         Returns:
-            data: Dict of histogram data keyed by class (gender)
+            counts: (classes, buckets) array of counts. The first bucket is
+                the lowest value in the data.
 
         """
         # Initialize key variables
-        data = {}
-
-        # Create counts dict for probabilities
-        for pair in self.data:
-            feature = pair[0]
-            cls = pair[1]
-            if cls in data:
-                data[cls].append(feature)
+        buckets = np.zeros(self._values.size, dtype=int)
+
+        # Calculate the bucket of each value using the range of its class
+        for index, cls in enumerate(self.classes):
+            (nbins, minx, maxx) = self._buckets(cls)
+            members = self._labels == index
+            if maxx == minx:
+                scaled = np.zeros(np.count_nonzero(members))
             else:
-                data[cls] = [feature]
+                scaled = (nbins - 1) * (
+                    self._values[members] - minx) / (maxx - minx)
+            buckets[members] = np.trunc(1 + scaled).astype(int) + minx
+
+        # Count the values in each bucket of each class
+        buckets -= self._offset
+        width = int(buckets.max()) + 1
+        counts = np.bincount(
+            self._labels * width + buckets,
+            minlength=len(self.classes) * width).reshape(
+                len(self.classes), width)
 
         # Return
-        return data
+        return counts
 
     def _probability(self):
         """Calculate probabilities.
 
         Args:
-            feature: Height to calculate probaility for
+            None
 
         Returns:
             probability: Probabilities dict keyed by class and feature
 
         """
         # Initialize key variables
-        counts = self.counts()
-        total = defaultdict(lambda: defaultdict(dict))
+        counts = self._counts_array
         probability = defaultdict(lambda: defaultdict(dict))
-        icount = defaultdict(lambda: defaultdict(dict))
-
-        # Cycle through data to get class totals
-        for cls in counts.keys():
-            for feature in counts[cls].keys():
-                # Calculate count
-                count = counts[cls][feature]
-
-                # Get total counts for gender
-                if cls in total:
-                    total[cls] = total[cls] + count
-                else:
-                    total[cls] = count
-
-                # Get total counts independent of gender
-                if None in total:
-                    total[None] = total[None] + count
-                else:
-                    total[None] = count
-
-                # Get counts independent of gender
-                if feature in icount:
-                    icount[feature] = icount[feature] + count
-                else:
-                    icount[feature] = count
-
-        # Cycle through data to get gender probabilities
-        for cls in counts.keys():
-            for feature in counts[cls].keys():
-                # Do probabilities (class)
-                probability[cls][feature] = counts[
-                    cls][feature] / total[cls]
-
-                # Do probabilities (independent)
-                probability[None][feature] = icount[feature] / total[None]
+
+        # Do probabilities (class)
+        totals = counts.sum(axis=1, keepdims=True)
+        for cls, values in _nested(
+                counts / totals, self.classes, self._offset,
+                counts=counts).items():
+            probability[cls].update(values)
+
+        # Do probabilities (independent)
+        icount = counts.sum(axis=0)
+        probability[None].update(_nested(
+            (icount / icount.sum()).reshape(1, -1), [None],
+            self._offset, counts=icount.reshape(1, -1))[None])
 
         # Return
         return probability
 
 
+def _nested(values, classes, offset, counts=None):
+    """Convert an array of bucket values into a dict of dicts.
+
+    Args:
+        values: (classes, buckets) array of values
+        classes: Classes of the rows of values
+        offset: Feature of the first bucket
+        counts: (classes, buckets) array of counts. Only buckets with a
+            count are included. The values are used if None.
+
+    Returns:
+        data: Dict of values keyed by class and feature
+
+    """
+    # Initialize key variables
+    data = defaultdict(lambda: defaultdict(dict))
+    if counts is None:
+        counts = values
+
+    # Convert
+    for cls, row, count in zip(classes, values.tolist(), counts):
+        for bucket in np.flatnonzero(count).tolist():
+            data[cls][bucket + offset] = row[bucket]
+
+    # Return
+    return data
+
+
+def _probabilities(mcount, fcount):
+    """Get the probability of being male from the counts of each class.
+
+    Args:
+        mcount: Array of male counts
+        fcount: Array of female counts
+
+    Returns:
+        male_probability: Array of probabilities. The probability is 0
+            where there are no males.
+
+    """
+    # Return
+    mcount = np.asarray(mcount, dtype=float)
+    fcount = np.asarray(fcount, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        male_probability = np.where(
+            mcount == 0, 0.0, mcount / (mcount + fcount))
+    return male_probability
+
+
 def _get_class(male_probability):
     """Determine the gender based on probability.
 
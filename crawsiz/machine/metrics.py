@@ -0,0 +1,159 @@
+"""Library to calculate the accuracy of classifier predictions.
+
+Confusion matrices have a row for each actual class and a column for each
+predicted class. Rows and columns are in the same order as the "classes"
+used to create them, so a class always has the same position even if it
+is absent from the data.
+
+"""
+
+# Non-standard python imports
+import numpy as np
+
+# Kessler classes in matrix order
+KESSLER_CLASSES = (-1, 1)
+
+
+def confusion_matrix(actual, predicted, classes=KESSLER_CLASSES):
+    """Create a confusion matrix.
+
+    Predictions that are not one of "classes", such as the None returned
+    by undecided classifiers, are ignored.
+
+    Args:
+        actual: Array of actual classes
+        predicted: Array of predicted classes
+        classes: Sorted tuple of classes
+
+    Returns:
+        matrix: (classes, classes) numpy array of counts
+
+    """
+    # Process as a batch of one
+    matrix = confusion_matrices([actual], [predicted], classes=classes)[0]
+    return matrix
+
+
+def confusion_matrices(actual, predicted, classes=KESSLER_CLASSES):
+    """Create confusion matrices for many sets of predictions at once.
+
+    Args:
+        actual: (sets, samples) array of actual classes, such as one
+            row of classes per lookahead
+        predicted: (sets, samples) array of predicted classes
+        classes: Sorted tuple of classes
+
+    Returns:
+        matrices: (sets, classes, classes) numpy array of counts
+
+    """
+    # Initialize key variables
+    count = len(classes)
+    actual = _indices(actual, classes)
+    predicted = _indices(predicted, classes)
+    (sets, _) = actual.shape
+
+    # Give each (set, actual, predicted) combination its own bin
+    offsets = np.arange(sets).reshape(sets, 1) * count * count
+    bins = offsets + actual * count + predicted
+    valid = np.logical_and(actual >= 0, predicted >= 0)
+
+    # Count
+    matrices = np.bincount(
+        bins[valid], minlength=sets * count * count).reshape(
+            sets, count, count)
+    return matrices
+
+
+def precision(matrix):
+    """Get the fraction of predictions of each class that were correct.
+
+    Args:
+        matrix: Confusion matrix, or array of confusion matrices
+
+    Returns:
+        result: Array of values in the order of the matrix classes. Classes
+            that were never predicted have a value of nan.
+
+    """
+    # Return
+    result = _divide(
+        np.diagonal(matrix, axis1=-2, axis2=-1), np.sum(matrix, axis=-2))
+    return result
+
+
+def recall(matrix):
+    """Get the fraction of each actual class that was predicted correctly.
+
+    Args:
+        matrix: Confusion matrix, or array of confusion matrices
+
+    Returns:
+        result: Array of values in the order of the matrix classes. Classes
+            that never occurred have a value of nan.
+
+    """
+    # Return
+    result = _divide(
+        np.diagonal(matrix, axis1=-2, axis2=-1), np.sum(matrix, axis=-1))
+    return result
+
+
+def accuracy(matrix):
+    """Get the fraction of all predictions that were correct.
+
+    Args:
+        matrix: Confusion matrix, or array of confusion matrices
+
+    Returns:
+        result: Accuracy, or array of accuracies. The value is nan if there
+            were no predictions.
+
+    """
+    # Return
+    result = _divide(
+        np.trace(matrix, axis1=-2, axis2=-1), np.sum(matrix, axis=(-2, -1)))
+    return result
+
+
+def _indices(values, classes):
+    """Convert classes to their positions in a confusion matrix.
+
+    Args:
+        values: Array of classes
+        classes: Sorted tuple of classes
+
+    Returns:
+        indices: Two dimensional integer array of positions. Values that
+            are not in "classes" have a position of -1.
+
+    """
+    # Undecided predictions are None, which numpy cannot compare
+    values = np.asarray(values)
+    if values.dtype == object:
+        values = np.where(np.equal(values, None), np.nan, values)
+    values = values.astype(float).reshape(values.shape[0], -1)
+
+    # Find positions
+    lookup = np.asarray(classes, dtype=float)
+    indices = np.searchsorted(lookup, values)
+    indices = np.minimum(indices, len(classes) - 1)
+    indices[lookup[indices] != values] = -1
+    return indices
+
+
+def _divide(numerator, denominator):
+    """Divide without warnings about dividing by zero.
+
+    Args:
+        numerator: Numerator
+        denominator: Denominator
+
+    Returns:
+        result: Quotient, with nan where the denominator is zero
+
+    """
+    # Return
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.true_divide(numerator, denominator)
+    return result
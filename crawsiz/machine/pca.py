@@ -1,7 +1,6 @@
 """Class for principal component analysis."""
 
 # Standard python imports
-import sys
 from collections import defaultdict
 import math
 import operator
@@ -30,36 +29,37 @@ class PCA(object):
 
         Args:
             feature_vectors: (X, Y) Numpy array of feature vectors
-            classes: (y, 1) Numpy array of corresponding classes
+            classes: (y, 1) Numpy array of corresponding classes. There
+                may be any number of classes. If there is more than one
+                column, each column is a Kessler class and the class of a
+                vector is the number of the column with the largest value,
+                as in classifier.kessler_to_number().
 
         """
         # Initialize key variables
         self.x_values = {}
         self.pca = defaultdict(lambda: defaultdict(dict))
+        feature_vectors = np.asarray(feature_vectors)
+        classes = np.asarray(classes).reshape(len(feature_vectors), -1)
 
-        # Determine the number of dimensions in vector
-        index = 0
-        for feature_vector in feature_vectors:
-            cls = classes[index][0]
+        # Nothing to analyze
+        if feature_vectors.size == 0:
+            raise ValueError('PCA requires at least one feature vector')
 
-            # Add feature vector to appropriate X value dict key.
-            if cls in self.x_values:
-                self.x_values[cls] = np.vstack(
-                    (self.x_values[cls], feature_vector))
-            else:
-                self.x_values[cls] = feature_vector
+        # Get the class of each feature vector
+        (_, columns) = classes.shape
+        if columns == 1:
+            labels = classes[:, 0]
+        else:
+            labels = np.argmax(classes, axis=1)
 
-            # Increment index
-            index += 1
+        # Group the feature vectors of each class, keeping their order
+        for cls in np.unique(labels).tolist():
+            self.x_values[cls] = feature_vectors[labels == cls]
 
         # Note the available classes
         self.available_classes = sorted(self.x_values.keys())
 
-        # Create a numpy array for the class
-        if len(self.available_classes) != 2:
-            print('PCA2d class works best with two keys')
-            sys.exit(0)
-
         # Precalculate values
         cls_none = sorted(self.available_classes)
         cls_none.append(None)
@@ -101,8 +101,7 @@ class PCA(object):
         # Get xvalues
         if cls is None:
             data = np.concatenate(
-                (self.x_values[self.classes()[0]],
-                 self.x_values[self.classes()[1]]))
+                [self.x_values[next_class] for next_class in self.classes()])
         else:
             data = self.x_values[cls]
         return data
@@ -43,13 +43,15 @@ class Tomorrow(object):
         # Create prediction object
         self._prediction = BlackBox(extract, components=components)
 
-    def high(self, bayesian=True):
+    def high(self, bayesian=True, histogram=False):
         """Provide prediction of a high.
 
         Args:
             bayesian:
                 True if bayesian classifier to be used
                 False if linear classifier to be used
+            histogram: True if the histogram classifier is to be used
+                instead of either
 
         Returns:
             prediction: Class of high
@@ -59,18 +61,20 @@ class Tomorrow(object):
         """
         # Process highs
         prediction = self._prediction.high(
-            self.feature_vector, bayesian=bayesian)
+            self.feature_vector, bayesian=bayesian, histogram=histogram)
 
         # Return
         return prediction
 
-    def low(self, bayesian=True):
+    def low(self, bayesian=True, histogram=False):
         """Provide prediction of a low.
 
         Args:
             bayesian:
                 True if bayesian classifier to be used
                 False if linear classifier to be used
+            histogram: True if the histogram classifier is to be used
+                instead of either
 
         Returns:
             prediction: Class of low
@@ -80,7 +84,7 @@ class Tomorrow(object):
         """
         # Process lows
         prediction = self._prediction.low(
-            self.feature_vector, bayesian=bayesian)
+            self.feature_vector, bayesian=bayesian, histogram=histogram)
 
         # Return
         return prediction
@@ -133,7 +137,14 @@ class BlackBox(object):
         self.bayes_classifier_highs = classifier.Bayesian(
             pca_highs, components=self.components)
 
-    def high(self, feature_vector, bayesian=True):
+        # Histogram classifier methodology. The classifiers are only
+        # created when first used. They always use
+        # classifier.HISTOGRAM_COMPONENTS principal components, not
+        # "components", as they need far fewer.
+        self._pca = {'high': pca_highs, 'low': pca_lows}
+        self._histograms = {}
+
+    def high(self, feature_vector, bayesian=True, histogram=False):
         """Provide prediction of a high.
 
         Args:
@@ -141,6 +152,8 @@ class BlackBox(object):
             bayesian:
                 True if bayesian classifier to be used
                 False if linear classifier to be used
+            histogram: True if the histogram classifier is to be used
+                instead of either
 
         Returns:
             prediction: Class of high
@@ -149,7 +162,10 @@ class BlackBox(object):
 
         """
         # Process highs
-        if bayesian is True:
+        if histogram is True:
+            # Histogram classifier methodology
+            prediction = self._histogram('high').classifier(feature_vector)
+        elif bayesian is True:
             # Bayesian classifier methodology
             prediction = self.bayes_classifier_highs.classifier(
                 feature_vector)
@@ -161,7 +177,7 @@ class BlackBox(object):
         # Return
         return prediction
 
-    def low(self, feature_vector, bayesian=True):
+    def low(self, feature_vector, bayesian=True, histogram=False):
         """Provide prediction of a low.
 
         Args:
@@ -169,6 +185,8 @@ class BlackBox(object):
             bayesian:
                 True if bayesian classifier to be used
                 False if linear classifier to be used
+            histogram: True if the histogram classifier is to be used
+                instead of either
 
         Returns:
             prediction: Class of low
@@ -177,7 +195,10 @@ class BlackBox(object):
 
         """
         # Process lows
-        if bayesian is True:
+        if histogram is True:
+            # Histogram classifier methodology
+            prediction = self._histogram('low').classifier(feature_vector)
+        elif bayesian is True:
             # Bayesian classifier methodology
             prediction = self.bayes_classifier_lows.classifier(feature_vector)
         else:
@@ -187,3 +208,23 @@ class BlackBox(object):
 
         # Return
         return prediction
+
+    def _histogram(self, key):
+        """Get a histogram classifier, creating it on first use.
+
+        Args:
+            key: "high" or "low"
+
+        Returns:
+            result: classifier.Histogram object
+
+        """
+        # Create the classifier if it doesn't exist
+        if key not in self._histograms:
+            self._histograms[key] = classifier.Histogram(
+                self._pca[key], components=classifier.HISTOGRAM_COMPONENTS,
+                bins=classifier.HISTOGRAM_BINS)
+
+        # Return
+        result = self._histograms[key]
+        return result
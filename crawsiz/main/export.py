@@ -0,0 +1,216 @@
+"""Library to export and import price history as columnar archives.
+
+Each column of each pair and timeframe is stored in its own uncompressed
+numpy (.npy) file. A JSON manifest describes the files. Research jobs can
+memory map the arrays with numpy.load(mmap_mode='r') without using the
+database.
+
+"""
+
+import os
+import json
+import time
+import hashlib
+
+import numpy as np
+
+# Import custom libraries
+from crawsiz.utils import general
+from crawsiz.utils import log
+from crawsiz.db import db
+from crawsiz.db import db_data
+from crawsiz.db import db_pair
+from crawsiz.db.db_orm import Data, Pair
+
+# Name of the manifest file and the version of its format
+MANIFEST = 'manifest.json'
+VERSION = 1
+
+
+def export(directory):
+    """Export the price history of all pairs.
+
+    Args:
+        directory: Directory in which to create the archive
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    files = []
+    os.makedirs(directory, exist_ok=True)
+
+    # Export each pair and timeframe
+    for idx_pair in db_pair.idx_all():
+        pair = db_pair.GetIDX(idx_pair).pair()
+        last_timestamps = db_data.last_timestamps(idx_pair)
+        for timeframe, ts_stop in sorted(last_timestamps.items()):
+            # Read the history through a server side cursor
+            data = db_data.GetIDX(
+                idx_pair, 0, ts_stop, timeframe=timeframe,
+                stream=True, columns=db_data.OHLCV).arrays()
+
+            # Write the arrays
+            filenames = {}
+            checksums = {}
+            for column in db_data.OHLCV:
+                filename = '{}_{}_{}.npy'.format(
+                    pair.lower(), timeframe, column)
+                filepath = os.path.join(directory, filename)
+                with open('{}.tmp'.format(filepath), 'wb') as f_handle:
+                    np.save(f_handle, data[column])
+                os.replace('{}.tmp'.format(filepath), filepath)
+                filenames[column] = filename
+                checksums[column] = _sha256(filepath)
+
+            # Describe the files
+            files.append({
+                'pair': pair,
+                'timeframe': timeframe,
+                'filenames': filenames,
+                'rows': len(data['timestamp']),
+                'ts_start': int(data['timestamp'][0]),
+                'ts_stop': int(data['timestamp'][-1]),
+                'columns': list(db_data.OHLCV),
+                'sha256': checksums
+            })
+
+    # Write the manifest last, so that it only describes complete files
+    manifest = {
+        'version': VERSION,
+        'created': int(time.time()),
+        'files': files
+    }
+    filepath = os.path.join(directory, MANIFEST)
+    with open('{}.tmp'.format(filepath), 'w') as f_handle:
+        json.dump(manifest, f_handle, indent=2, sort_keys=True)
+    os.replace('{}.tmp'.format(filepath), filepath)
+
+    # Log
+    log_message = 'Exported {} files to directory {}.'.format(
+        len(files), directory)
+    log.log2quiet(1121, log_message)
+
+
+def restore(directory, batch_size=10000):
+    """Import price history from an archive created by export().
+
+    Rows are bulk loaded into the database. Bars at or before the most
+    recent bar already in the database for the pair and timeframe are
+    skipped, so an archive can be imported more than once.
+
+    Args:
+        directory: Directory containing the archive
+        batch_size: Number of bars to insert per database transaction
+
+    Returns:
+        None
+
+    """
+    # Read the manifest
+    filepath = os.path.join(directory, MANIFEST)
+    if os.path.isfile(filepath) is False:
+        log_message = 'No archive manifest {} found.'.format(filepath)
+        log.log2die(1123, log_message)
+    with open(filepath, 'r') as f_handle:
+        manifest = json.load(f_handle)
+    if manifest.get('version') != VERSION:
+        log_message = 'Unsupported archive version {} in {}.'.format(
+            manifest.get('version'), filepath)
+        log.log2die(1133, log_message)
+
+    # Import each file
+    for item in manifest['files']:
+        filepaths = {}
+        for column in item['columns']:
+            filepath = os.path.join(directory, item['filenames'][column])
+            if _sha256(filepath) != item['sha256'][column]:
+                log_message = 'Archive file {} is corrupt.'.format(filepath)
+                log.log2die(1124, log_message)
+            filepaths[column] = filepath
+
+        # Get the pair, creating it if necessary
+        if db_pair.pair_exists(item['pair']) is False:
+            database = db.Database()
+            database.add(Pair(pair=general.encode(item['pair'])), 1125)
+        idx_pair = db_pair.GetPair(item['pair']).idx()
+        last_timestamp = db_data.last_timestamps(idx_pair).get(
+            item['timeframe'], -1)
+
+        # Load the new bars
+        new = np.load(
+            filepaths['timestamp'], mmap_mode='r') > last_timestamp
+        data = {
+            column: np.load(filepath, mmap_mode='r')[new].tolist()
+            for column, filepath in filepaths.items()}
+        _insert(idx_pair, item['timeframe'], data, batch_size)
+
+        # Update last updated for Pair
+        if bool(data['timestamp']) is True:
+            database = db.Database()
+            session = database.session()
+            result = session.query(Pair).filter(
+                Pair.idx == idx_pair).one()
+            result.last_timestamp = max(
+                data['timestamp'][-1], result.last_timestamp)
+            session.commit()
+            database.close()
+
+        # Log
+        log_message = 'Imported {} {} minute bars for {}.'.format(
+            len(data['timestamp']), item['timeframe'], item['pair'])
+        log.log2quiet(1126, log_message)
+
+
+def _insert(idx_pair, timeframe, data, batch_size):
+    """Insert bars into the database in batches.
+
+    Args:
+        idx_pair: Pair idx
+        timeframe: Timeframe of the bars in minutes
+        data: Dict of lists of values keyed by column name
+        batch_size: Number of bars to insert per database transaction
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    columns = list(data.keys())
+    rows = len(data['timestamp'])
+
+    # Insert
+    for start in range(0, rows, batch_size):
+        stop = start + batch_size
+        datapoints = []
+        for values in zip(*[data[column][start:stop] for column in columns]):
+            datapoint = dict(zip(columns, values))
+            datapoint['idx_pair'] = idx_pair
+            datapoint['timeframe'] = timeframe
+            datapoints.append(datapoint)
+        database = db.Database()
+        database.insert_all(Data.__table__, datapoints, 1122)
+
+
+def _sha256(filepath):
+    """Get the SHA256 checksum of a file.
+
+    Args:
+        filepath: Path of the file
+
+    Returns:
+        result: Hex digest of the checksum
+
+    """
+    # Initialize key variables
+    checksum = hashlib.sha256()
+
+    # Read the file a block at a time
+    with open(filepath, 'rb') as f_handle:
+        for block in iter(lambda: f_handle.read(1048576), b''):
+            checksum.update(block)
+
+    # Return
+    result = checksum.hexdigest()
+    return result
@@ -8,17 +8,21 @@ from collections import defaultdict
 
 # Non standard imports
 import numpy as np
-from sqlalchemy import and_
 
 # Import custom libraries
 from crawsiz.utils import log
-from crawsiz.db import db
 from crawsiz.db import db_data
 from crawsiz.db import db_pair
-from crawsiz.db.db_orm import Prediction
+from crawsiz.db import db_prediction
+from crawsiz.main import render
 from crawsiz.main import report
-from crawsiz.machine import prediction
 from crawsiz.utils import configuration
+from crawsiz.utils import timing
+
+# Version of the features, models and reports. Increment it when changes
+# to them alter the reports, so that the reports of all pairs are created
+# again.
+VERSION = 1
 
 
 class Classify(object):
@@ -155,6 +159,7 @@ class Feature(object):
         self.fxdata = fxdata
         self.timestamp = timestamp
         self.periods = periods
+        self._range = None
 
     def max_high_percent(self):
         """Calculate the max high as percent of current high.
@@ -249,18 +254,22 @@ class Feature(object):
             samples: Sample list
 
         """
-        # Get list of timestamps
-        timestamps = self.fxdata.timestamp()
+        # Search for the timestamp only once, as this is called by
+        # every feature
+        if self._range is None:
+            # Get list of timestamps
+            timestamps = self.fxdata.timestamp()
 
-        # Get the index of the timestamp
-        index = timestamps.index(self.timestamp) + 1
+            # Get the index of the timestamp
+            index = timestamps.index(self.timestamp) + 1
 
-        # Get mean of list of last "periods" values
-        start = index - self.periods
-        stop = index
+            # Get mean of list of last "periods" values
+            start = index - self.periods
+            stop = index
+            self._range = (start, stop)
 
         # Return
-        return (start, stop)
+        return self._range
 
     def _samples_high(self):
         """Get samples of highs to analyze.
@@ -344,8 +353,11 @@ class Feature(object):
             result: max of highs
 
         """
-        # Initialize key variables
-        result = max(self._samples_high())
+        # Look up the index of the max of the window ending at the bar
+        (_, stop) = self._start_stop()
+        index = self.fxdata.extrema(
+            'fxhigh', [self.periods], maximum=True)[self.periods][stop - 1]
+        result = self.fxdata.fxhigh()[index]
 
         # Return
         return result
@@ -360,8 +372,11 @@ class Feature(object):
             result: min of lows
 
         """
-        # Initialize key variables
-        result = min(self._samples_low())
+        # Look up the index of the min of the window ending at the bar
+        (_, stop) = self._start_stop()
+        index = self.fxdata.extrema(
+            'fxlow', [self.periods], maximum=False)[self.periods][stop - 1]
+        result = self.fxdata.fxlow()[index]
 
         # Return
         return result
@@ -558,13 +573,15 @@ class Extract(object):
 
     """
 
-    def __init__(self, idx_pair, lookahead=1, years=6):
+    def __init__(self, idx_pair, lookahead=1, years=6, fxdata=None):
         """Method for intializing the class.
 
         Args:
             idx_pair: FX cross
             lookahead: Number of periods to use for classification
             years: Years of data to retrieve
+            fxdata: Data object for the pair. Retrieved from the
+                database if None.
 
         Returns:
             None
@@ -581,7 +598,9 @@ class Extract(object):
         self._lookahead = lookahead
 
         # Get data object for
-        self._fxdata = getdata(idx_pair, years=years)
+        if fxdata is None:
+            fxdata = getdata(idx_pair, years=years)
+        self._fxdata = fxdata
         timestamps = self._fxdata.timestamp()
 
         # Create features
@@ -756,9 +775,7 @@ def getdata(idx_pair, years=6):
 
     """
     # Initialize key variables
-    seconds_in_year = 3600 * 24 * 365
-    ts_stop = int(time.time())
-    ts_start = ts_stop - (years * seconds_in_year)
+    (ts_start, ts_stop) = _timerange(years)
 
     # Get data object for
     fxdata = db_data.GetIDX(idx_pair, ts_start, ts_stop)
@@ -767,6 +784,46 @@ def getdata(idx_pair, years=6):
     return fxdata
 
 
+def getdata_list(indices, years=6):
+    """Retrieve data for many pairs from database with a single query.
+
+    Args:
+        indices: List of FX crosses
+        years: Years of data to retrieve
+
+    Returns:
+        fxdata: Dict of data objects keyed by FX cross
+
+    """
+    # Initialize key variables
+    (ts_start, ts_stop) = _timerange(years)
+
+    # Get data objects
+    fxdata = db_data.get_idx_list(indices, ts_start, ts_stop)
+
+    # Return
+    return fxdata
+
+
+def _timerange(years):
+    """Get the start and stop timestamps of data to retrieve.
+
+    Args:
+        years: Years of data to retrieve
+
+    Returns:
+        (ts_start, ts_stop): Tuple of timestamps
+
+    """
+    # Initialize key variables
+    seconds_in_year = 3600 * 24 * 365
+    ts_stop = int(time.time())
+    ts_start = ts_stop - (years * seconds_in_year)
+
+    # Return
+    return (ts_start, ts_stop)
+
+
 def vector(fxdata, timestamp):
     """Create a feature vector.
 
@@ -804,28 +861,37 @@ def vector(fxdata, timestamp):
     return feature_vector
 
 
-def process(idx_pair, years=6, lookahead=1, components=10):
+def process(
+        idx_pair, years=6, lookahead=1, components=10, fxdata=None,
+        pair=None):
     """Process data.
 
+    The report isn't written here, so that pages can be rendered by a
+    separate stage as the results of each pair arrive. See report.pages().
+
     Args:
         idx_pair: Index of pair
         years: Number of years of data to process
         components: Number of principal components to analyze
         lookahead:
+        fxdata: Data object for the pair. Retrieved from the
+            database if None.
+        pair: Name of the pair. Retrieved from the database if None.
 
     Returns:
-        None
+        result: Dict of the result. It has the pair, the digest of the
+            inputs and the summary of the report. The summary is None if
+            the report is up to date.
 
     """
     # Initialize key variables
     data_dict = defaultdict(lambda: defaultdict(dict))
 
-    # Sleep a random amount of time
-    time.sleep(randint(0, 10))
-
     # Get pair as string
-    cross_object = db_pair.GetIDX(idx_pair)
-    cross = cross_object.pair().lower()
+    if pair is None:
+        pair = db_pair.GetIDX(idx_pair).pair()
+    cross = pair.lower()
+    result = {'pair': cross.upper(), 'digest': None, 'summary': None}
 
     # Log
     log_message = 'Starting to process {}.'.format(cross.upper())
@@ -834,23 +900,60 @@ def process(idx_pair, years=6, lookahead=1, components=10):
     # Get directory for web output
     config = configuration.Config()
     directory = config.web_directory()
-    filepath = ('%s/%s.html') % (directory, cross)
+    windows = config.historical_windows()
+
+    # Get data for all lookaheads at once
+    if fxdata is None:
+        # Sleep a random amount of time
+        time.sleep(randint(0, 10))
+        with timing.Span('db_load', pair=cross.upper()):
+            fxdata = getdata(idx_pair, years=years)
+
+    # Nothing to do for pairs without data
+    timestamps = fxdata.arrays()['timestamp']
+    if timestamps.size == 0:
+        log_message = 'No data found for {}. Skipping.'.format(cross.upper())
+        log.log2warn(1135, log_message)
+        return result
+
+    # Don't create the report again if none of its inputs have changed
+    inputs = {
+        'version': VERSION,
+        'pair': cross,
+        'years': years,
+        'lookahead': lookahead,
+        'components': components,
+        'windows': windows,
+        'bars': len(timestamps),
+        'last_timestamp': int(timestamps[-1])
+    }
+    result['digest'] = render.digest(inputs)
+    if report.current(directory, cross, result['digest']) is True:
+        log_message = (
+            'Report for {} is up to date. Skipping.'.format(cross.upper()))
+        log.log2quiet(1132, log_message)
+        return result
 
     # Get data objects
     for next_lookahead in range(1, lookahead + 1):
-        # Create extract object
-        extract = Extract(
-            idx_pair, lookahead=next_lookahead, years=years)
+        with timing.Span(
+                'lookahead', pair=cross.upper(), lookahead=next_lookahead):
+            # Create extract object
+            with timing.Span('extract'):
+                extract = Extract(
+                    idx_pair, lookahead=next_lookahead, years=years,
+                    fxdata=fxdata)
 
-        # Get prediction data
-        data_dict['predictions'][next_lookahead] = report.Data(
-            extract, components=components).summary()
+            # Get prediction data
+            data = report.Data(extract, components=components)
+            data_dict['predictions'][next_lookahead] = data.summary()
 
-        # Get last_timestamp
-        last_timestamp = extract.last_timestamp()
+            # Get last_timestamp
+            last_timestamp = extract.last_timestamp()
 
-        # Update predictions in database
-        # _update_db_predictions(extract, components=components)
+            # Update predictions in database
+            with timing.Span('predictions'):
+                _update_db_predictions(extract, data.guess)
 
     # Add additional information to data_dict
     data_dict['years'] = years
@@ -858,72 +961,58 @@ def process(idx_pair, years=6, lookahead=1, components=10):
     data_dict['lookahead'] = lookahead
     data_dict['last_timestamp'] = last_timestamp
 
-    # Create a report object
-    journal = report.Report(data_dict)
-
-    # Create report
-    html = journal.html()
-    with open(filepath, 'w') as f_handle:
-        f_handle.write(html)
+    # Summarize the report
+    result['summary'] = report.Report(
+        data_dict, fxdata=fxdata, pair=cross, windows=windows).summary()
 
     # Log
     log_message = 'Ended processing {}.'.format(cross.upper())
     log.log2quiet(1008, log_message)
+    return result
+
 
+def _update_db_predictions(extract, guess):
+    """Update database with the prediction for the last bar.
 
-def _update_db_predictions(extract, components=10):
-    """Update database with predictions for current run.
+    Only the forward prediction is stored. Predictions for earlier bars
+    were stored by earlier runs, before their outcomes were known.
 
     Args:
         extract: Extract object
-        components: Number of principal components to analyze
+        guess: prediction.Tomorrow object for the extract
 
     Returns:
-        history: List of tuples
+        None
 
     """
-    # Initialize key variables
-    predictions = []
-    lookahead = extract.lookahead()
-    fxdata = extract.fxdata()
-    idx_pair = extract.idx_pair()
-    all_timestamps = sorted(extract.timestamps())
-    timestamps = all_timestamps[-201: -1]
-
-    # Delete all entries for this pair
-    database = db.Database()
-    session = database.session()
-    session.query(Prediction).filter(
-        and_(
-            Prediction.idx_pair == idx_pair,
-            Prediction.lookahead == lookahead)).delete(
-                synchronize_session='fetch')
-    session.commit()
-    database.close()
-
-    # Get predictions
-    for timestamp in timestamps:
-        feature_vector = vector(fxdata, timestamp)
-        guess = prediction.BlackBox(extract, components=components)
-
-        # Get predictions
-        fxhigh_bayesian = guess.high(feature_vector, bayesian=True)
-        fxlow_bayesian = guess.low(feature_vector, bayesian=True)
-        fxhigh_linear = guess.high(feature_vector, bayesian=False)
-        fxlow_linear = guess.low(feature_vector, bayesian=False)
-
-        # Append predictions to history
-        datapoint = Prediction(
-            idx_pair=idx_pair,
-            fxhigh_linear=int(fxhigh_linear),
-            fxhigh_bayesian=int(fxhigh_bayesian),
-            fxlow_linear=int(fxlow_linear),
-            fxlow_bayesian=int(fxlow_bayesian),
-            lookahead=lookahead,
-            timestamp=timestamp
-        )
-        predictions.append(datapoint)
-
-    # Update database
-    database = db.Database()
-    database.add_all(predictions, 9999)
+    # Get the prediction
+    predictions = [{
+        'idx_pair': extract.idx_pair(),
+        'fxhigh_linear': _prediction_value(guess.high(bayesian=False)),
+        'fxhigh_bayesian': _prediction_value(guess.high(bayesian=True)),
+        'fxlow_linear': _prediction_value(guess.low(bayesian=False)),
+        'fxlow_bayesian': _prediction_value(guess.low(bayesian=True)),
+        'lookahead': extract.lookahead(),
+        'timestamp': int(extract.last_timestamp())
+    }]
+
+    # Update database, leaving the predictions of earlier runs unchanged
+    db_prediction.add_predictions(predictions)
+
+
+def _prediction_value(value):
+    """Convert a prediction to a value for the database.
+
+    Args:
+        value: Prediction
+
+    Returns:
+        result: Prediction as an int, or None if undecided
+
+    """
+    # Return
+    if value is None:
+        result = None
+    else:
+        result = int(value)
+    return result
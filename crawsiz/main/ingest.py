@@ -4,15 +4,18 @@ import csv
 import os
 import re
 import time
+import shutil
 from datetime import datetime
 import zipfile
-import shutil
+from concurrent.futures import ThreadPoolExecutor
 
 # Append custom application libraries
 from crawsiz.utils import configuration
 from crawsiz.utils import general
 from crawsiz.utils import log
 from crawsiz.db import db_pair
+from crawsiz.db import db_data
+from crawsiz.db import db_prediction
 from crawsiz.db import db
 from crawsiz.db.db_orm import Data, Pair
 
@@ -44,6 +47,53 @@ class Valid(object):
         # Initialize key variables
         self.filepath = filepath
 
+    def timeframe(self):
+        """Determine the timeframe of the bars in the file.
+
+        Args:
+            None
+
+        Returns:
+            result: Timeframe in minutes
+
+        """
+        # Initialize key variables
+        result = None
+
+        # Extract timeframe from filename
+        filename = os.path.basename(self.filepath)
+        regex = re.compile(r'^[A-Z]{6}(\d+).csv$')
+        match = regex.search(filename)
+        if bool(match) is True:
+            result = int(match.group(1))
+
+        # Return
+        return result
+
+    def timeframes(self):
+        """Determine the configured timeframes the file can be converted to.
+
+        Args:
+            None
+
+        Returns:
+            result: List of timeframes in minutes
+
+        """
+        # Initialize key variables
+        result = []
+        config = configuration.Config()
+        timeframe = self.timeframe()
+
+        # Only timeframes that are multiples of the file's timeframe
+        if timeframe is not None:
+            for target in config.timeframes():
+                if target % timeframe == 0:
+                    result.append(target)
+
+        # Return
+        return result
+
     def pair(self):
         """Determine the pair represented in the file.
 
@@ -61,7 +111,7 @@ class Valid(object):
 
         # Extract symbol from filename
         filename = os.path.basename(self.filepath)
-        regex = re.compile(r'^([A-Z]{6})1440.csv$')
+        regex = re.compile(r'^([A-Z]{6})\d+.csv$')
         match = regex.search(filename)
 
         # Fail if invalid filename
@@ -108,6 +158,17 @@ class Valid(object):
         # Invalid if pair not found
         if self.pair() is None:
             validity = False
+            return validity
+
+        # Invalid if the data can't be used for any configured timeframe
+        if bool(self.timeframes()) is False:
+            log_message = (
+                'Timeframe of file %s can\'t be converted to any '
+                'timeframe in the config file.'
+                '') % (self.filepath)
+            log.log2warn(1116, log_message)
+            validity = False
+            return validity
 
         # Fail if filepath doesn't exist
         if os.path.exists(self.filepath) is False:
@@ -165,98 +226,89 @@ class Ingest(object):
                 '') % (self.filepath)
             log.log2die(1006, log_message)
 
-        # Get the pair
+        # Get the pair and timeframes
         self.pair = validity.pair()
+        self.timeframe = validity.timeframe()
+        self.timeframes = validity.timeframes()
 
-    def ingest(self):
+    def ingest(self, batch_size=10000):
         """Ingest file.
 
+        The file is read one line at a time and its bars are aggregated
+        into bars for every configured timeframe in a single pass. Completed
+        bars are written to the database in batches, so memory usage does
+        not depend on the size of the file.
+
         Args:
-            filename: Name of file to ingest
-            archive: Archive filename if True
+            batch_size: Number of bars to insert per database transaction
 
         Returns:
-            timeframe: Timeframe in minutes
+            ingested: True if new data was added to the database
 
         """
         # Initialize key variables
         datapoints = []
         max_timestamp = 0
+        ingested = False
 
-        # Get the last update time for the pair
-        last_updated = self._last_updated()
+        # Make sure the pair is in the database
+        self._last_updated()
 
         # Get pair IDX value
         idx_pair = db_pair.GetPair(self.pair).idx()
 
+        # Create an aggregator for each timeframe. Each one skips data
+        # older than the most recent bar in the database for its timeframe.
+        timestamps = db_data.last_timestamps(idx_pair)
+        aggregates = []
+        for timeframe in self.timeframes:
+            aggregates.append(
+                Aggregate(
+                    idx_pair, timeframe, self.timeframe,
+                    last_timestamp=timestamps.get(timeframe, 0)))
+
         ######################################################################
         # Convert data
         ######################################################################
 
-        with open(self.filepath, newline='') as csvfile:
-            lines = csv.reader(csvfile, delimiter=',', quotechar='|')
-            for line in lines:
-                # Get the time
-                r_time = line[1]
-
-                # Skip if time doesn't end in ":00"
-                if r_time.endswith(':00') is False:
-                    continue
-
-                # Get data
-                r_day = line[0]
-                r_date = ('%s %s') % (r_day, r_time)
-                r_open = float(line[2])
-                r_high = float(line[3])
-                r_low = float(line[4])
-                r_close = float(line[5])
-                r_volume = int(line[6])
-
-                # Convert date to timestamp
-                timestamp = general.utc_timestamp(
-                    datetime.strptime(r_date, "%Y.%m.%d %H:%M")
-                    )
-
-                # Skip if data is stale
-                if timestamp <= last_updated:
-                    continue
-
-                # Skip data if it is not on a UTC day boundary
-                if timestamp % 86400 != 0:
-                    continue
-
-                # Assign values to database object
-                datapoint = Data(
-                    idx_pair=idx_pair,
-                    fxopen=r_open,
-                    fxclose=r_close,
-                    fxhigh=r_high,
-                    fxlow=r_low,
-                    fxvolume=r_volume,
-                    timestamp=timestamp
-                )
-                datapoints.append(datapoint)
-
-                # Assign max_timestamp
-                max_timestamp = max(timestamp, max_timestamp)
-
-        # Update only if we have data
+        for bar in bars(self.filepath):
+            # Aggregate
+            for aggregate in aggregates:
+                datapoint = aggregate.add(*bar)
+                if datapoint is not None:
+                    datapoints.append(datapoint)
+
+                    # Assign max_timestamp
+                    max_timestamp = max(
+                        datapoint['timestamp'], max_timestamp)
+
+            # Write to the database in batches
+            if len(datapoints) >= batch_size:
+                _insert(datapoints)
+                datapoints = []
+                ingested = True
+
+        # Write the remaining bars
         if bool(datapoints) is True:
-            # Update Data table
-            database = db.Database()
-            database.add_all(datapoints, 9999)
+            _insert(datapoints)
+            ingested = True
 
-            # Update last updated for Pair
+        # Update last updated for Pair
+        if ingested is True:
             database = db.Database()
             session = database.session()
             result = session.query(Pair).filter(
                 Pair.pair == self.pair.encode()).one()
-            result.last_timestamp = max_timestamp
+            result.last_timestamp = max(
+                max_timestamp, result.last_timestamp)
             session.commit()
             database.close()
 
-            # Archive the ingest file
-            _archive_ingest_file(self.filepath)
+            # The new bars may reveal the outcome of earlier predictions
+            db_prediction.update_outcomes(idx_pair)
+
+        # Return
+        return ingested
 
     def _last_updated(self):
         """Get the timestamp for the last database update for the pair.
@@ -285,14 +337,283 @@ class Ingest(object):
         return last_updated
 
 
-def _archive_ingest_file(filepath):
-    """Update databse with data.
+class Aggregate(object):
+    """Class aggregates a stream of bars into bars of a larger timeframe.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    Methods:
+
+    """
+
+    def __init__(self, idx_pair, timeframe, source, last_timestamp=0):
+        """Function for intializing the class.
+
+        Args:
+            idx_pair: Pair idx
+            timeframe: Timeframe of the bars to create in minutes
+            source: Timeframe of the bars to be added in minutes
+            last_timestamp: Bars starting at or before this timestamp
+                are already in the database and are ignored
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.idx_pair = idx_pair
+        self.timeframe = timeframe
+        self.source = source
+        self.last_timestamp = last_timestamp
+        self._seconds = timeframe * 60
+        self._bar = None
+        self._first = True
+        self._skip = None
+
+    def add(self, timestamp, fxopen, fxhigh, fxlow, fxclose, fxvolume):
+        """Add a bar.
+
+        Bars for timeframes larger than the source are returned once the
+        last bar of their period is added, or once a bar for a later period
+        is added if the last bars of the period are missing. The bar being
+        built at the end of a file is never returned, and the first period
+        is skipped if the first bar added doesn't start it, so incomplete
+        bars are never stored. Bars of the source timeframe are returned
+        immediately.
+
+        Args:
+            timestamp: Timestamp of the bar
+            fxopen: Open
+            fxhigh: High
+            fxlow: Low
+            fxclose: Close
+            fxvolume: Volume
+
+        Returns:
+            datapoint: Dict of a completed bar ready for the database,
+                None if no bar was completed
+
+        """
+        # Initialize key variables
+        datapoint = None
+        start = timestamp - (timestamp % self._seconds)
+
+        # The bar being built is complete when a new period starts
+        if self._bar is not None and start != self._bar['timestamp']:
+            datapoint = self._bar
+            self._bar = None
+
+        # Skip stale data
+        if start <= self.last_timestamp:
+            return datapoint
+
+        # Bars of the source timeframe must already be aligned
+        if self.timeframe == self.source:
+            if start == timestamp:
+                datapoint = self._new(
+                    start, fxopen, fxhigh, fxlow, fxclose, fxvolume)
+            return datapoint
+
+        # Skip the first period if the first bar doesn't start it. The
+        # earlier bars of the period are in another file.
+        if self._first is True:
+            self._first = False
+            if start != timestamp:
+                self._skip = start
+        if start == self._skip:
+            return datapoint
+
+        # Update the bar being built
+        if self._bar is None:
+            self._bar = self._new(
+                start, fxopen, fxhigh, fxlow, fxclose, fxvolume)
+        else:
+            self._bar['fxhigh'] = max(self._bar['fxhigh'], fxhigh)
+            self._bar['fxlow'] = min(self._bar['fxlow'], fxlow)
+            self._bar['fxclose'] = fxclose
+            self._bar['fxvolume'] += fxvolume
+
+        # The bar is complete when the last bar of its period is added
+        if datapoint is None:
+            if timestamp + self.source * 60 == start + self._seconds:
+                datapoint = self._bar
+                self._bar = None
+
+        # Return
+        return datapoint
+
+    def _new(self, timestamp, fxopen, fxhigh, fxlow, fxclose, fxvolume):
+        """Create a new bar.
+
+        Args:
+            timestamp: Timestamp of the bar
+            fxopen: Open
+            fxhigh: High
+            fxlow: Low
+            fxclose: Close
+            fxvolume: Volume
+
+        Returns:
+            datapoint: Dict of the bar keyed by xs_data column
+
+        """
+        # Return
+        datapoint = {
+            'idx_pair': self.idx_pair,
+            'timeframe': self.timeframe,
+            'timestamp': timestamp,
+            'fxopen': fxopen,
+            'fxhigh': fxhigh,
+            'fxlow': fxlow,
+            'fxclose': fxclose,
+            'fxvolume': fxvolume
+        }
+        return datapoint
+
+
+class Archive(object):
+    """Class archives ingested files in background threads.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    Methods:
+
+    """
+
+    def __init__(self, workers=2):
+        """Function for intializing the class.
+
+        Args:
+            workers: Number of files to archive concurrently
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def add(self, filepath):
+        """Queue a file for archiving.
+
+        Args:
+            filepath: File to archive
+
+        Returns:
+            None
+
+        """
+        # Archive the file in the background. Note which file it is now,
+        # so that a new file with the same name is left alone.
+        identity = _identity(os.stat(filepath))
+        future = self._executor.submit(
+            _archive_ingest_file, filepath, identity=identity)
+        future.add_done_callback(_archived)
+
+    def close(self):
+        """Wait for all queued files to be archived.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Wait for the threads to finish
+        self._executor.shutdown(wait=True)
+
+
+def bars(filepath):
+    """Read the bars in an ingest file.
+
+    The file is read one line at a time.
+
+    Args:
+        filepath: Path of the file
+
+    Yields:
+        bar: Tuple of (timestamp, fxopen, fxhigh, fxlow, fxclose, fxvolume)
+
+    """
+    # Initialize key variables
+    days = {}
+
+    with open(filepath, newline='') as csvfile:
+        lines = csv.reader(csvfile, delimiter=',', quotechar='|')
+        for line in lines:
+            # Convert date to timestamp. Only convert each day once.
+            r_day = line[0]
+            if r_day not in days:
+                days[r_day] = general.utc_timestamp(
+                    datetime.strptime(r_day, '%Y.%m.%d'))
+            (r_hour, r_minute) = line[1].split(':')
+            timestamp = days[r_day] + (
+                int(r_hour) * 3600) + (int(r_minute) * 60)
+
+            # Get data
+            yield (
+                timestamp, float(line[2]), float(line[3]), float(line[4]),
+                float(line[5]), int(line[6]))
+
+
+def _insert(datapoints):
+    """Insert bars into the database.
+
+    Args:
+        datapoints: List of dicts keyed by xs_data column
+
+    Returns:
+        None
+
+    """
+    # Update Data table
+    database = db.Database()
+    database.insert_all(Data.__table__, datapoints, 9999)
+
+
+def _archived(future):
+    """Log the outcome of archiving a file.
+
+    Args:
+        future: concurrent.futures.Future of the archive thread
+
+    Returns:
+        None
+
+    """
+    # Log
+    if future.exception() is None:
+        if future.result() is not None:
+            log_message = ('Created archive %s.') % (future.result())
+            log.log2quiet(1114, log_message)
+    else:
+        log_message = (
+            'Unable to archive ingest file. Error: %s'
+            '') % (future.exception())
+        log.log2warn(1115, log_message)
+
+
+def _archive_ingest_file(filepath, identity=None, compresslevel=6):
+    """Compress an ingested file into the archive directory.
 
     Args:
         filepath: File to zip
+        identity: Identity of the ingested file from _identity(). Nothing
+            is done if the file has been replaced since, as the new file
+            hasn't been ingested yet. Not checked if None.
+        compresslevel: Deflate compression level
 
     Returns:
-        zip_filename: Filename of archive
+        zip_filename: Filename of archive, None if the file was replaced
 
     """
     # Initialize key variables
@@ -309,22 +630,56 @@ def _archive_ingest_file(filepath):
         target_filename,
         datetime.fromtimestamp(
             timestamp).strftime('%Y%m%d-%H%M%S'))
+    temp_filename = ('%s.tmp') % (zip_filename)
 
-    # Move file
-    shutil.move(filepath, target_filename)
-
-    # Archive file
-    zip_handle = zipfile.ZipFile(zip_filename, mode='w')
-    zip_handle.write(target_filename)
-    zip_handle.close()
-
-    # Delete ingest file
-    os.remove(target_filename)
+    with open(filepath, 'rb') as f_handle:
+        # Don't archive a file that replaced the ingested one
+        status = os.fstat(f_handle.fileno())
+        if identity is not None and _identity(status) != identity:
+            log_message = (
+                'Ingest file %s was replaced before it was archived. '
+                'Skipping.') % (filepath)
+            log.log2warn(1134, log_message)
+            return None
+
+        # Stream the ingest file into the archive. Use a temporary name so
+        # that a partially written archive is never mistaken for a good
+        # one.
+        with zipfile.ZipFile(
+                temp_filename, mode='w', compression=zipfile.ZIP_DEFLATED,
+                compresslevel=compresslevel) as zip_handle:
+            with zip_handle.open(filename, mode='w') as zip_member:
+                shutil.copyfileobj(f_handle, zip_member, 1048576)
+        os.replace(temp_filename, zip_filename)
+
+    # Delete ingest file, unless it was replaced while it was archived
+    if identity is None or _identity(os.stat(filepath)) == identity:
+        os.remove(filepath)
+    else:
+        log_message = (
+            'Ingest file %s was replaced while it was archived. '
+            'Not deleting it.') % (filepath)
+        log.log2warn(1134, log_message)
 
     # Return zip filename
     return zip_filename
 
 
+def _identity(status):
+    """Get values that identify a version of a file.
+
+    Args:
+        status: os.stat_result of the file
+
+    Returns:
+        result: Tuple of the inode and modification time
+
+    """
+    # Return
+    result = (status.st_ino, status.st_mtime_ns)
+    return result
+
+
 def ingest(filepath):
     """Ingest file.
 
@@ -332,9 +687,10 @@ def ingest(filepath):
         filepath: Name of file to ingest
 
     Returns:
-        None
+        ingested: True if new data was added to the database
 
     """
     # Initialize key variables
     ingest_object = Ingest(filepath)
-    ingest_object.ingest()
+    ingested = ingest_object.ingest()
+    return ingested
@@ -0,0 +1,175 @@
+"""Library to publish reports in machine readable formats.
+
+Each pair has a JSON document alongside its HTML report. The documents of
+all pairs are consolidated into a single JSON file, and a CSV file with a
+row for each prediction, so that consumers can poll one small file.
+
+"""
+
+import io
+import os
+import csv
+import json
+import time
+
+# Import custom libraries
+from crawsiz.main import render
+
+# Names of the consolidated files and the version of their format
+FILENAME = 'crawsiz.json'
+CSV_FILENAME = 'crawsiz.csv'
+VERSION = 1
+
+# Predictions in each document
+PREDICTIONS = ('linear_high', 'linear_low', 'bayesian_high', 'bayesian_low')
+
+
+def filepath(directory, pair):
+    """Get the path of the document of a pair.
+
+    Args:
+        directory: Web directory
+        pair: Pair
+
+    Returns:
+        result: Path
+
+    """
+    # Return
+    result = os.path.join(directory, '{}.json'.format(pair.lower()))
+    return result
+
+
+def current(path, value):
+    """Determine whether a document was created from the same inputs.
+
+    Args:
+        path: Path of the document
+        value: Digest of the inputs
+
+    Returns:
+        result: True if the document exists and has the digest
+
+    """
+    # Return
+    result = _read(path).get('digest') == value
+    return result
+
+
+def write(path, data, value):
+    """Write the document of a pair atomically.
+
+    Args:
+        path: Path of the document
+        data: Dict of the report, such as from report.Report.summary()
+        value: Digest of the inputs of the report
+
+    Returns:
+        None
+
+    """
+    # Write
+    document = {'version': VERSION, 'digest': value}
+    document.update(data)
+    render.write(path, [json.dumps(document, sort_keys=True)])
+
+
+def consolidate(directory, pairs):
+    """Consolidate the documents of pairs into single JSON and CSV files.
+
+    The files aren't written again if none of the documents have changed.
+
+    Args:
+        directory: Web directory
+        pairs: List of pairs
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    path = os.path.join(directory, FILENAME)
+    documents = {}
+
+    # Read the documents. Pairs without a report yet are ignored.
+    for pair in sorted(pairs):
+        document = _read(filepath(directory, pair))
+        if bool(document) is True:
+            documents[pair.upper()] = document
+
+    # Don't write the files again if the documents haven't changed
+    value = render.digest({
+        'version': VERSION,
+        'pairs': [
+            (pair, document['digest'])
+            for pair, document in sorted(documents.items())]})
+    if _read(path).get('digest') == value:
+        return
+
+    # Write. The JSON file is written last, as it records the digest.
+    render.write(
+        os.path.join(directory, CSV_FILENAME), [_csv(documents)])
+    data = {
+        'version': VERSION,
+        'digest': value,
+        'created': int(time.time()),
+        'pairs': documents
+    }
+    render.write(path, [json.dumps(data, sort_keys=True)])
+
+
+def _csv(documents):
+    """Create a CSV table of the predictions of pairs.
+
+    Args:
+        documents: Dict of documents keyed by pair
+
+    Returns:
+        result: CSV
+
+    """
+    # Initialize key variables
+    f_handle = io.StringIO()
+    writer = csv.writer(f_handle, lineterminator='\n')
+    writer.writerow((
+        'pair', 'last_timestamp', 'lookahead', 'date', 'prediction',
+        'predicted_class', 'accuracy'))
+
+    # Create a row for each prediction
+    for pair, document in sorted(documents.items()):
+        for entry in document['predictions']:
+            for key in PREDICTIONS:
+                writer.writerow((
+                    pair, document['last_timestamp'], entry['lookahead'],
+                    entry['date'], key, entry[key]['predicted_class'],
+                    '{:1.2f}'.format(entry[key]['accuracy'])))
+
+    # Return
+    result = f_handle.getvalue()
+    return result
+
+
+def _read(path):
+    """Read a JSON document.
+
+    Args:
+        path: Path of the document
+
+    Returns:
+        data: Dict of the document. It is empty if the document doesn't
+            exist or isn't valid.
+
+    """
+    # Initialize key variables
+    data = {}
+
+    # Read
+    if os.path.isfile(path) is True:
+        try:
+            with open(path, 'r') as f_handle:
+                data = json.load(f_handle)
+        except ValueError:
+            data = {}
+
+    # Return
+    return data
@@ -0,0 +1,268 @@
+"""Library to render HTML reports.
+
+Pages are created from templates as a stream of strings, so they can be
+written to a file as they are rendered. Rendering time and memory don't
+grow faster than the number of table rows.
+
+Pages are written atomically and record a digest of the inputs used to
+create them, so that pages whose inputs haven't changed are not created
+again.
+
+"""
+
+import os
+import json
+import hashlib
+
+# Version of the templates. Increment it when changes to the templates
+# alter the pages, so that all pages are created again.
+VERSION = 1
+
+# Templates of page elements
+PAGE_START = '<html>\n<head><title>{0}</title></head>\n<body>\n<h1>{0}</h1>\n'
+PAGE_STOP = '</html></body>\n'
+TITLE = '<h2>{}</h2>'
+TEXT_START = '<p style="font-family:courier">'
+TEXT_STOP = '</p>'
+TABLE_START = '<table cellpadding="7">'
+TABLE_STOP = ' </table>'
+HEADING = '<th bgcolor="#8CAA39"><font color="#FFFFFF">{}</font></th>'
+ROW = ' <tr bgcolor="{}"> <td>{} </td> </tr>'
+CELL_SEPARATOR = '</td><td>'
+DIGEST = '<!-- inputs {} -->\n'
+
+# Colors of alternating table rows
+COLORS = ('#EEEEFF', '#B0E0E6')
+
+
+def page(title, sections):
+    """Render a page.
+
+    Args:
+        title: Title of the page
+        sections: Iterable of sections. Each section is an iterable of
+            strings, such as those created by the other functions here.
+
+    Yields:
+        chunk: Next string of the page
+
+    """
+    # Render
+    yield PAGE_START.format(title)
+    for section in sections:
+        yield from section
+        yield '\n'
+    yield PAGE_STOP
+
+
+def text(lines):
+    """Render text in a fixed width font.
+
+    Args:
+        lines: Text
+
+    Yields:
+        chunk: Next string of the section
+
+    """
+    # Render
+    yield TEXT_START
+    yield _text(lines)
+    yield TEXT_STOP
+
+
+def text_table(title, heading, rows, highlight_duplicates=False):
+    """Render a titled table in a fixed width font.
+
+    Args:
+        title: Title of the table
+        heading: Tuple of column headings
+        rows: Iterable of tuples of column values
+        highlight_duplicates: Don't alternate the color of rows that
+            have the same first value as the row before them
+
+    Yields:
+        chunk: Next string of the section
+
+    """
+    # Render
+    yield TEXT_START
+    yield _text('{}\n'.format(TITLE.format(title)))
+    yield from table(heading, rows, highlight_duplicates=highlight_duplicates)
+    yield TEXT_STOP
+
+
+def titled_table(title, heading, rows, highlight_duplicates=False):
+    """Render a titled table.
+
+    Args:
+        title: Title of the table
+        heading: Tuple of column headings
+        rows: Iterable of tuples of column values
+        highlight_duplicates: Don't alternate the color of rows that
+            have the same first value as the row before them
+
+    Yields:
+        chunk: Next string of the section
+
+    """
+    # Render
+    yield '{}\n'.format(TITLE.format(title))
+    yield from table(heading, rows, highlight_duplicates=highlight_duplicates)
+
+
+def table(heading, rows, highlight_duplicates=False):
+    """Render a table, one row at a time.
+
+    Args:
+        heading: Tuple of column headings
+        rows: Iterable of tuples of column values
+        highlight_duplicates: Don't alternate the color of rows that
+            have the same first value as the row before them
+
+    Yields:
+        chunk: Next string of the table
+
+    """
+    # Initialize key variables
+    odd_row = False
+    previous_value = None
+
+    # Create header
+    yield '{}{}'.format(TABLE_START, ' '.join(
+        [HEADING.format(_cell(item)) for item in heading]))
+
+    # Create rows
+    for tuple_row in rows:
+        row = [_cell(item) for item in tuple_row]
+
+        # Logic to alter colors
+        current_value = row[0] if bool(row) is True else None
+        if highlight_duplicates is False or current_value != previous_value:
+            odd_row = not odd_row
+        previous_value = current_value
+
+        # Render
+        yield ROW.format(
+            COLORS[0] if odd_row is True else COLORS[1],
+            CELL_SEPARATOR.join(row))
+
+    # Finish the table
+    yield TABLE_STOP
+
+
+def html(chunks):
+    """Join rendered strings.
+
+    Args:
+        chunks: Iterable of strings
+
+    Returns:
+        result: HTML
+
+    """
+    # Return
+    result = ''.join(chunks)
+    return result
+
+
+def digest(inputs):
+    """Create a digest of the inputs of a page.
+
+    Args:
+        inputs: Dict of values used to create the page. The values must
+            be serializable as JSON.
+
+    Returns:
+        result: Digest
+
+    """
+    # Return
+    string = json.dumps(
+        {'render': VERSION, 'inputs': inputs}, sort_keys=True)
+    result = hashlib.sha256(string.encode()).hexdigest()
+    return result
+
+
+def current(filepath, value):
+    """Determine whether a page was created from the same inputs.
+
+    Args:
+        filepath: Path of the page
+        value: Digest of the inputs
+
+    Returns:
+        result: True if the page exists and has the digest
+
+    """
+    # Initialize key variables
+    result = False
+
+    # Read the digest on the first line of the page
+    if os.path.isfile(filepath) is True:
+        with open(filepath, 'r') as f_handle:
+            result = f_handle.readline() == DIGEST.format(value)
+
+    # Return
+    return result
+
+
+def write(filepath, chunks, value=None):
+    """Write a page atomically.
+
+    The page is written to a temporary file that then replaces the page,
+    so that a partially written page is never served.
+
+    Args:
+        filepath: Path of the page
+        chunks: Iterable of strings of the page
+        value: Digest of the inputs of the page. It is recorded in the
+            page if not None.
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    temp_filepath = '{}.tmp'.format(filepath)
+
+    # Write
+    try:
+        with open(temp_filepath, 'w') as f_handle:
+            if value is not None:
+                f_handle.write(DIGEST.format(value))
+            f_handle.writelines(chunks)
+        os.replace(temp_filepath, filepath)
+    finally:
+        if os.path.exists(temp_filepath) is True:
+            os.remove(temp_filepath)
+
+
+def _text(lines):
+    """Convert text to text like HTML.
+
+    Args:
+        lines: Text
+
+    Returns:
+        output: HTML
+
+    """
+    # Return
+    output = lines.replace('\n', '<br>\n').replace('  ', '&nbsp;&nbsp;')
+    return output
+
+
+def _cell(value):
+    """Convert a value to the text of a table cell.
+
+    Args:
+        value: Value
+
+    Returns:
+        result: Text with runs of whitespace replaced by a single space
+
+    """
+    # Return
+    result = ' '.join('{}'.format(value).split())
+    return result
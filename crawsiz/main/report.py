@@ -1,17 +1,23 @@
 """Library to process the ingest of data files."""
 
 # Standard imports
+import os
 from collections import defaultdict
 
 # Non standard imports
 
 # Import custom libraries
 from crawsiz.main import feature
+from crawsiz.main import publish
+from crawsiz.main import render
 from crawsiz.machine import accuracy
 from crawsiz.machine import prediction
 from crawsiz.utils import general
 from crawsiz.db import db_pair
 
+# Number of days in each period of the historical highs and lows
+WINDOWS = (60, 120, 180, 240)
+
 
 class Data(object):
     """Class to get report data."""
@@ -184,11 +190,16 @@ class Data(object):
 class Report(object):
     """Class to create reports."""
 
-    def __init__(self, data):
+    def __init__(self, data, fxdata=None, pair=None, windows=WINDOWS):
         """Method for intializing the class.
 
         Args:
             data: Dict of data to use in report
+            fxdata: Data object for the pair. Retrieved from the
+                database if None.
+            pair: Name of the pair. Retrieved from the database if None.
+            windows: List of the number of days of each period of the
+                historical highs and lows
 
         Returns:
             None
@@ -196,13 +207,17 @@ class Report(object):
         """
         # Initialize key variables
         self.data = data
+        self.windows = sorted(windows)
         idx_pair = data['idx_pair']
         years = data['years']
-        self._fxdata = feature.getdata(idx_pair, years=years)
+        if fxdata is None:
+            fxdata = feature.getdata(idx_pair, years=years)
+        self._fxdata = fxdata
 
         # Get pair as string
-        cross = db_pair.GetIDX(idx_pair)
-        self.pair = cross.pair().upper()
+        if pair is None:
+            pair = db_pair.GetIDX(idx_pair).pair()
+        self.pair = pair.upper()
 
     def html(self):
         """Provide report as HTML.
@@ -214,114 +229,78 @@ class Report(object):
             output: Full report in HTML
 
         """
-        # Initialize key variables
-        output = ("""\
-<html>
-<head><title>%s</title></head>
-<body>
-<h1>%s</h1>
-%s
-%s
-%s
-%s
-%s
-</html></body>
-""") % (self.pair,
-        self.pair,
-        _text(self._summary()),
-        _text(self._linear()),
-        _text(self._bayesian()),
-        self._historical_highs(),
-        self._historical_lows())
-
         # Return
+        output = render.html(self.chunks())
         return output
 
-    def _bayesian(self):
-        """Provide report on bayesian predictions.
+    def write(self, f_handle):
+        """Write the report as HTML as it is rendered.
+
+        Args:
+            f_handle: File handle open for writing
+
+        Returns:
+            None
+
+        """
+        # Write
+        f_handle.writelines(self.chunks())
+
+    def chunks(self):
+        """Render the report.
 
         Args:
             None
 
         Returns:
-            output: Performance report
+            chunks: Iterable of strings of HTML
 
         """
-        # Initialize key variables
-        predictions = self.data['predictions']
-        rows = []
-
-        # Create headings
-        heading = (
-            'Day', 'Date', 'High', 'High Accuracy', 'Low', 'Low Accuracy')
-
-        # Get data
-        for next_lookahead, data_dict in sorted(predictions.items()):
-            # Create symbols for table
-            if data_dict['bayesian_high']['predicted_class'] > 0:
-                high_direction = '^'
-            else:
-                high_direction = 'v'
-            if data_dict['bayesian_low']['predicted_class'] > 0:
-                low_direction = '^'
-            else:
-                low_direction = 'v'
-            rows.append((
-                next_lookahead,
-                self._lookahead_date(next_lookahead),
-                high_direction,
-                '{:1.2f}%'.format(data_dict['bayesian_high']['accuracy']),
-                low_direction,
-                '{:1.2f}%'.format(data_dict['bayesian_low']['accuracy'])
-            ))
-
-        # Create table, return html
-        table = _html_table(heading, rows)
-        html = ('<h2>Bayesian Prediction</h2>\n%s') % (table)
-        return html
-
-    def _linear(self):
-        """Provide report on linear predictions.
+        # Return
+        chunks = page(self.summary())
+        return chunks
+
+    def summary(self):
+        """Provide the report as a dict that can be serialized as JSON.
 
         Args:
             None
 
         Returns:
-            output: Performance report
+            data: Dict of the report
 
         """
         # Initialize key variables
-        predictions = self.data['predictions']
-        rows = []
-
-        # Create headings
-        heading = (
-            'Day', 'Date', 'High', 'High Accuracy', 'Low', 'Low Accuracy')
-
-        # Get data
-        for next_lookahead, data_dict in sorted(predictions.items()):
-            # Create symbols for table
-            if data_dict['linear_high']['predicted_class'] > 0:
-                high_direction = '^'
-            else:
-                high_direction = 'v'
-            if data_dict['linear_low']['predicted_class'] > 0:
-                low_direction = '^'
-            else:
-                low_direction = 'v'
-            rows.append((
-                next_lookahead,
-                self._lookahead_date(next_lookahead),
-                high_direction,
-                '{:1.2f}%'.format(data_dict['linear_high']['accuracy']),
-                low_direction,
-                '{:1.2f}%'.format(data_dict['linear_low']['accuracy'])
-            ))
-
-        # Create table, return html
-        table = _html_table(heading, rows)
-        html = ('<h2>Linear Prediction</h2>\n%s') % (table)
-        return html
+        predictions = []
+        keys = ('linear_high', 'linear_low', 'bayesian_high', 'bayesian_low')
+
+        # Get predictions
+        for next_lookahead, data_dict in sorted(
+                self.data['predictions'].items()):
+            entry = {
+                'lookahead': next_lookahead,
+                'date': self._lookahead_date(next_lookahead)
+            }
+            for key in keys:
+                entry[key] = {
+                    'predicted_class': int(
+                        data_dict[key]['predicted_class']),
+                    'accuracy': float(data_dict[key]['accuracy'])
+                }
+            predictions.append(entry)
+
+        # Return
+        data = {
+            'pair': self.pair,
+            'years': self.data['years'],
+            'lookahead': self.data['lookahead'],
+            'last_timestamp': int(self.data['last_timestamp']),
+            'last_date': general.utc_timestring(self.data['last_timestamp']),
+            'predictions': predictions,
+            'historical_highs': self._extrema('fxhigh'),
+            'historical_lows': self._extrema('fxlow', maximum=False)
+        }
+        return data
 
     def _lookahead_date(self, lookahead):
         """Get date of lookahead.
@@ -342,198 +321,206 @@ class Report(object):
         # Return
         return date_of_prediction
 
-    def _summary(self):
-        """Provide summary header for the report.
+    def _extrema(self, column, maximum=True):
+        """Get the extreme values of recent periods.
 
         Args:
-            None
+            column: Column name, such as fxhigh or fxlow
+            maximum: Get the maximum values if True, the minimum values if
+                False
 
         Returns:
-            output: Report header
+            data: List of dicts of the extreme value of each period and
+                when it occurred. The current bar is excluded.
 
         """
-        # Initialize key varialbes
-        last_timestamp = self.data['last_timestamp']
-        last_data_date = general.utc_timestring(last_timestamp)
-
-        # Create output
-        output = ("""\
-Last Date Processed: %s
+        # Initialize key variables
+        data = []
+        values = self._fxdata.arrays()[column]
+        timestamps = self._fxdata.arrays()['timestamp']
 
+        # Get the indices of the extreme values of all periods at once.
+        # Periods end at the bar before the current one.
+        indices = self._fxdata.extrema(column, self.windows, maximum=maximum)
+        for days in self.windows:
+            index = indices[days][-2]
+            timestamp = int(timestamps[index])
 
-""") % (last_data_date)
+            # Append data
+            data.append({
+                'days': days,
+                'value': values[index].item(),
+                'timestamp': timestamp,
+                'date': general.utc_timestring(timestamp)
+            })
 
         # Return
-        return output
+        return data
 
-    def _historical_highs(self):
-        """Create table of historical highs.
 
-        Args:
-            None
+def current(directory, pair, digest):
+    """Determine whether the page and document of a pair are up to date.
 
-        Returns:
-            output: Historical report in HTML
+    Args:
+        directory: Web directory
+        pair: Pair
+        digest: Digest of the inputs of the report
 
-        """
-        # Initialize key variables
-        values = ['Value']
-        dates = ['Date']
-
-        # Create headings
-        heading = (
-            '', '60 Day High', '120 Day High', '180 Day High', '240 Day High')
-
-        # Get data from database
-        high_list = self._fxdata.fxhigh()
-        timestamps = self._fxdata.timestamp()
-
-        # Get values
-        for days in range(60, 241, 60):
-            # Trim values to inspect
-            value_list = high_list[-days - 1: -1]
-            times_list = timestamps[-days - 1: -1]
-            interesting_value = max(value_list)
-            index = value_list.index(interesting_value)
-            timestamp = times_list[index]
-            date_string = general.utc_timestring(timestamp)
+    Returns:
+        result: True if both were created from the same inputs
 
-            # Append data
-            values.append(interesting_value)
-            dates.append(date_string)
+    """
+    # Return
+    result = (
+        render.current(_filepath(directory, pair), digest) is True and
+        publish.current(publish.filepath(directory, pair), digest) is True)
+    return result
 
-        # Create report
-        rows = [values, dates]
-        table = _html_table(heading, rows)
-        html = ('<h2>Historical Highs</h2>\n%s') % (table)
 
-        # Return HTML
-        return html
+def pages(directory, result):
+    """Write the page and document of a pair.
 
-    def _historical_lows(self):
-        """Create table of historical lows.
+    Args:
+        directory: Web directory
+        result: Dict of the result of processing the pair, as returned by
+            feature.process(). Nothing is written if it has no summary.
 
-        Args:
-            None
+    Returns:
+        None
 
-        Returns:
-            output: Historical report in HTML
+    """
+    # Nothing to do
+    if result['summary'] is None:
+        return
 
-        """
-        # Initialize key variables
-        values = ['Value']
-        dates = ['Date']
-
-        # Create headings
-        heading = (
-            '', '60 Day Low', '120 Day Low', '180 Day Low', '240 Day Low')
-
-        # Get data from database
-        low_list = self._fxdata.fxlow()
-        timestamps = self._fxdata.timestamp()
-
-        # Get values
-        for days in range(60, 241, 60):
-            # Trim values to inspect
-            value_list = low_list[-days - 1: -1]
-            times_list = timestamps[-days - 1: -1]
-            interesting_value = min(value_list)
-            index = value_list.index(interesting_value)
-            timestamp = times_list[index]
-            date_string = general.utc_timestring(timestamp)
+    # Write
+    render.write(
+        _filepath(directory, result['pair']), page(result['summary']),
+        value=result['digest'])
+    publish.write(
+        publish.filepath(directory, result['pair']), result['summary'],
+        result['digest'])
 
-            # Append data
-            values.append(interesting_value)
-            dates.append(date_string)
 
-        # Create report
-        rows = [values, dates]
-        table = _html_table(heading, rows)
-        html = ('<h2>Historical Lows</h2>\n%s') % (table)
+def page(summary):
+    """Render the report of a pair.
 
-        # Return HTML
-        return html
+    Args:
+        summary: Dict of the report, such as from Report.summary()
+
+    Returns:
+        chunks: Iterable of strings of HTML
 
+    """
+    # Return
+    chunks = render.page(summary['pair'], [
+        render.text(_summary(summary)),
+        _predictions(summary, 'linear', 'Linear Prediction'),
+        _predictions(summary, 'bayesian', 'Bayesian Prediction'),
+        _historical(summary['historical_highs'], 'High'),
+        _historical(summary['historical_lows'], 'Low')])
+    return chunks
 
-def _text(lines):
-    """Convert text to text like HTML blocks.
+
+def _summary(summary):
+    """Provide summary header for the report.
 
     Args:
-        None
+        summary: Dict of the report
 
     Returns:
-        output: Full report in HTML
+        output: Report header
 
     """
-    # Initialize key variables
-    output = (
-        '<p style="font-family:courier">%s</p>'
-        '') % (lines.replace('\n', '<br>\n'))
-    output = output.replace('  ', '&nbsp;&nbsp;')
+    # Create output
+    output = ("""\
+Last Date Processed: %s
+
+
+""") % (summary['last_date'])
+
+    # Return
     return output
 
 
-def _html_table(heading, rows, highlight_duplicates=False):
-    """Create HTML table.
+def _predictions(summary, model, title):
+    """Provide report on the predictions of a model.
 
     Args:
-        heading: Headings as a tuple
-        rows: List of tuples to be used as HTML row data
-        highlight_duplicates: Highlight duplicates if found
+        summary: Dict of the report
+        model: Model, such as linear or bayesian
+        title: Title of the table
 
     Returns:
-        html: HTML
+        output: Performance report as an iterable of strings of HTML
 
     """
     # Initialize key variables
-    html = '<table cellpadding="7">'
-    thstart = '<th bgcolor="#8CAA39"><font color="#FFFFFF">'
-    td_e = '<td>'
-    odd_row = True
-    odd_color = '#EEEEFF'
-    evn_color = '#B0E0E6'
-    previous_value = None
-
-    # Create header
-    html = ('%s%s%s') % (
-        html, thstart, (('</font></th>\n %s') % (thstart)).join(heading))
-    html = ('%s</th>') % (html)
-
-    # Loop through list
-    for tuple_row in rows:
-        # Convert tuple to a list of strings
-        row = []
-        for item in tuple_row:
-            row.append(('%s') % (item))
-
-        # Logic to alter colors
-        current_value = row[0]
-        if highlight_duplicates is True and current_value == previous_value:
-            pass
-        else:
-            if odd_row is True:
-                odd_row = False
-                color = odd_color
-            else:
-                odd_row = True
-                color = evn_color
+    rows = []
+
+    # Create headings
+    heading = (
+        'Day', 'Date', 'High', 'High Accuracy', 'Low', 'Low Accuracy')
+
+    # Get data
+    for entry in summary['predictions']:
+        high = entry['{}_high'.format(model)]
+        low = entry['{}_low'.format(model)]
+
+        # Create symbols for table
+        rows.append((
+            entry['lookahead'],
+            entry['date'],
+            '^' if high['predicted_class'] > 0 else 'v',
+            '{:1.2f}%'.format(high['accuracy']),
+            '^' if low['predicted_class'] > 0 else 'v',
+            '{:1.2f}%'.format(low['accuracy'])
+        ))
+
+    # Return table
+    html = render.text_table(title, heading, rows)
+    return html
 
-        # Print entry row
-        html = ('%s\n <tr bgcolor="%s">\n %s') % (html, color, td_e)
-        html = ('%s%s') % (html, (('</td>%s') % (td_e)).join(row))
-        html = ('%s\n  </td>\n </tr>') % (html)
 
-        # Update previous value
-        previous_value = current_value
+def _historical(extrema, label):
+    """Create table of historical highs or lows.
 
-    # Finish the table
-    html = ('%s\n</table>\n') % (html)
+    Args:
+        extrema: List of dicts of the extreme value of each period
+        label: Label of the values, such as High or Low
 
-    # Strip out any duplicated spaces
-    html = ' '.join(html.split())
+    Returns:
+        output: Historical report as an iterable of strings of HTML
 
-    # Strip out any duplicated line feeds
-    html = '\n'.join(html.split('\n'))
+    """
+    # Initialize key variables
+    values = ['Value']
+    dates = ['Date']
+    heading = ['']
+
+    # Get values
+    for item in extrema:
+        heading.append('{} Day {}'.format(item['days'], label))
+        values.append(item['value'])
+        dates.append(item['date'])
+
+    # Return table
+    rows = [values, dates]
+    html = render.titled_table('Historical {}s'.format(label), heading, rows)
+    return html
+
+
+def _filepath(directory, pair):
+    """Get the path of the page of a pair.
+
+    Args:
+        directory: Web directory
+        pair: Pair
 
+    Returns:
+        result: Path
+
+    """
     # Return
-    return html
+    result = os.path.join(directory, '{}.html'.format(pair.lower()))
+    return result
@@ -5,13 +5,13 @@
 # Non standard imports
 
 # Import custom libraries
+from crawsiz.main import render
 from crawsiz.machine import accuracy
 from crawsiz.machine import prediction
 from crawsiz.utils import configuration
 from crawsiz.utils import general
-from crawsiz.db import db
 from crawsiz.db import db_pair
-from crawsiz.db.db_orm import Prediction
+from crawsiz.db import db_prediction
 
 
 class Report(object):
@@ -346,33 +346,36 @@ Overall Low Predictive Value  : %.2f%%\
             'Linear Low'
         )
 
-        # Get data from database
-        database = db.Database()
-        session = database.session()
-        result = session.query(Prediction).filter(
-            Prediction.idx_pair == idx_pair)
-        database.close()
+        # Get data from database in a single range query
+        predictions = db_prediction.GetPredictions(
+            idx_pair, lookahead=self.extract.lookahead())
+        result = zip(
+            predictions.timestamp().tolist(),
+            predictions.fxhigh_bayesian().tolist(),
+            predictions.fxlow_bayesian().tolist(),
+            predictions.fxhigh_linear().tolist(),
+            predictions.fxlow_linear().tolist())
 
         # Process data
-        for instance in result:
-            timestamp = instance.timestamp
+        for (timestamp, fxhigh_bayesian, fxlow_bayesian,
+             fxhigh_linear, fxlow_linear) in result:
 
             # Create bayesian strings
-            if instance.fxhigh_bayesian > 0:
+            if fxhigh_bayesian > 0:
                 high_bayesian = "Higher High"
             else:
                 high_bayesian = "Lower High"
-            if instance.fxlow_bayesian > 0:
+            if fxlow_bayesian > 0:
                 low_bayesian = "Higher Low"
             else:
                 low_bayesian = "Lower Low"
 
             # Create linear strings
-            if instance.fxhigh_linear > 0:
+            if fxhigh_linear > 0:
                 high_linear = "Higher High"
             else:
                 high_linear = "Lower High"
-            if instance.fxlow_linear > 0:
+            if fxlow_linear > 0:
                 low_linear = "Higher Low"
             else:
                 low_linear = "Lower Low"
@@ -445,11 +448,8 @@ def _text(lines):
         output: Full report in HTML
 
     """
-    # Initialize key variables
-    output = (
-        '<p style="font-family:courier">%s</p>'
-        '') % (lines.replace('\n', '<br>\n'))
-    output = output.replace('  ', '&nbsp;&nbsp;')
+    # Return
+    output = render.html(render.text(lines))
     return output
 
 
@@ -465,55 +465,7 @@ def _html_table(heading, rows, highlight_duplicates=False):
         html: HTML
 
     """
-    # Initialize key variables
-    html = '<table cellpadding="7">'
-    thstart = '<th bgcolor="#8CAA39"><font color="#FFFFFF">'
-    td_e = '<td>'
-    odd_row = True
-    odd_color = '#EEEEFF'
-    evn_color = '#B0E0E6'
-    previous_value = None
-
-    # Create header
-    html = ('%s%s%s') % (
-        html, thstart, (('</font></th>\n %s') % (thstart)).join(heading))
-    html = ('%s</th>') % (html)
-
-    # Loop through list
-    for tuple_row in rows:
-        # Convert tuple to a list of strings
-        row = []
-        for item in tuple_row:
-            row.append(('%s') % (item))
-
-        # Logic to alter colors
-        current_value = row[0]
-        if highlight_duplicates is True and current_value == previous_value:
-            pass
-        else:
-            if odd_row is True:
-                odd_row = False
-                color = odd_color
-            else:
-                odd_row = True
-                color = evn_color
-
-        # Print entry row
-        html = ('%s\n <tr bgcolor="%s">\n %s') % (html, color, td_e)
-        html = ('%s%s') % (html, (('</td>%s') % (td_e)).join(row))
-        html = ('%s\n  </td>\n </tr>') % (html)
-
-        # Update previous value
-        previous_value = current_value
-
-    # Finish the table
-    html = ('%s\n</table>\n') % (html)
-
-    # Strip out any duplicated spaces
-    html = ' '.join(html.split())
-
-    # Strip out any duplicated line feeds
-    html = '\n'.join(html.split('\n'))
-
     # Return
+    html = render.html(render.table(
+        heading, rows, highlight_duplicates=highlight_duplicates))
     return html
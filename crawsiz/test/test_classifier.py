@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Test the classifier module."""
+
+import unittest
+
+import numpy as np
+
+from crawsiz.machine import pca
+from crawsiz.machine import classifier as testimport
+
+
+class KnownValues(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    # Two well separated clusters of four dimensional vectors
+    random = np.random.RandomState(0)
+    vectors = np.vstack((
+        random.normal(0, 1, (50, 4)), random.normal(10, 1, (50, 4))))
+    classes = np.vstack([-1] * 50 + [1] * 50)
+    pca_object = pca.PCA(vectors, classes)
+    testobj = testimport.Histogram(pca_object, components=1, bins=2)
+
+    def test_histogram_classifier(self):
+        """Testing method Histogram.classifier."""
+        # Test
+        self.assertEqual(self.testobj.classes(), [-1, 1])
+        self.assertEqual(self.testobj.classifier(self.vectors[0]), -1)
+        self.assertEqual(self.testobj.classifier(self.vectors[-1]), 1)
+        self.assertEqual(
+            self.testobj.classifiers([[0] * 4, [10] * 4, [100] * 4]),
+            [-1, 1, 1])
+
+    def test_histogram_probability(self):
+        """Testing method Histogram.probability."""
+        # Test
+        result = self.testobj.probability(self.vectors[0])
+        self.assertEqual(result, {-1: 1.0, 1: 0.0})
+
+    def test_histogram_accuracy(self):
+        """Testing method Histogram.accuracy."""
+        # Test
+        (actual, predicted) = self.testobj.predictions()
+        self.assertEqual(actual, predicted)
+        self.assertEqual(self.testobj.accuracy(), {-1: 1.0, 1: 1.0, None: 1.0})
+
+        # Vectors sharing bins with both classes are undecided
+        histogram = testimport.Histogram(
+            self.pca_object, components=1, bins=1)
+        self.assertEqual(histogram.classifier(self.vectors[0]), None)
+
+    def test_bayesian(self):
+        """Testing class Bayesian with more than two classes."""
+        # Initialize key variables
+        vectors = np.vstack([
+            self.random.normal(mean, 1, (60, 5)) for mean in (0, 5, 10)])
+        classes = np.vstack([0] * 60 + [1] * 60 + [2] * 60)
+        bayesian = testimport.Bayesian(
+            pca.PCA(vectors, classes), components=3)
+
+        # Test
+        self.assertEqual(bayesian.classes(), [0, 1, 2])
+        self.assertEqual(
+            bayesian.classifiers([[0] * 5, [5] * 5, [10] * 5]), [0, 1, 2])
+        self.assertEqual(bayesian.classifier([10] * 5), 2)
+        self.assertEqual(
+            bayesian.accuracy(), {0: 1.0, 1: 1.0, 2: 1.0, None: 1.0})
+        result = bayesian.probability([5] * 5)
+        self.assertEqual(sorted(result), [0, 1, 2])
+        self.assertAlmostEqual(sum(result.values()), 1)
+        self.assertGreater(result[1], 0.99)
+
+        # Vectors far from all classes still get probabilities
+        result = bayesian.probability([1000] * 5)
+        self.assertAlmostEqual(sum(result.values()), 1)
+
+
+if __name__ == '__main__':
+
+    # Do the unit test
+    unittest.main()
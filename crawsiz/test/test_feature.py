@@ -3,11 +3,13 @@
 
 import unittest
 import random
+import functools
 import decimal
 
 from mock import Mock
 
 from crawsiz.main import feature as testimport
+from crawsiz.utils import rolling
 
 
 class GetIDX(object):
@@ -37,6 +39,28 @@ class GetIDX(object):
     def fxvolume(self):
         """Get fxvolume data."""
 
+    def extrema(self, column, windows, maximum=True):
+        """Get the indices of the extreme values of windows."""
+        pass
+
+
+def _extrema(data, column, windows, maximum=True):
+    """Get the indices of the extreme values of windows.
+
+    Args:
+        data: Dict of lists keyed by column
+        column: Column name
+        windows: Iterable of window lengths
+        maximum: Get the maximum values if True
+
+    Returns:
+        result: Dict of arrays keyed by window
+
+    """
+    # Return
+    result = rolling.extrema(data[column], windows, maximum=maximum)
+    return result
+
 
 class KnownValues(unittest.TestCase):
     """Checks all functions and methods."""
@@ -61,7 +85,9 @@ class KnownValues(unittest.TestCase):
         'fxhigh.return_value': fxhigh,
         'fxlow.return_value': fxlow,
         'fxclose.return_value': fxclose,
-        'timestamp.return_value': timestamps
+        'timestamp.return_value': timestamps,
+        'extrema.side_effect': functools.partial(
+            _extrema, {'fxhigh': fxhigh, 'fxlow': fxlow})
         }
     fxdata.configure_mock(**mock_spec)
 
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Test the histogram1d module."""
+
+import unittest
+
+import numpy as np
+
+from crawsiz.machine import histogram1d as testimport
+
+
+class KnownValues(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    # Female values fall in buckets 61, 62 and 61. Male values fall in
+    # buckets 67, 70 and 68.
+    data = [
+        ('female', 60.2), ('female', 62.7), ('male', 66.1),
+        ('male', 70.9), ('female', 61.0), ('male', 68.4)]
+    testobj = testimport.Histogram1D(data)
+
+    def test_init(self):
+        """Testing method __init__."""
+        # Test
+        self.assertEqual(self.testobj.classes, ['female', 'male'])
+        self.assertEqual(self.testobj.entries, 6)
+        self.assertEqual(self.testobj.bucket_range(), (60, 70))
+        self.assertEqual(self.testobj.buckets('male'), 4)
+        self.assertEqual(self.testobj.minimum('male'), 66)
+        self.assertEqual(self.testobj.maximum('male'), 70)
+        self.assertEqual(self.testobj.keys(), [
+            60.2, 62.7, 66.1, 70.9, 61.0, 68.4])
+        self.assertEqual(self.testobj.lists()['female'], [60.2, 62.7, 61.0])
+
+    def test_counts(self):
+        """Testing method counts."""
+        # Test
+        result = self.testobj.counts()
+        self.assertEqual(dict(result['female']), {61: 2, 62: 1})
+        self.assertEqual(dict(result['male']), {67: 1, 68: 1, 70: 1})
+
+    def test_probability(self):
+        """Testing method probability."""
+        # Test
+        self.assertEqual(self.testobj.probability(61, cls='female'), 2 / 3)
+        self.assertEqual(self.testobj.probability(61), 2 / 6)
+        self.assertEqual(self.testobj.probability(70, cls='male'), 1 / 3)
+
+    def test_histogram_classifier(self):
+        """Testing method histogram_classifier."""
+        # Test
+        self.assertEqual(self.testobj.histogram_classifier(61), 0)
+        self.assertEqual(self.testobj.histogram_classifier(67), 1)
+        self.assertEqual(self.testobj.histogram_classifier(69), 0)
+        self.assertEqual(self.testobj.histogram_classifier(67.5), 0)
+        self.assertEqual(self.testobj.histogram_classifier(1000), 0)
+        result = self.testobj.histogram_classifiers([61, 67, 69])
+        self.assertEqual(result.tolist(), [0, 1, 0])
+
+    def test_bayesian_classifier(self):
+        """Testing method bayesian_classifier."""
+        # Gaussian estimates of the counts of each class
+        mean = np.mean([66.1, 70.9, 68.4])
+        stdev = np.std([66.1, 70.9, 68.4], ddof=1)
+        male = 3 * np.exp(-0.5 * ((64 - mean) / stdev) ** 2) / stdev
+        mean = np.mean([60.2, 62.7, 61.0])
+        stdev = np.std([60.2, 62.7, 61.0], ddof=1)
+        female = 3 * np.exp(-0.5 * ((64 - mean) / stdev) ** 2) / stdev
+
+        # Test
+        self.assertAlmostEqual(
+            self.testobj.bayesian_classifier(64), male / (male + female))
+        result = self.testobj.bayesian_classifiers([61, 64, 69])
+        self.assertLess(result[0], 0.5)
+        self.assertGreater(result[2], 0.5)
+
+
+if __name__ == '__main__':
+
+    # Do the unit test
+    unittest.main()
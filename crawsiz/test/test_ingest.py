@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test the ingest module."""
+
+import unittest
+
+from crawsiz.main import ingest as testimport
+
+
+class KnownValues(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    # Create two hours of five minute bars starting at midnight
+    midnight = 86400
+    bars = []
+    for minute in range(0, 120, 5):
+        bars.append(
+            (midnight + minute * 60, 10 + minute, 11 + minute, 9, 10, 2))
+
+    def test_aggregate(self):
+        """Testing method add of class Aggregate."""
+        # Aggregate to hourly bars
+        aggregate = testimport.Aggregate(1, 60, 5)
+        results = []
+        for bar in self.bars:
+            datapoint = aggregate.add(*bar)
+            if datapoint is not None:
+                results.append(datapoint)
+
+        # Each hour is returned as soon as its last bar is added
+        self.assertEqual(len(results), 2)
+        result = results[0]
+        self.assertEqual(result['timestamp'], self.midnight)
+        self.assertEqual(result['timeframe'], 60)
+        self.assertEqual(result['fxopen'], 10)
+        self.assertEqual(result['fxhigh'], 11 + 55)
+        self.assertEqual(result['fxlow'], 9)
+        self.assertEqual(result['fxclose'], 10)
+        self.assertEqual(result['fxvolume'], 24)
+        self.assertEqual(results[1]['timestamp'], self.midnight + 3600)
+        self.assertEqual(results[1]['fxopen'], 10 + 60)
+
+    def test_aggregate_incomplete(self):
+        """Testing method add of class Aggregate with incomplete periods."""
+        # The last hour of the file is incomplete
+        aggregate = testimport.Aggregate(1, 60, 5)
+        results = []
+        for bar in self.bars[:-1]:
+            datapoint = aggregate.add(*bar)
+            if datapoint is not None:
+                results.append(datapoint['timestamp'])
+        self.assertEqual(results, [self.midnight])
+
+        # The next file starts part way through the hour, which is skipped
+        aggregate = testimport.Aggregate(
+            1, 60, 5, last_timestamp=self.midnight)
+        results = []
+        later = [(bar[0] + 7200,) + bar[1:] for bar in self.bars[:12]]
+        for bar in self.bars[-1:] + later:
+            datapoint = aggregate.add(*bar)
+            if datapoint is not None:
+                results.append(datapoint['timestamp'])
+        self.assertEqual(results, [self.midnight + 7200])
+
+        # The first hour of a file that starts part way through it is
+        # skipped
+        aggregate = testimport.Aggregate(1, 60, 5)
+        results = []
+        for bar in self.bars[6:]:
+            datapoint = aggregate.add(*bar)
+            if datapoint is not None:
+                results.append(datapoint)
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['timestamp'], self.midnight + 3600)
+        self.assertEqual(results[0]['fxvolume'], 24)
+
+    def test_aggregate_stale(self):
+        """Testing method add of class Aggregate with stale data."""
+        # Bars at or before the last timestamp are ignored
+        aggregate = testimport.Aggregate(
+            1, 5, 5, last_timestamp=self.midnight + 3600)
+        results = []
+        for bar in self.bars:
+            datapoint = aggregate.add(*bar)
+            if datapoint is not None:
+                results.append(datapoint['timestamp'])
+
+        # Bars of the source timeframe are returned immediately
+        self.assertEqual(
+            results,
+            list(range(self.midnight + 3900, self.midnight + 7200, 300)))
+
+
+if __name__ == '__main__':
+
+    # Do the unit test
+    unittest.main()
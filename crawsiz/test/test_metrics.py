@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""Test the metrics module."""
+
+import unittest
+
+import numpy as np
+
+from crawsiz.machine import metrics as testimport
+
+
+class KnownValues(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    # Three -1 and five 1 actual classes. One prediction is undecided.
+    actual = [-1, -1, -1, 1, 1, 1, 1, 1]
+    predicted = [-1, 1, None, 1, 1, 1, -1, 1]
+
+    def test_confusion_matrix(self):
+        """Testing function confusion_matrix."""
+        # Rows are actual classes, columns are predicted classes
+        result = testimport.confusion_matrix(self.actual, self.predicted)
+        expected = [[1, 1], [1, 4]]
+        self.assertEqual(result.tolist(), expected)
+
+        # Absent classes keep their position
+        result = testimport.confusion_matrix([1, 1], [1, 1])
+        self.assertEqual(result.tolist(), [[0, 0], [0, 2]])
+
+        # Column vectors of Kessler classes are accepted
+        result = testimport.confusion_matrix(
+            np.asarray([[-1], [1]]), np.asarray([-1, -1]))
+        self.assertEqual(result.tolist(), [[1, 0], [1, 0]])
+
+    def test_confusion_matrices(self):
+        """Testing function confusion_matrices."""
+        # Each row is processed independently
+        result = testimport.confusion_matrices(
+            [self.actual, self.actual], [self.predicted, self.actual])
+        self.assertEqual(result.shape, (2, 2, 2))
+        self.assertEqual(result[0].tolist(), [[1, 1], [1, 4]])
+        self.assertEqual(result[1].tolist(), [[3, 0], [0, 5]])
+
+    def test_metrics(self):
+        """Testing functions precision, recall and accuracy."""
+        # Test
+        matrix = testimport.confusion_matrix(self.actual, self.predicted)
+        self.assertEqual(
+            testimport.precision(matrix).tolist(), [1 / 2, 4 / 5])
+        self.assertEqual(
+            testimport.recall(matrix).tolist(), [1 / 2, 4 / 5])
+        self.assertEqual(testimport.accuracy(matrix), 5 / 7)
+
+        # Classes that were never predicted have no precision
+        matrix = testimport.confusion_matrix([-1, 1], [1, 1])
+        self.assertTrue(np.isnan(testimport.precision(matrix)[0]))
+        self.assertEqual(testimport.precision(matrix)[1], 1 / 2)
+
+
+if __name__ == '__main__':
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Test the pca module."""
+
+import unittest
+
+import numpy as np
+
+from crawsiz.machine import pca as testimport
+
+
+class KnownValues(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    random = np.random.RandomState(0)
+    vectors = random.normal(0, 1, (30, 4))
+    classes = np.vstack([2, 0, 1] * 10)
+
+    def test_init(self):
+        """Testing method __init__."""
+        # Test
+        testobj = testimport.PCA(self.vectors, self.classes)
+        self.assertEqual(testobj.classes(), [0, 1, 2])
+        self.assertTrue(np.array_equal(
+            testobj.xvalues(0), self.vectors[1::3]))
+        self.assertTrue(np.array_equal(testobj.xvalues(None), np.vstack((
+            self.vectors[1::3], self.vectors[2::3], self.vectors[0::3]))))
+        (classes, components) = testobj.principal_components(components=2)
+        self.assertEqual(
+            classes.ravel().tolist(), [0] * 10 + [1] * 10 + [2] * 10)
+        self.assertEqual(components.shape, (30, 2))
+
+        # Kessler classes with a column per class
+        kessler = -np.ones((30, 3))
+        kessler[np.arange(30), self.classes.ravel()] = 1
+        testobj = testimport.PCA(self.vectors, kessler)
+        self.assertEqual(testobj.classes(), [0, 1, 2])
+        self.assertTrue(np.array_equal(
+            testobj.xvalues(2), self.vectors[0::3]))
+
+        # No feature vectors
+        with self.assertRaises(ValueError):
+            testimport.PCA(np.zeros((0, 4)), np.zeros((0, 1)))
+
+
+if __name__ == '__main__':
+
+    # Do the unit test
+    unittest.main()
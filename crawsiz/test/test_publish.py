@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test the publish module."""
+
+import os
+import json
+import tempfile
+import unittest
+
+from crawsiz.main import publish as testimport
+
+
+class KnownValues(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    data = {
+        'pair': 'EURUSD',
+        'last_timestamp': 1483142400,
+        'predictions': [{
+            'lookahead': 1,
+            'date': '2017-01-01 00:00',
+            'linear_high': {'predicted_class': -1, 'accuracy': 72.727},
+            'linear_low': {'predicted_class': 1, 'accuracy': 69.49},
+            'bayesian_high': {'predicted_class': -1, 'accuracy': 77.44},
+            'bayesian_low': {'predicted_class': 1, 'accuracy': 77.91}
+        }]
+    }
+
+    def test_write(self):
+        """Testing functions write and current."""
+        # Initialize key variables
+        directory = tempfile.mkdtemp()
+        filepath = testimport.filepath(directory, 'EURUSD')
+
+        # Test
+        self.assertEqual(os.path.basename(filepath), 'eurusd.json')
+        self.assertFalse(testimport.current(filepath, 'abc'))
+        testimport.write(filepath, self.data, 'abc')
+        self.assertTrue(testimport.current(filepath, 'abc'))
+        self.assertFalse(testimport.current(filepath, 'abd'))
+        with open(filepath, 'r') as f_handle:
+            result = json.load(f_handle)
+        self.assertEqual(result['version'], testimport.VERSION)
+        self.assertEqual(result['predictions'], self.data['predictions'])
+
+    def test_consolidate(self):
+        """Testing function consolidate."""
+        # Initialize key variables
+        directory = tempfile.mkdtemp()
+        filepath = os.path.join(directory, testimport.FILENAME)
+        testimport.write(
+            testimport.filepath(directory, 'EURUSD'), self.data, 'abc')
+
+        # Pairs without documents are ignored
+        testimport.consolidate(directory, ['EURUSD', 'GBPUSD'])
+        with open(filepath, 'r') as f_handle:
+            result = json.load(f_handle)
+        self.assertEqual(list(result['pairs']), ['EURUSD'])
+        self.assertEqual(result['pairs']['EURUSD']['digest'], 'abc')
+
+        # One row per prediction
+        with open(os.path.join(directory, testimport.CSV_FILENAME)) as f_csv:
+            lines = f_csv.read().splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(
+            lines[1], 'EURUSD,1483142400,1,2017-01-01 00:00,linear_high,-1,'
+            '72.73')
+
+        # The files aren't written again if the documents haven't changed
+        os.utime(filepath, (0, 0))
+        testimport.consolidate(directory, ['EURUSD', 'GBPUSD'])
+        self.assertEqual(os.path.getmtime(filepath), 0)
+
+
+if __name__ == '__main__':
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Test the render module."""
+
+import os
+import tempfile
+import unittest
+
+from crawsiz.main import render as testimport
+
+
+class KnownValues(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    heading = ('Day', 'High')
+    rows = [(1, 'a  b'), (1, 'c'), (2, 'd')]
+
+    def test_table(self):
+        """Testing function table."""
+        # Test
+        result = list(testimport.table(self.heading, self.rows))
+        self.assertEqual(len(result), 5)
+        self.assertEqual(result[0], (
+            '<table cellpadding="7">'
+            '<th bgcolor="#8CAA39"><font color="#FFFFFF">Day</font></th> '
+            '<th bgcolor="#8CAA39"><font color="#FFFFFF">High</font></th>'))
+        self.assertEqual(
+            result[1], ' <tr bgcolor="#EEEEFF"> <td>1</td><td>a b </td> </tr>')
+        self.assertEqual(
+            result[2], ' <tr bgcolor="#B0E0E6"> <td>1</td><td>c </td> </tr>')
+        self.assertEqual(
+            result[3], ' <tr bgcolor="#EEEEFF"> <td>2</td><td>d </td> </tr>')
+        self.assertEqual(result[4], ' </table>')
+
+        # Rows with the same first value keep the same color
+        result = list(testimport.table(
+            self.heading, self.rows, highlight_duplicates=True))
+        self.assertIn('#EEEEFF', result[2])
+        self.assertIn('#B0E0E6', result[3])
+
+    def test_text(self):
+        """Testing function text."""
+        # Test
+        result = testimport.html(testimport.text('a  b\nc'))
+        self.assertEqual(
+            result,
+            '<p style="font-family:courier">a&nbsp;&nbsp;b<br>\nc</p>')
+
+    def test_page(self):
+        """Testing function page."""
+        # Test
+        result = testimport.html(testimport.page('EURUSD', [
+            testimport.text('Summary'),
+            testimport.titled_table('Title', self.heading, [])]))
+        self.assertTrue(result.startswith(
+            '<html>\n<head><title>EURUSD</title></head>\n'
+            '<body>\n<h1>EURUSD</h1>\n'))
+        self.assertIn('<h2>Title</h2>\n<table', result)
+        self.assertTrue(result.endswith('</table>\n</html></body>\n'))
+
+    def test_write(self):
+        """Testing functions digest, current and write."""
+        # Initialize key variables
+        directory = tempfile.mkdtemp()
+        filepath = os.path.join(directory, 'eurusd.html')
+        digest = testimport.digest({'last_timestamp': 1, 'years': 6})
+
+        # Test
+        self.assertEqual(
+            digest, testimport.digest({'years': 6, 'last_timestamp': 1}))
+        self.assertNotEqual(
+            digest, testimport.digest({'years': 6, 'last_timestamp': 2}))
+        self.assertFalse(testimport.current(filepath, digest))
+        testimport.write(filepath, ['<html>', '</html>'], value=digest)
+        self.assertTrue(testimport.current(filepath, digest))
+        self.assertEqual(os.listdir(directory), ['eurusd.html'])
+        with open(filepath, 'r') as f_handle:
+            self.assertEqual(
+                f_handle.read().split('\n')[1], '<html></html>')
+
+        # Pages without a digest are never current
+        testimport.write(filepath, ['<html>'])
+        self.assertFalse(testimport.current(filepath, digest))
+
+
+if __name__ == '__main__':
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Test the report module."""
+
+import os
+import tempfile
+import unittest
+
+from crawsiz.main import report as testimport
+
+
+class KnownValues(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    prediction = {'predicted_class': -1, 'accuracy': 72.727}
+    summary = {
+        'pair': 'EURUSD',
+        'last_date': '2016-12-30 00:00',
+        'last_timestamp': 1483056000,
+        'predictions': [{
+            'lookahead': 1,
+            'date': '2016-12-31 00:00',
+            'linear_high': prediction,
+            'linear_low': prediction,
+            'bayesian_high': prediction,
+            'bayesian_low': {'predicted_class': 1, 'accuracy': 50}
+        }],
+        'historical_highs': [
+            {'days': 60, 'value': 1.2, 'date': '2016-10-17 00:00'}],
+        'historical_lows': [
+            {'days': 60, 'value': 1.1, 'date': '2016-12-20 00:00'}]
+    }
+
+    def test_page(self):
+        """Testing function page."""
+        # Test
+        result = ''.join(testimport.page(self.summary))
+        self.assertIn('<h1>EURUSD</h1>', result)
+        self.assertIn('Last Date Processed: 2016-12-30 00:00', result)
+        self.assertIn(
+            '<td>1</td><td>2016-12-31 00:00</td><td>v</td><td>72.73%</td>'
+            '<td>^</td><td>50.00% </td>', result)
+        self.assertIn('<h2>Historical Highs</h2>', result)
+        self.assertIn('60 Day Low', result)
+
+    def test_pages(self):
+        """Testing functions pages and current."""
+        # Initialize key variables
+        directory = tempfile.mkdtemp()
+        result = {'pair': 'EURUSD', 'digest': 'abc', 'summary': None}
+
+        # Nothing is written for pairs that are up to date
+        testimport.pages(directory, result)
+        self.assertEqual(os.listdir(directory), [])
+        self.assertFalse(testimport.current(directory, 'EURUSD', 'abc'))
+
+        # Test
+        result['summary'] = self.summary
+        testimport.pages(directory, result)
+        self.assertEqual(
+            sorted(os.listdir(directory)), ['eurusd.html', 'eurusd.json'])
+        self.assertTrue(testimport.current(directory, 'EURUSD', 'abc'))
+        self.assertFalse(testimport.current(directory, 'EURUSD', 'abd'))
+
+
+if __name__ == '__main__':
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Test the rolling module."""
+
+import random
+import unittest
+
+from crawsiz.utils import rolling as testimport
+
+
+class KnownValues(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    values = [random.randint(1, 20) for _ in range(100)]
+
+    def test_extrema(self):
+        """Testing function extrema."""
+        # Test
+        windows = [1, 5, 60, 240]
+        highs = testimport.extrema(self.values, windows)
+        lows = testimport.extrema(self.values, windows, maximum=False)
+        self.assertEqual(sorted(highs), windows)
+        for window in windows:
+            for stop in range(1, len(self.values) + 1):
+                # The first occurrence is reported if there are ties
+                start = max(0, stop - window)
+                samples = self.values[start: stop]
+                self.assertEqual(
+                    highs[window][stop - 1],
+                    start + samples.index(max(samples)))
+                self.assertEqual(
+                    lows[window][stop - 1],
+                    start + samples.index(min(samples)))
+
+        # No values
+        self.assertEqual(testimport.extrema([], [5])[5].tolist(), [])
+
+
+if __name__ == '__main__':
+
+    # Do the unit test
+    unittest.main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Test the synthetic module."""
+
+import os
+import time
+import unittest
+import tempfile
+
+import numpy as np
+
+from crawsiz.benchmark import synthetic as testimport
+from crawsiz.main import ingest
+
+
+class KnownValues(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    data = testimport.history(years=1, seed=3)
+
+    def test_history(self):
+        """Testing function history."""
+        # The same seed creates the same history
+        result = testimport.history(years=1, seed=3)
+        for column, values in self.data.items():
+            self.assertTrue(np.array_equal(result[column], values))
+        result = testimport.history(years=1, seed=4)
+        self.assertFalse(
+            np.array_equal(result['fxclose'], self.data['fxclose']))
+
+        # Bars are consistent
+        self.assertTrue(np.all(
+            self.data['fxhigh'] >= np.maximum(
+                self.data['fxopen'], self.data['fxclose'])))
+        self.assertTrue(np.all(
+            self.data['fxlow'] <= np.minimum(
+                self.data['fxopen'], self.data['fxclose'])))
+        self.assertTrue(np.all(self.data['fxvolume'] > 0))
+
+        # Bars are only created for weekdays
+        timestamps = self.data['timestamp'].tolist()
+        self.assertTrue(np.all(np.diff(timestamps) > 0))
+        self.assertLess(timestamps[-1], testimport.TS_STOP)
+        weekdays = set(
+            [time.gmtime(timestamp).tm_wday for timestamp in timestamps])
+        self.assertEqual(weekdays, set(range(5)))
+
+        # Intraday bars
+        result = testimport.history(years=1, timeframe=60)
+        self.assertEqual(len(result['timestamp']), len(timestamps) * 24)
+        self.assertEqual(result['timestamp'][1] - result['timestamp'][0], 3600)
+
+    def test_write_csv(self):
+        """Testing function write_csv."""
+        # The file can be read by the ingest module
+        with tempfile.TemporaryDirectory() as directory:
+            filepath = os.path.join(directory, 'EURUSD1440.csv')
+            testimport.write_csv(filepath, self.data)
+            result = list(zip(*ingest.bars(filepath)))
+        self.assertEqual(list(result[0]), self.data['timestamp'].tolist())
+        self.assertEqual(list(result[3]), self.data['fxlow'].tolist())
+        self.assertEqual(list(result[5]), self.data['fxvolume'].tolist())
+
+
+if __name__ == '__main__':
+
+    # Do the unit test
+    unittest.main()
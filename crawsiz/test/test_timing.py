@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Test the timing module."""
+
+import unittest
+from unittest.mock import patch
+
+from crawsiz.utils import timing as testimport
+
+
+class KnownValues(unittest.TestCase):
+    """Checks all functions and methods."""
+
+    #########################################################################
+    # General object setup
+    #########################################################################
+
+    @patch('crawsiz.utils.log.log2quiet')
+    def test_span(self, log2quiet):
+        """Testing class Span."""
+        # Spans inherit the tags of the spans they are nested in
+        testimport.records()
+        with testimport.Span('outer', pair='EURUSD'):
+            with testimport.Span('inner', lookahead=2):
+                pass
+        result = testimport.records()
+        self.assertEqual([item['stage'] for item in result], [
+            'inner', 'outer'])
+        self.assertEqual(result[0]['pair'], 'EURUSD')
+        self.assertEqual(result[0]['lookahead'], 2)
+        self.assertNotIn('lookahead', result[1])
+        self.assertGreaterEqual(result[1]['seconds'], result[0]['seconds'])
+
+        # Records are forgotten once read
+        self.assertEqual(testimport.records(), [])
+
+        # Spans are recorded even when an exception is raised
+        with self.assertRaises(ValueError):
+            with testimport.Span('failed'):
+                raise ValueError
+        self.assertEqual(testimport.records()[0]['stage'], 'failed')
+        self.assertEqual(testimport.TAGS, [])
+
+        # Each span is logged
+        self.assertEqual(log2quiet.call_count, 3)
+
+    def test_summary(self):
+        """Testing function summary."""
+        # Test
+        data = [
+            {'stage': 'pca', 'seconds': 1.0, 'pid': 1, 'pair': 'EURUSD'},
+            {'stage': 'pca', 'seconds': 3.0, 'pid': 2, 'pair': 'GBPUSD'},
+            {'stage': 'html', 'seconds': 0.5, 'pid': 1, 'pair': 'EURUSD'}]
+        result = testimport.summary(data)
+        self.assertEqual(result['pca']['count'], 2)
+        self.assertEqual(result['pca']['total'], 4.0)
+        self.assertEqual(result['pca']['mean'], 2.0)
+        self.assertEqual(result['pca']['max'], 3.0)
+        self.assertEqual(result['pca']['slowest'], {'pair': 'GBPUSD'})
+        self.assertEqual(result['html']['count'], 1)
+
+
+if __name__ == '__main__':
+
+    # Do the unit test
+    unittest.main()
@@ -45,10 +45,6 @@ class ProcessCli(object):
         # Initialize key variables
         width = 80
 
-        # Log the cli command
-        log_message = ('CLI: %s') % (' '.join(sys.argv))
-        log.log2quiet(1000, log_message)
-
         # Header for the help menu of the application
         parser = argparse.ArgumentParser(
             description=self.config_help,
@@ -63,9 +59,23 @@ class ProcessCli(object):
         # Parse "process", return object used for parser
         _cli_process(subparsers, width=width)
 
+        # Parse "watch", return object used for parser
+        _cli_watch(subparsers, width=width)
+
+        # Parse "export", return object used for parser
+        _cli_export(subparsers, width=width)
+
+        # Parse "import", return object used for parser
+        _cli_import(subparsers, width=width)
+
         # Return the CLI arguments
         args = parser.parse_args()
 
+        # Log the cli command. This is done after parsing so that "--help"
+        # doesn't need to read the configuration.
+        log_message = ('CLI: %s') % (' '.join(sys.argv))
+        log.log2quiet(1000, log_message)
+
         # Return our parsed CLI arguments
         return args
 
@@ -98,6 +108,9 @@ def _cli_autoingest(subparsers, width=80):
             'Flag to archive autoingested data file', width=width)
     )
 
+    # Process profile option
+    _profile(parser, width=width)
+
 
 def _cli_process(subparsers, width=80):
     """Process "process" CLI commands.
@@ -116,3 +129,107 @@ def _cli_process(subparsers, width=80):
         help=textwrap.fill(
             'Process FX data from database.', width=width)
     )
+
+    # Process profile option
+    _profile(parser, width=width)
+
+
+def _cli_watch(subparsers, width=80):
+    """Process "watch" CLI commands.
+
+    Args:
+        subparsers: Subparsers object
+        width: Width of the help text string to STDIO before wrapping
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    subparsers.add_parser(
+        'watch',
+        help=textwrap.fill(
+            'Continuously ingest and process FX data files as they '
+            'arrive in the ingest directory.', width=width)
+    )
+
+
+def _cli_export(subparsers, width=80):
+    """Process "export" CLI commands.
+
+    Args:
+        subparsers: Subparsers object
+        width: Width of the help text string to STDIO before wrapping
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    parser = subparsers.add_parser(
+        'export',
+        help=textwrap.fill(
+            'Export the price history in the database to numpy files '
+            'with a manifest.', width=width)
+    )
+
+    # Process directory argument
+    parser.add_argument(
+        'directory',
+        help=textwrap.fill(
+            'Directory in which to create the archive.', width=width)
+    )
+
+
+def _cli_import(subparsers, width=80):
+    """Process "import" CLI commands.
+
+    Args:
+        subparsers: Subparsers object
+        width: Width of the help text string to STDIO before wrapping
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    parser = subparsers.add_parser(
+        'import',
+        help=textwrap.fill(
+            'Import price history from an archive created with '
+            '"export".', width=width)
+    )
+
+    # Process directory argument
+    parser.add_argument(
+        'directory',
+        help=textwrap.fill(
+            'Directory containing the archive.', width=width)
+    )
+
+
+def _profile(parser, width=80):
+    """Add the "--profile" option to a parser.
+
+    Args:
+        parser: Parser object
+        width: Width of the help text string to STDIO before wrapping
+
+    Returns:
+        None
+
+    """
+    # Process profile option
+    parser.add_argument(
+        '--profile',
+        dest='profile',
+        nargs='?',
+        const='',
+        default=None,
+        metavar='DIRECTORY',
+        help=textwrap.fill(
+            'Profile each file ingested and each pair processed. The '
+            'profiles and a merged report are written to a new '
+            'subdirectory of DIRECTORY for each run, or to a new temporary '
+            'directory if none is given.', width=width)
+    )
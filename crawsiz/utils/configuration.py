@@ -160,6 +160,105 @@ class Config(object):
         # Return
         return result
 
+    def log_level(self):
+        """Get log_level.
+
+        Args:
+            None
+
+        Returns:
+            result: Lowest level of messages to log. One of "debug",
+                "info", "warning" or "error"
+
+        """
+        # Initialize key variables
+        key = 'general'
+        sub_key = 'log_level'
+        levels = ['debug', 'info', 'warning', 'error']
+
+        # Process configuration
+        result = _key_sub_key(key, sub_key, self.config_dict, die=False)
+        if result is None:
+            result = 'debug'
+
+        # Die if the level is not supported. Logging isn't set up yet.
+        if result not in levels:
+            log_message = (
+                'log_level: "%s" in configuration must be one of %s'
+                '') % (result, levels)
+            log.log2die_safe(1127, log_message)
+
+        # Get result
+        return result
+
+    def log_queue(self):
+        """Get log_queue.
+
+        Args:
+            None
+
+        Returns:
+            result: True if pool workers send their log messages to the
+                main process to be written
+
+        """
+        # Get result
+        sub_key = 'log_queue'
+        key = 'general'
+
+        # Get new result
+        result = _key_sub_key(key, sub_key, self.config_dict, die=False)
+        if result is None:
+            result = False
+
+        # Return
+        return bool(result)
+
+    def watch_debounce(self):
+        """Get watch_debounce.
+
+        Args:
+            None
+
+        Returns:
+            result: Seconds a file must be untouched before it is ingested
+
+        """
+        # Get result
+        sub_key = 'watch_debounce'
+        key = 'general'
+
+        # Get new result
+        result = _key_sub_key(key, sub_key, self.config_dict, die=False)
+        if result is None:
+            result = 15
+
+        # Return
+        return result
+
+    def historical_windows(self):
+        """Get historical_windows.
+
+        Args:
+            None
+
+        Returns:
+            result: Sorted list of the number of days in each period of the
+                historical highs and lows in reports
+
+        """
+        # Get result
+        sub_key = 'historical_windows'
+        key = 'general'
+
+        # Get new result
+        result = _key_sub_key(key, sub_key, self.config_dict, die=False)
+        if result is None:
+            result = [60, 120, 180, 240]
+
+        # Return
+        return sorted(int(value) for value in result)
+
     def ingest_directory(self):
         """Determine the ingest_directory.
 
@@ -241,6 +340,168 @@ class Config(object):
         # Return
         return value
 
+    def db_backend(self):
+        """Get db_backend.
+
+        Args:
+            None
+
+        Returns:
+            result: Database backend. Either "mysql" or "sqlite"
+
+        """
+        # Initialize key variables
+        key = 'database'
+        sub_key = 'db_backend'
+        backends = ['mysql', 'sqlite']
+
+        # Process configuration
+        result = _key_sub_key(key, sub_key, self.config_dict, die=False)
+        if result is None:
+            result = 'mysql'
+
+        # Die if the backend is not supported
+        if result not in backends:
+            log_message = (
+                'db_backend: "%s" in configuration must be one of %s'
+                '') % (result, backends)
+            log.log2die(1117, log_message)
+
+        # Get result
+        return result
+
+    def db_file(self):
+        """Get db_file.
+
+        Args:
+            None
+
+        Returns:
+            result: Database file for the sqlite backend
+
+        """
+        # Initialize key variables
+        key = 'database'
+        sub_key = 'db_file'
+
+        # Process configuration
+        result = _key_sub_key(key, sub_key, self.config_dict)
+
+        # Get result
+        return result
+
+    def db_pool_size(self):
+        """Get db_pool_size.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of connections kept in each process' pool, or
+                "auto" to size the pool from the number of processes
+
+        """
+        # Initialize key variables
+        key = 'database'
+        sub_key = 'db_pool_size'
+
+        # Process configuration
+        result = _key_sub_key(key, sub_key, self.config_dict, die=False)
+        if result is None:
+            result = 50
+
+        # Get result
+        return result
+
+    def db_max_overflow(self):
+        """Get db_max_overflow.
+
+        Args:
+            None
+
+        Returns:
+            result: Number of connections allowed in excess of db_pool_size
+
+        """
+        # Initialize key variables
+        key = 'database'
+        sub_key = 'db_max_overflow'
+
+        # Process configuration
+        result = _key_sub_key(key, sub_key, self.config_dict, die=False)
+        if result is None:
+            result = 50
+
+        # Get result
+        return result
+
+    def db_pool_recycle(self):
+        """Get db_pool_recycle.
+
+        Args:
+            None
+
+        Returns:
+            result: Seconds after which pooled connections are recycled
+
+        """
+        # Initialize key variables
+        key = 'database'
+        sub_key = 'db_pool_recycle'
+
+        # Process configuration
+        result = _key_sub_key(key, sub_key, self.config_dict, die=False)
+        if result is None:
+            result = 3600
+
+        # Get result
+        return result
+
+    def db_pool_timeout(self):
+        """Get db_pool_timeout.
+
+        Args:
+            None
+
+        Returns:
+            result: Seconds to wait for a connection from the pool
+
+        """
+        # Initialize key variables
+        key = 'database'
+        sub_key = 'db_pool_timeout'
+
+        # Process configuration
+        result = _key_sub_key(key, sub_key, self.config_dict, die=False)
+        if result is None:
+            result = 30
+
+        # Get result
+        return result
+
+    def db_max_connections(self):
+        """Get db_max_connections.
+
+        Args:
+            None
+
+        Returns:
+            result: Connections shared by all processes when db_pool_size
+                is "auto"
+
+        """
+        # Initialize key variables
+        key = 'database'
+        sub_key = 'db_max_connections'
+
+        # Process configuration
+        result = _key_sub_key(key, sub_key, self.config_dict, die=False)
+        if result is None:
+            result = 100
+
+        # Get result
+        return result
+
     def db_name(self):
         """Get db_name.
 
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 """Nagios check general library."""
 
+import os
 import sys
+import atexit
 import datetime
 import time
 import getpass
 import logging
+import logging.handlers
+import multiprocessing
 import threading
 import traceback
 
@@ -15,6 +19,17 @@ from crawsiz.utils import configuration
 
 # Define global variable
 LOGGER = {}
+USERNAME = None
+LISTENER = None
+LISTENER_PID = None
+
+# Logging levels of configured log_level values
+LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR
+}
 
 
 class GetLog(object):
@@ -28,14 +43,15 @@ class GetLog(object):
         # Get the logging directory
         config = configuration.Config()
         log_file = config.log_file()
+        level = LEVELS[config.log_level()]
 
         # create logger with 'slurpy'
         self.logger_file = logging.getLogger(('%s_file') % (app_name))
         self.logger_stdout = logging.getLogger(('%s_console') % (app_name))
 
         # Set logging levels to file and stdout
-        self.logger_stdout.setLevel(logging.DEBUG)
-        self.logger_file.setLevel(logging.DEBUG)
+        self.logger_stdout.setLevel(level)
+        self.logger_file.setLevel(level)
 
         # create file handler which logs even debug messages
         file_handler = logging.FileHandler(log_file)
@@ -84,6 +100,88 @@ class GetLog(object):
         return value
 
 
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Class that sends log records to the process writing the log file.
+
+    Records are sent with their message, but are otherwise formatted by
+    the writing process so that logging costs as little as possible.
+
+    """
+
+    def enqueue(self, record):
+        """Send a record.
+
+        Records are written to the queue before this returns. Pools
+        terminate their workers when they are done, so records must not
+        be left in a buffer to be sent later.
+
+        Args:
+            record: LogRecord object
+
+        Returns:
+            None
+
+        """
+        # Send
+        self.queue.put(record)
+
+    def prepare(self, record):
+        """Prepare a record for the queue.
+
+        Args:
+            record: LogRecord object
+
+        Returns:
+            result: Tuple of the record's logger name, level, message and
+                creation time. This is much faster to send than the record.
+
+        """
+        # Return
+        result = (
+            record.name, record.levelno, record.getMessage(), record.created)
+        return result
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    """Class that writes log records sent by _QueueHandler objects."""
+
+    def dequeue(self, block):
+        """Get a record.
+
+        Args:
+            block: Ignored. Always wait for a record.
+
+        Returns:
+            record: LogRecord object
+
+        """
+        # Get
+        item = self.queue.get()
+        if item is self._sentinel:
+            return item
+
+        # Recreate the record
+        (name, levelno, message, created) = item
+        record = logging.LogRecord(
+            name, levelno, None, None, message, None, None)
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        return record
+
+    def enqueue_sentinel(self):
+        """Tell the listener thread to stop.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Send
+        self.queue.put(self._sentinel)
+
+
 class LogThread(threading.Thread):
     """LogThread should always be used in preference to threading.Thread.
 
@@ -123,6 +221,76 @@ class LogThread(threading.Thread):
                 traceback.print_exc()))
 
 
+def start_queue():
+    """Write the log file from a single thread of this process.
+
+    Messages logged to file by this process, and by processes it forks
+    afterwards (such as multiprocessing pool workers), are sent through a
+    queue to a listener thread that is the only writer of the log file.
+    Call this before creating process pools.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    global LISTENER
+    global LISTENER_PID
+
+    # Only start once
+    if LISTENER is not None:
+        return
+
+    # Replace the file handlers with a queue
+    logger_file = _logger().logfile()
+    handlers = logger_file.handlers[:]
+    queue = multiprocessing.SimpleQueue()
+    for handler in handlers:
+        logger_file.removeHandler(handler)
+    logger_file.addHandler(_QueueHandler(queue))
+
+    # Start writing
+    LISTENER = _QueueListener(
+        queue, *handlers, respect_handler_level=True)
+    LISTENER.start()
+    LISTENER_PID = os.getpid()
+
+    # Write queued messages before exiting, even after log2die
+    atexit.register(stop_queue)
+
+
+def stop_queue():
+    """Stop the log file writer started by start_queue.
+
+    Messages already queued are written first.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    """
+    # Initialize key variables
+    global LISTENER
+
+    # Only stop in the process that started the listener
+    if LISTENER is None or LISTENER_PID != os.getpid():
+        return
+
+    # Write remaining messages, then log directly to file again
+    LISTENER.stop()
+    logger_file = _logger().logfile()
+    for handler in logger_file.handlers[:]:
+        logger_file.removeHandler(handler)
+    for handler in LISTENER.handlers:
+        logger_file.addHandler(handler)
+    LISTENER = None
+
+
 def log2die_safe(code, message):
     """Log message to STDOUT only and die.
 
@@ -151,9 +319,10 @@ def log2warn(code, message):
         None
 
     """
-    # Initialize key variables
-    warning = ('WARNING - %s') % (message)
-    _logit(code, warning, error=False, verbose=False)
+    # Log to file
+    _logit(
+        code, message, error=False, verbose=False,
+        level=logging.WARNING, prefix='WARNING - ')
 
 
 def log2quiet(code, message):
@@ -183,7 +352,7 @@ def log2see(code, message):
 
     """
     # Log to screen and file
-    _logit(code, message, error=False)
+    _logit(code, message, error=False, level=logging.INFO)
 
 
 def log2die(code, message):
@@ -199,7 +368,9 @@ def log2die(code, message):
     _logit(code, message, error=True)
 
 
-def _logit(error_num, error_string, error=False, verbose=False):
+def _logit(
+        error_num, error_string, error=False, verbose=False,
+        level=logging.DEBUG, prefix=''):
     """Log slurpy errors to file and STDOUT.
 
     Args:
@@ -207,38 +378,80 @@ def _logit(error_num, error_string, error=False, verbose=False):
         error_string: Descriptive error string
         error: Is this an error or not?
         verbose: If True print non errors to STDOUT
+        level: Logging level of non errors
+        prefix: Prefix of the descriptive error string
 
     Returns:
         None
 
     """
     # Define key variables
-    global LOGGER
-    username = getpass.getuser()
+    logger = _logger()
+    logger_file = logger.logfile()
+    logger_stdout = logger.stdout()
 
-    # Create logger if it doesn't already exist
-    if bool(LOGGER) is False:
-        LOGGER = GetLog()
-    logger_file = LOGGER.logfile()
-    logger_stdout = LOGGER.stdout()
-
-    # Log the message
+    # Log the message. The logger only formats the message if its level
+    # is enabled.
     if error:
-        log_message = (
-            'ERROR [%s] (%sE): %s') % (
-                username, error_num, error_string)
-        logger_stdout.debug('%s', log_message)
-        logger_file.debug(log_message)
+        logger_stdout.error(
+            'ERROR [%s] (%sE): %s', _username(), error_num, error_string)
+        logger_file.error(
+            'ERROR [%s] (%sE): %s', _username(), error_num, error_string)
 
         # All done
         sys.exit(2)
     else:
-        log_message = (
-            'STATUS [%s] (%sS): %s') % (
-                username, error_num, error_string)
-        logger_file.debug(log_message)
+        # Skip messages that would be discarded
+        if logger_file.isEnabledFor(level) is False:
+            return
+
+        logger_file.log(
+            level, 'STATUS [%s] (%sS): %s%s',
+            _username(), error_num, prefix, error_string)
         if verbose:
-            logger_stdout.debug('%s', log_message)
+            logger_stdout.log(
+                level, 'STATUS [%s] (%sS): %s%s',
+                _username(), error_num, prefix, error_string)
+
+
+def _logger():
+    """Get the GetLog object of the process, creating it if required.
+
+    Args:
+        None
+
+    Returns:
+        LOGGER: GetLog object
+
+    """
+    # Define key variables
+    global LOGGER
+
+    # Create logger if it doesn't already exist
+    if bool(LOGGER) is False:
+        LOGGER = GetLog()
+    return LOGGER
+
+
+def _username():
+    """Get the name of the user running the application.
+
+    The name is looked up once and cached, as this is slow.
+
+    Args:
+        None
+
+    Returns:
+        USERNAME: Username
+
+    """
+    # Define key variables
+    global USERNAME
+
+    # Look up the username
+    if USERNAME is None:
+        USERNAME = getpass.getuser()
+    return USERNAME
 
 
 def _message(code, message, error=True):
@@ -256,7 +469,7 @@ def _message(code, message, error=True):
     # Initialize key variables
     time_object = datetime.datetime.fromtimestamp(time.time())
     timestring = time_object.strftime('%Y-%m-%d %H:%M:%S,%f')
-    username = getpass.getuser()
+    username = _username()
 
     # Format string for error message, print and die
     if error is True:
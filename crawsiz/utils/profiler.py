@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Library to profile the tasks run by pool workers.
+
+Each task is profiled with cProfile and saved to its own file in a
+directory created for the run. The files of all tasks are merged into a
+single ranked report when the run is complete.
+
+"""
+
+import io
+import os
+import glob
+import time
+import pstats
+import cProfile
+import tempfile
+
+# Import custom libraries
+from crawsiz.utils import log
+
+# Name of the merged report and statistics files
+REPORT = 'report.txt'
+MERGED = 'merged.pstats'
+
+
+def directory(path):
+    """Create the directory in which to save the profiles of a run.
+
+    Each run gets a new directory, so that its report doesn't include the
+    profiles of earlier runs.
+
+    Args:
+        path: Directory in which to create the directory of the run. A new
+            temporary directory is created if the path is an empty string.
+            Profiling is disabled if None.
+
+    Returns:
+        result: Directory, or None if profiling is disabled
+
+    """
+    # Initialize key variables
+    result = None
+
+    # Create
+    if path is not None:
+        if bool(path) is False:
+            result = tempfile.mkdtemp(prefix='crawsiz_profile_')
+        else:
+            path = os.path.abspath(path)
+            os.makedirs(path, exist_ok=True)
+            result = tempfile.mkdtemp(
+                prefix=time.strftime('%Y%m%d_%H%M%S_'), dir=path)
+
+    # Return
+    return result
+
+
+def run(path, name, function, *args):
+    """Run a function, profiling it if required.
+
+    Args:
+        path: Directory in which to save the profile. The function is not
+            profiled if None.
+        name: Name of the task, such as the pair being processed
+        function: Function to run
+        args: Arguments of the function
+
+    Returns:
+        result: Value returned by the function
+
+    """
+    # Run without profiling
+    if path is None:
+        result = function(*args)
+        return result
+
+    # Profile. Statistics are saved even if the function fails.
+    profile = cProfile.Profile()
+    try:
+        result = profile.runcall(function, *args)
+    finally:
+        filepath = os.path.join(path, '{}_{}_{}.prof'.format(
+            name, int(time.time()), os.getpid()))
+        profile.dump_stats(filepath)
+
+    # Return
+    return result
+
+
+def report(path, limit=40):
+    """Merge the profiles of all tasks into a ranked report.
+
+    The report lists the functions with the most cumulative time, then
+    the functions with the most time spent in the function itself.
+    The merged statistics are also saved so that they can be viewed with
+    other tools.
+
+    Args:
+        path: Directory containing the profiles of the run
+        limit: Number of functions in each ranking
+
+    Returns:
+        filepath: Path of the report, None if there were no profiles
+
+    """
+    # Initialize key variables
+    filepaths = sorted(glob.glob(os.path.join(path, '*.prof')))
+    stream = io.StringIO()
+
+    # Nothing to do
+    if bool(filepaths) is False:
+        log_message = 'No profiles found in directory {}.'.format(path)
+        log.log2warn(1130, log_message)
+        return None
+
+    # Merge and rank
+    stats = pstats.Stats(*filepaths, stream=stream)
+    stats.strip_dirs()
+    stream.write('Profiles of {} tasks in {}\n\n'.format(
+        len(filepaths), path))
+    stats.sort_stats('cumulative').print_stats(limit)
+    stats.sort_stats('tottime').print_stats(limit)
+    stats.dump_stats(os.path.join(path, MERGED))
+
+    # Write report
+    filepath = os.path.join(path, REPORT)
+    with open(filepath, 'w') as f_handle:
+        f_handle.write(stream.getvalue())
+
+    # Log
+    log_message = 'Profile report of {} tasks written to {}.'.format(
+        len(filepaths), filepath)
+    log.log2quiet(1131, log_message)
+    return filepath
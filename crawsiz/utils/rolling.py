@@ -0,0 +1,45 @@
+"""Library to calculate rolling statistics of price history arrays."""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def extrema(values, windows, maximum=True):
+    """Get the indices of the extreme values of windows ending at each bar.
+
+    All the windows ending at every bar are evaluated at once, so that
+    callers can look up any bar without slicing the history again.
+
+    Args:
+        values: Numpy array of values
+        windows: Iterable of window lengths in bars
+        maximum: Get the maximum values if True, the minimum values if
+            False
+
+    Returns:
+        data: Dict of arrays keyed by window. Entry i of each array is
+            the index of the extreme value of values[i - window + 1: i + 1],
+            or of values[: i + 1] if there are fewer bars. The index of the
+            first bar is used if several have the extreme value.
+
+    """
+    # Initialize key variables
+    data = {}
+    values = np.asarray(values, dtype=float)
+    positions = np.arange(values.size)
+    if maximum is True:
+        (padding, function) = (-np.inf, np.argmax)
+    else:
+        (padding, function) = (np.inf, np.argmin)
+
+    # Pad the start of the values so that there is a window for every bar
+    for window in windows:
+        if values.size == 0:
+            data[window] = positions
+            continue
+        padded = np.concatenate((np.full(window - 1, padding), values))
+        offsets = function(sliding_window_view(padded, window), axis=1)
+        data[window] = positions - window + 1 + offsets
+
+    # Return
+    return data
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Library to time the stages of processing.
+
+Each completed span is logged as a JSON record and kept so that the
+spans of a run can be summarized. Spans inherit the tags (eg. pair and
+lookahead) of the spans they are nested in.
+
+"""
+
+import os
+import json
+import time
+from collections import defaultdict
+
+# Import custom libraries
+from crawsiz.utils import log
+
+# Tags of the spans being timed, and records of completed spans
+TAGS = []
+RECORDS = []
+
+
+class Span(object):
+    """Class that times a stage of processing.
+
+    Use as a context manager:
+
+        with timing.Span('extract', pair='EURUSD', lookahead=1):
+            ...
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    Methods:
+
+    """
+
+    def __init__(self, stage, **tags):
+        """Method for intializing the class.
+
+        Args:
+            stage: Name of the stage
+            tags: Keyword arguments used to tag the record of the span
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.stage = stage
+        self.tags = tags
+        self.start = None
+
+    def __enter__(self):
+        """Start timing.
+
+        Args:
+            None
+
+        Returns:
+            self: Span object
+
+        """
+        # Inherit tags from the enclosing span
+        if bool(TAGS) is True:
+            self.tags = dict(TAGS[-1], **self.tags)
+        TAGS.append(self.tags)
+
+        # Start
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """Stop timing and record the span.
+
+        Args:
+            exc_type: Type of exception raised in the span, if any
+            exc_value: Exception raised in the span, if any
+            exc_traceback: Traceback of the exception, if any
+
+        Returns:
+            False: Exceptions are not suppressed
+
+        """
+        # Stop
+        seconds = time.perf_counter() - self.start
+        TAGS.pop()
+
+        # Record
+        record = dict(self.tags)
+        record['stage'] = self.stage
+        record['seconds'] = round(seconds, 6)
+        record['pid'] = os.getpid()
+        RECORDS.append(record)
+        log.log2quiet(1128, json.dumps(record, sort_keys=True))
+        return False
+
+
+def records():
+    """Get the records of completed spans, and forget them.
+
+    Args:
+        None
+
+    Returns:
+        result: List of dicts, one per span
+
+    """
+    # Return
+    result = RECORDS[:]
+    del RECORDS[:]
+    return result
+
+
+def summary(data):
+    """Summarize the records of spans by stage.
+
+    Args:
+        data: List of span records
+
+    Returns:
+        result: Dict keyed by stage. Each value is a dict of the count,
+            total, mean and maximum seconds of its spans, and the tags of
+            the slowest one.
+
+    """
+    # Initialize key variables
+    result = {}
+    stages = defaultdict(list)
+
+    # Group by stage
+    for record in data:
+        stages[record['stage']].append(record)
+
+    # Summarize
+    for stage, items in stages.items():
+        seconds = [item['seconds'] for item in items]
+        slowest = max(items, key=lambda item: item['seconds'])
+        result[stage] = {
+            'count': len(items),
+            'total': round(sum(seconds), 6),
+            'mean': round(sum(seconds) / len(items), 6),
+            'max': slowest['seconds'],
+            'slowest': {
+                key: value for key, value in slowest.items()
+                if key not in ['stage', 'seconds', 'pid']}
+        }
+
+    # Return
+    return result
+
+
+def log_summary(data):
+    """Log a summary of the records of spans as JSON.
+
+    Args:
+        data: List of span records
+
+    Returns:
+        None
+
+    """
+    # Log
+    log_message = json.dumps({'summary': summary(data)}, sort_keys=True)
+    log.log2quiet(1129, log_message)
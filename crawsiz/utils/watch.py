@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""crawsiz class that watches a directory for new files using inotify."""
+
+import os
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+
+# Import custom libraries
+from crawsiz.utils import log
+
+# inotify event masks (see "man 7 inotify")
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+
+# Header of each inotify event (wd, mask, cookie, len)
+_EVENT = struct.Struct('iIII')
+
+
+class Watch(object):
+    """Class that reports files written to, or moved into, a directory.
+
+    Args:
+        None
+
+    Returns:
+        None
+
+    Methods:
+
+    """
+
+    def __init__(self, directory, debounce=15):
+        """Function for intializing the class.
+
+        Args:
+            directory: Directory to watch
+            debounce: Seconds a file must be left untouched before
+                it is reported
+
+        Returns:
+            None
+
+        """
+        # Initialize key variables
+        self.directory = directory
+        self.debounce = debounce
+        self._pending = {}
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO
+
+        # Get the C library
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if hasattr(libc, 'inotify_init') is False:
+            log_message = (
+                'inotify is not supported on this platform. '
+                'Use the "autoingest" mode instead.')
+            log.log2die(1110, log_message)
+
+        # Start watching the directory
+        self._fd = libc.inotify_init()
+        if self._fd < 0:
+            log_message = (
+                'Unable to initialize inotify. Error: %s'
+                '') % (os.strerror(ctypes.get_errno()))
+            log.log2die(1111, log_message)
+        watch_descriptor = libc.inotify_add_watch(
+            self._fd, directory.encode(), mask)
+        if watch_descriptor < 0:
+            log_message = (
+                'Unable to watch directory %s. Error: %s'
+                '') % (directory, os.strerror(ctypes.get_errno()))
+            log.log2die(1112, log_message)
+
+    def files(self, timeout=1):
+        """Get files that have been left untouched for "debounce" seconds.
+
+        Args:
+            timeout: Seconds to wait for new inotify events
+
+        Returns:
+            filepaths: Sorted list of file paths ready for processing
+
+        """
+        # Wait for events and note when each file was last touched
+        (readable, _, _) = select.select([self._fd], [], [], timeout)
+        if bool(readable) is True:
+            now = time.time()
+            for filename in _filenames(os.read(self._fd, 65536)):
+                filepath = ('%s/%s') % (self.directory, filename)
+                self._pending[filepath] = now
+
+        # Only report files that have stopped changing
+        now = time.time()
+        filepaths = sorted(
+            [filepath for filepath, touched in self._pending.items() if (
+                now - touched >= self.debounce)])
+        for filepath in filepaths:
+            del self._pending[filepath]
+
+        # Ignore files that were renamed or deleted in the meantime
+        filepaths = [
+            filepath for filepath in filepaths if os.path.isfile(filepath)]
+
+        # Return
+        return filepaths
+
+    def add(self, filepath):
+        """Report a file once it has been left untouched long enough.
+
+        Use this for files that were written before watching started.
+
+        Args:
+            filepath: Path of the file
+
+        Returns:
+            None
+
+        """
+        # Use the time the file was last modified, unless there has been
+        # a more recent event for it
+        touched = os.path.getmtime(filepath)
+        self._pending[filepath] = max(
+            touched, self._pending.get(filepath, touched))
+
+    def close(self):
+        """Stop watching the directory.
+
+        Args:
+            None
+
+        Returns:
+            None
+
+        """
+        # Close the inotify file descriptor
+        os.close(self._fd)
+
+
+def _filenames(buffer):
+    """Get the filenames from a buffer of inotify events.
+
+    Args:
+        buffer: Bytes read from the inotify file descriptor
+
+    Returns:
+        filenames: List of filenames
+
+    """
+    # Initialize key variables
+    filenames = []
+    offset = 0
+
+    # Process each event
+    while offset + _EVENT.size <= len(buffer):
+        (_, _, _, length) = _EVENT.unpack_from(buffer, offset)
+        offset += _EVENT.size
+        name = buffer[offset: offset + length].rstrip(b'\0')
+        offset += length
+
+        # Events on the directory itself have no name
+        if bool(name) is True:
+            filenames.append(name.decode())
+
+    # Return
+    return filenames